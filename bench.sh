@@ -0,0 +1,3 @@
+#!/usr/bin/bash
+
+python3 src/bench.py "$@"
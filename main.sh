@@ -1,4 +1,3 @@
 #!/usr/bin/bash
 
-python src/main.py
-cd public && python -m http.server 8888
+python3 src/main.py serve --watch --port 8888
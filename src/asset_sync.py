@@ -0,0 +1,113 @@
+import errno
+import os
+import shutil
+
+from manifest import hash_file
+
+FICLONE = 0x40049409
+
+
+def reflink(source_path, destination_path):
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError(errno.ENOTSUP, "reflinks are not supported on this platform")
+    with open(source_path, "rb") as source, open(destination_path, "wb") as destination:
+        fcntl.ioctl(destination.fileno(), FICLONE, source.fileno())
+    shutil.copystat(source_path, destination_path)
+
+
+def copy_range(source_path, destination_path):
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "os.copy_file_range is not available")
+    with open(source_path, "rb") as source, open(destination_path, "wb") as destination:
+        remaining = os.fstat(source.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(source.fileno(), destination.fileno(), remaining)
+            if copied == 0:
+                raise OSError(
+                    errno.EIO, f"copy_file_range stopped {remaining} bytes short", source_path
+                )
+            remaining -= copied
+    shutil.copystat(source_path, destination_path)
+
+
+def hard_link(source_path, destination_path):
+    os.link(source_path, destination_path)
+
+
+def plain_copy(source_path, destination_path):
+    shutil.copy2(source_path, destination_path)
+
+
+COPY_STRATEGIES = {
+    "auto": (reflink, copy_range, plain_copy),
+    "hardlink": (hard_link, reflink, copy_range, plain_copy),
+    "copy": (plain_copy,),
+}
+
+
+def copy_file(source_path, destination_path, strategy="auto"):
+    methods = COPY_STRATEGIES[strategy]
+    os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+    for method in methods:
+        if os.path.lexists(destination_path):
+            os.remove(destination_path)
+        try:
+            method(source_path, destination_path)
+        except OSError:
+            if method is methods[-1]:
+                raise
+            continue
+        return method.__name__
+
+
+def is_up_to_date(source_path, destination_path, checksum=False):
+    try:
+        destination_stat = os.stat(destination_path)
+    except FileNotFoundError:
+        return False
+    source_stat = os.stat(source_path)
+    if source_stat.st_size != destination_stat.st_size:
+        return False
+    if source_stat.st_mtime_ns == destination_stat.st_mtime_ns:
+        return True
+    if checksum and hash_file(source_path) == hash_file(destination_path):
+        shutil.copystat(source_path, destination_path)
+        return True
+    return False
+
+
+def sync_assets(source, destination, previous_files=(), strategy="auto", checksum=False):
+    synced_files = []
+    stats = {"copied": 0, "unchanged": 0, "removed": 0, "methods": {}}
+    for directory, _, file_names in os.walk(source):
+        for file_name in file_names:
+            source_path = os.path.join(directory, file_name)
+            relative_path = os.path.relpath(source_path, source)
+            destination_path = os.path.join(destination, relative_path)
+            synced_files.append(relative_path)
+            if is_up_to_date(source_path, destination_path, checksum):
+                stats["unchanged"] += 1
+                continue
+            print(f"Copying {source_path} to {destination_path}")
+            method = copy_file(source_path, destination_path, strategy)
+            stats["copied"] += 1
+            stats["methods"][method] = stats["methods"].get(method, 0) + 1
+    for relative_path in sorted(set(previous_files) - set(synced_files)):
+        destination_path = os.path.join(destination, relative_path)
+        if not os.path.lexists(destination_path):
+            continue
+        print(f"Removing stale asset {destination_path}")
+        os.remove(destination_path)
+        stats["removed"] += 1
+        remove_empty_directories(os.path.dirname(destination_path), destination)
+    return sorted(synced_files), stats
+
+
+def remove_empty_directories(directory, root):
+    while os.path.abspath(directory) != os.path.abspath(root) and not os.listdir(
+        directory
+    ):
+        os.rmdir(directory)
+        directory = os.path.dirname(directory)
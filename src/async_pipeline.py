@@ -0,0 +1,143 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from builder import (
+    configure_worker,
+    get_worker_pool,
+    render_page_html,
+    report_worker_timings,
+    run_with_settings,
+)
+from includes import record_dependencies, recorded_dependencies
+from inline_markdown import get_inline_cache
+from pages import output_path_for, write_output
+from render_cache import get_render_cache
+
+
+def read_source(from_path):
+    with open(from_path, "r") as markdown_file:
+        return markdown_file.read()
+
+
+def write_page(output_path, html_page):
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    write_output(output_path, lambda write: write(html_page))
+
+
+def render_source(base_path, from_path, markdown_file, template_path):
+    start = time.perf_counter()
+    result = {"page": from_path, "worker": os.getpid()}
+    render_cache = get_render_cache()
+    if render_cache:
+        hits, misses = render_cache.hits, render_cache.misses
+    inline_cache = get_inline_cache()
+    if inline_cache:
+        inline_hits, inline_misses = inline_cache.hits, inline_cache.misses
+    record_dependencies()
+    html_page, result["metadata"], result["title"] = render_page_html(
+        base_path, markdown_file, template_path
+    )
+    result["dependencies"] = recorded_dependencies()
+    result["seconds"] = time.perf_counter() - start
+    if render_cache:
+        result["cache_hits"] = render_cache.hits - hits
+        result["cache_misses"] = render_cache.misses - misses
+    if inline_cache:
+        result["inline_hits"] = inline_cache.hits - inline_hits
+        result["inline_misses"] = inline_cache.misses - inline_misses
+    return html_page, result
+
+
+async def run_pipeline(
+    base_path,
+    pages,
+    template_path,
+    jobs=1,
+    worker_settings=None,
+    background=None,
+    read_concurrency=8,
+    write_concurrency=8,
+    queue_size=32,
+):
+    worker_settings = worker_settings or {}
+    loop = asyncio.get_running_loop()
+    page_queue = asyncio.Queue()
+    render_queue = asyncio.Queue(queue_size)
+    write_queue = asyncio.Queue(queue_size)
+    for page in pages:
+        page_queue.put_nowait(page)
+    results = []
+
+    async def read_worker():
+        while not page_queue.empty():
+            from_path, dest_path = page_queue.get_nowait()
+            markdown_file = await loop.run_in_executor(
+                read_executor, read_source, from_path
+            )
+            await render_queue.put((from_path, dest_path, markdown_file))
+
+    async def render_worker():
+        while (item := await render_queue.get()) is not None:
+            from_path, dest_path, markdown_file = item
+            print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+            html_page, result = await loop.run_in_executor(
+                render_executor,
+                render_function,
+                base_path,
+                from_path,
+                markdown_file,
+                template_path,
+            )
+            results.append(result)
+            await write_queue.put((output_path_for(dest_path), html_page))
+
+    async def write_worker():
+        while (item := await write_queue.get()) is not None:
+            await loop.run_in_executor(write_executor, write_page, *item)
+
+    async def close_stage(stage_tasks, next_queue, next_count):
+        await asyncio.gather(*stage_tasks)
+        for _ in range(next_count):
+            await next_queue.put(None)
+
+    render_count = max(jobs, 1)
+    shared_executor = get_worker_pool() if jobs > 1 else None
+    render_function = render_source
+    if shared_executor:
+        render_executor = shared_executor
+        render_function = partial(run_with_settings, worker_settings, render_source)
+    elif jobs > 1:
+        render_executor = ProcessPoolExecutor(
+            max_workers=jobs, initializer=configure_worker, initargs=(worker_settings,)
+        )
+    else:
+        configure_worker(worker_settings)
+        render_executor = ThreadPoolExecutor(max_workers=1)
+    read_executor = ThreadPoolExecutor(max_workers=read_concurrency)
+    write_executor = ThreadPoolExecutor(max_workers=write_concurrency + 1)
+    readers = [asyncio.create_task(read_worker()) for _ in range(read_concurrency)]
+    renderers = [asyncio.create_task(render_worker()) for _ in range(render_count)]
+    writers = [asyncio.create_task(write_worker()) for _ in range(write_concurrency)]
+    tasks = readers + renderers + writers
+    tasks.append(asyncio.create_task(close_stage(readers, render_queue, render_count)))
+    tasks.append(asyncio.create_task(close_stage(renderers, write_queue, write_concurrency)))
+    background_future = (
+        loop.run_in_executor(write_executor, background) if background else None
+    )
+    try:
+        await asyncio.gather(*tasks)
+        background_result = await background_future if background_future else None
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    finally:
+        for executor in (read_executor, render_executor, write_executor):
+            if executor is not shared_executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+    if jobs > 1:
+        report_worker_timings(results)
+    return results, background_result
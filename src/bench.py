@@ -0,0 +1,192 @@
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+from block_markdown import markdown_to_blocks, markdown_to_html_node
+from builder import copy_files_form_source_to_destination, generate_pages_recursive
+from corpus import generate_corpus
+from inline_markdown import text_to_textnodes
+
+BENCHMARK_VERSION = 1
+
+
+def best_of(repeat, function):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(args):
+    root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+    with tempfile.TemporaryDirectory() as directory:
+        content_dir = os.path.join(directory, "content")
+        public_dir = os.path.join(directory, "docs")
+        paths = generate_corpus(
+            content_dir,
+            args.pages,
+            args.paragraphs,
+            args.paragraph_words,
+            args.link_density,
+            args.list_length,
+            args.nesting,
+            args.seed,
+        )
+        documents = [open(path).read() for path in paths]
+        paragraphs = [
+            block.replace("\n", " ")
+            for document in documents
+            for block in markdown_to_blocks(document)
+        ]
+        trees = [markdown_to_html_node(document) for document in documents]
+
+        def full_build():
+            if os.path.exists(public_dir):
+                shutil.rmtree(public_dir)
+            with redirect_stdout(io.StringIO()):
+                copy_files_form_source_to_destination(
+                    os.path.join(root, "static"), public_dir
+                )
+                generate_pages_recursive(
+                    "/",
+                    content_dir,
+                    os.path.join(root, "template.html"),
+                    public_dir,
+                    args.jobs,
+                )
+
+        benchmarks = {
+            "markdown_to_html_node": (
+                lambda: [markdown_to_html_node(document) for document in documents],
+                len(documents),
+            ),
+            "text_to_textnodes": (
+                lambda: [text_to_textnodes(paragraph) for paragraph in paragraphs],
+                len(paragraphs),
+            ),
+            "to_html": (lambda: [tree.to_html() for tree in trees], len(trees)),
+            "full_build": (full_build, len(documents)),
+        }
+        results = {}
+        for name, (function, items) in benchmarks.items():
+            if args.only and name not in args.only:
+                continue
+            seconds = best_of(args.repeat, function)
+            results[name] = {
+                "seconds": seconds,
+                "items": items,
+                "us_per_item": seconds / items * 1e6,
+            }
+    return {
+        "version": BENCHMARK_VERSION,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "config": {
+            "pages": args.pages,
+            "paragraphs": args.paragraphs,
+            "paragraph_words": args.paragraph_words,
+            "link_density": args.link_density,
+            "list_length": args.list_length,
+            "nesting": args.nesting,
+            "seed": args.seed,
+            "jobs": args.jobs,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_results(baseline, current, threshold):
+    regressions = []
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+        before = baseline["results"][name]["seconds"]
+        change = (result["seconds"] - before) / before if before else 0.0
+        regressions.append((name, before, result["seconds"], change, change > threshold))
+    return regressions
+
+
+def print_results(report):
+    print(f"Benchmarks at commit {report['commit']} ({report['config']['pages']} pages)")
+    for name, result in report["results"].items():
+        print(
+            f"  {name:<24} {result['seconds']:>9.4f}s {result['us_per_item']:>12.1f} us/item"
+        )
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Benchmark the static site generator.")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--paragraphs", type=int, default=8)
+    parser.add_argument("--paragraph-words", type=int, default=80)
+    parser.add_argument("--link-density", type=float, default=0.05)
+    parser.add_argument("--list-length", type=int, default=5)
+    parser.add_argument("--nesting", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", "-j", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="*", metavar="BENCHMARK")
+    parser.add_argument("--output", metavar="PATH", help="write results as JSON")
+    parser.add_argument(
+        "--compare", metavar="BASELINE", help="compare against a previous JSON result"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative slowdown that counts as a regression (default 0.10)",
+    )
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    report = run_benchmarks(args)
+    print_results(report)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=1)
+        print(f"Results written to {args.output}")
+    if not args.compare:
+        return
+    baseline = json.load(open(args.compare))
+    if baseline["config"] != report["config"]:
+        print("Warning: baseline was recorded with a different configuration")
+    print(f"Compared with {baseline['commit']} (threshold {args.threshold:.0%}):")
+    regressed = False
+    for name, before, after, change, is_regression in compare_results(
+        baseline, report, args.threshold
+    ):
+        marker = "REGRESSION" if is_regression else "ok"
+        print(f"  {name:<24} {before:>9.4f}s -> {after:>9.4f}s {change:>+8.1%} {marker}")
+        regressed = regressed or is_regression
+    if regressed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+import re
+import sys
+import time
+
+from block_markdown import BlockType, block_to_html_node, classify_block
+
+SAMPLE_BLOCKS = {
+    BlockType.PARAGRAPH: "This is a paragraph with **bold** and _italic_ text\nover two lines.",
+    BlockType.HEADING: "### A heading with `code` in it",
+    BlockType.CODE: "```python\nprint('hello')\nprint('world')\n```",
+    BlockType.QUOTES: "> A quote with **bold**\n> spread over\n> three lines",
+    BlockType.ULIST: "\n".join(f"- item {index} with [a link](/page{index})" for index in range(8)),
+    BlockType.OLIST: "\n".join(f"{index}. item {index} with _emphasis_" for index in range(8)),
+}
+
+
+def chained_block_to_block_type(block):
+    if block.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### ")):
+        return BlockType.HEADING
+    if block.startswith("```") and block.endswith("```"):
+        return BlockType.CODE
+    if block.startswith("> "):
+        return BlockType.QUOTES
+    if block.startswith("- "):
+        return BlockType.ULIST
+    if re.findall(r"^\d*\.\ ", block):
+        return BlockType.OLIST
+    return BlockType.PARAGRAPH
+
+
+def chained_block_payload(block):
+    block_type = chained_block_to_block_type(block)
+    match block_type:
+        case BlockType.HEADING:
+            level = len(re.findall(r"^\#*\ ", block)[0]) - 1
+            return block_type, (level, block.replace(re.findall(r"^\#*\ ", block)[0], ""))
+        case BlockType.CODE:
+            return block_type, ("", block.replace("```", ""))
+        case BlockType.QUOTES:
+            return block_type, block.replace("> ", "")
+        case BlockType.ULIST:
+            return block_type, [line.replace("- ", "") for line in block.split("\n")]
+        case BlockType.OLIST:
+            return block_type, [re.sub(r"^\d*\.\ ", "", line) for line in block.split("\n")]
+    return block_type, block
+
+
+def best_time(function, argument, repeat, number):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function(argument)
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    print(f"{'block':>10} {'chained (us)':>13} {'classify (us)':>14} {'render (us)':>12}")
+    for block_type, block in SAMPLE_BLOCKS.items():
+        if classify_block(block)[0] is not block_type:
+            raise ValueError(f"sample block is not a {block_type.value} block")
+        chained = best_time(chained_block_payload, block, 5, number)
+        classify = best_time(classify_block, block, 5, number)
+        render = best_time(
+            lambda payload: block_to_html_node(block_type, payload),
+            classify_block(block)[1],
+            5,
+            number // 10,
+        )
+        print(
+            f"{block_type.value:>10} {chained * 1e6:>13.3f} {classify * 1e6:>14.3f}"
+            f" {render * 1e6:>12.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
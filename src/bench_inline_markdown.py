@@ -0,0 +1,54 @@
+import sys
+import time
+
+from inline_markdown import (
+    split_nodes_delimiter,
+    split_nodes_image,
+    split_nodes_link,
+    text_to_textnodes,
+)
+from textnode import TextNode, TextType
+
+
+def chained_text_to_textnodes(text):
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_image(nodes)
+    return nodes
+
+
+def link_heavy_paragraph(link_count):
+    links = " and ".join(
+        f"[reference page {index}](/docs/page{index})" for index in range(link_count)
+    )
+    return f"See **all** of {links} for _details_ on `code`."
+
+
+def best_time(function, text, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    link_counts = [int(count) for count in sys.argv[1:]] or [250, 500, 1000, 2000, 4000]
+    print(f"{'links':>8} {'chained (s)':>12} {'us/link':>9} {'single (s)':>12} {'us/link':>9}")
+    for link_count in link_counts:
+        text = link_heavy_paragraph(link_count)
+        chained = best_time(chained_text_to_textnodes, text, 3)
+        single = best_time(text_to_textnodes, text, 3)
+        print(
+            f"{link_count:>8} {chained:>12.4f} {chained / link_count * 1e6:>9.2f}"
+            f" {single:>12.4f} {single / link_count * 1e6:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
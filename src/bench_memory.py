@@ -0,0 +1,86 @@
+import multiprocessing
+import os
+import resource
+import sys
+import tracemalloc
+
+import block_markdown
+import inline_markdown
+import textnode
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode
+
+
+class DictTextNode(TextNode):
+    pass
+
+
+class DictLeafNode(LeafNode):
+    pass
+
+
+class DictParentNode(ParentNode):
+    pass
+
+
+def use_dict_nodes():
+    inline_markdown.TextNode = DictTextNode
+    textnode.LeafNode = DictLeafNode
+    block_markdown.ParentNode = DictParentNode
+
+
+def load_corpus(content_dir, copies):
+    documents = []
+    for directory, _, file_names in os.walk(content_dir):
+        for file_name in sorted(file_names):
+            if file_name.endswith(".md"):
+                with open(os.path.join(directory, file_name), "r") as markdown_file:
+                    documents.append(markdown_file.read())
+    return documents * copies
+
+
+def count_nodes(node):
+    if not isinstance(node, ParentNode):
+        return 1
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+
+def measure(variant, corpus, results):
+    if variant == "dict":
+        use_dict_nodes()
+    tracemalloc.start()
+    trees = [block_markdown.markdown_to_html_node(document) for document in corpus]
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    node_count = sum(count_nodes(tree) for tree in trees)
+    results[variant] = {
+        "nodes": node_count,
+        "retained_bytes": retained,
+        "peak_bytes": peak,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def main():
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    content_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "content")
+    corpus = load_corpus(content_dir, copies)
+    print(f"Parsing {len(corpus)} documents")
+    results = multiprocessing.Manager().dict()
+    for variant in ("dict", "slots"):
+        process = multiprocessing.Process(target=measure, args=(variant, corpus, results))
+        process.start()
+        process.join()
+    print(
+        f"{'nodes':>10} {'variant':>8} {'peak RSS (KB)':>14} {'traced peak (B)':>16} {'bytes/node':>11}"
+    )
+    for variant in ("dict", "slots"):
+        result = results[variant]
+        print(
+            f"{result['nodes']:>10} {variant:>8} {result['peak_rss_kb']:>14}"
+            f" {result['peak_bytes']:>16} {result['retained_bytes'] / result['nodes']:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
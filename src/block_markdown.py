@@ -1,8 +1,18 @@
 import re
 from enum import Enum
 from htmlnode import LeafNode, ParentNode
-from inline_markdown import text_to_textnodes
-from textnode import TextNode, text_node_to_html_node
+from image_pipeline import image_attributes
+from includes import INCLUDE_PATTERN, load_include
+from inline_markdown import extract_markdown_images, parse_inline
+from textnode import TextType, text_node_to_html_node
+
+
+RENDERER_VERSION = 2
+
+HEADING_PATTERN = re.compile(r"(#+) (.*)", re.DOTALL)
+BLOCK_HEADING_PATTERN = re.compile(r"(#{1,6}) (.*)", re.DOTALL)
+CODE_LANGUAGE_PATTERN = re.compile(r"[\w+#.-]*")
+OLIST_MARKER_PATTERN = re.compile(r"^\d*\. ", re.MULTILINE)
 
 
 class BlockType(Enum):
@@ -15,115 +25,214 @@ class BlockType(Enum):
 
 
 def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
-    html_nodes = []
+    blocks = markdown_to_blocks(markdown) if isinstance(markdown, str) else markdown
+    return ParentNode("div", children=list(iter_block_html_nodes(blocks)))
+
+
+def iter_block_html_nodes(blocks):
     for block in blocks:
-        if not block or block in ("",):
+        if not block:
             continue
-        html_nodes.append(
-            text_node_to_parent_html_node(TextNode(block, block_to_block_type(block)))
-        )
-    return ParentNode("div", children=html_nodes)
+        yield block_to_html_node(*classify_block(block))
+
+
+def markdown_to_html_fragments(markdown, render_cache):
+    blocks = markdown_to_blocks(markdown) if isinstance(markdown, str) else markdown
+    classified_blocks = []
+    for block in blocks:
+        if not block:
+            continue
+        classified_blocks.append((render_cache_text(block), *classify_block(block)))
+    if not classified_blocks:
+        raise ValueError("children must be provided")
+    return render_cache.render_blocks(classified_blocks, render_block)
+
+
+def render_cache_text(block):
+    if "![" not in block:
+        return block
+    attributes = [image_attributes(url) for _, url in extract_markdown_images(block)]
+    return f"{block}\0{attributes!r}"
+
+
+def render_block(block_type, payload):
+    return block_to_html_node(block_type, payload).to_html()
 
 
 def text_node_to_parent_html_node(text_node):
+    payload = PAYLOAD_PARSERS.get(text_node.text_type, str)(text_node.text)
+    if payload is None:
+        return block_to_html_node(BlockType.PARAGRAPH, text_node.text)
+    return block_to_html_node(text_node.text_type, payload)
 
-    match text_node.text_type:
-        case BlockType.PARAGRAPH:
+
+def block_to_html_node(block_type, payload):
+    match block_type:
+        case BlockType.HEADING:
+            level, text = payload
             return ParentNode(
-                "p", children=text_to_leaf_html_nodes(text_node.text.replace("\n", " "))
+                f"h{min(level, 6)}",
+                children=text_to_leaf_html_nodes(text.replace("\n", " ")),
             )
         case BlockType.CODE:
-            text_node.text = text_node.text.replace("```", "")
+            _, code = payload
             return ParentNode(
-                "code",
-                children=text_to_leaf_html_nodes(text_node.text.replace("\n", " ")),
+                "code", children=text_to_leaf_html_nodes(code.replace("\n", " "))
             )
         case BlockType.QUOTES:
-            text_node.text = text_node.text.replace("> ", "")
             return ParentNode(
-                "blockquote",
-                children=text_to_leaf_html_nodes(text_node.text.replace("\n", " ")),
-            )
-
-        case BlockType.HEADING:
-            length_of_heading_markers = (
-                len(re.findall(r"^\#*\ ", text_node.text)[0]) - 1
+                "blockquote", children=text_to_leaf_html_nodes(payload.replace("\n", " "))
             )
+        case BlockType.ULIST:
             return ParentNode(
-                f"h{ length_of_heading_markers  if  length_of_heading_markers<=6 else  6}",
-                children=text_to_leaf_html_nodes(
-                    text_node.text.replace(
-                        re.findall(r"^\#*\ ", text_node.text)[0], ""
-                    ).replace("\n", " ")
-                ),
+                "ul",
+                children=[
+                    ParentNode("li", children=text_to_leaf_html_nodes(item))
+                    for item in payload
+                ],
             )
-        case BlockType.ULIST:
-            splited_list_text = text_node.text.split("\n")
-            children = []
-            for list_text in splited_list_text:
-                children.append(
-                    ParentNode(
-                        "li",
-                        children=text_to_leaf_html_nodes(list_text.replace("- ", "")),
-                    )
-                )
-            return ParentNode("ul", children=children)
         case BlockType.OLIST:
-            splited_list_text = text_node.text.split("\n")
-            children = []
-            for list_text in splited_list_text:
-                children.append(
-                    ParentNode(
-                        "li",
-                        children=text_to_leaf_html_nodes(
-                            re.sub(
-                                r"^\d*\.\ ",
-                                "",
-                                list_text,
-                            ),
-                        ),
-                    )
-                )
-            return ParentNode("ol", children=children)
-
+            return ParentNode(
+                "ol",
+                children=[
+                    ParentNode("li", children=text_to_leaf_html_nodes(item))
+                    for item in payload
+                ],
+            )
         case _:
             return ParentNode(
-                "p",
-                children=text_to_leaf_html_nodes(text_node.text.replace("\n", " ")),
+                "p", children=text_to_leaf_html_nodes(payload.replace("\n", " "))
             )
 
 
 def text_to_leaf_html_nodes(text):
     if not text:
         return []
-    child_text_nodes = text_to_textnodes(text)
+    child_text_nodes = parse_inline(text)
     children = []
     for child_text_node in child_text_nodes:
         if child_text_node.text == "":
             continue
-        children.append(text_node_to_html_node(child_text_node))
+        html_node = text_node_to_html_node(child_text_node)
+        if child_text_node.text_type is TextType.IMAGE:
+            html_node.props.update(image_attributes(child_text_node.url) or {})
+        children.append(html_node)
     return children
 
 
-def block_to_block_type(block):
+def parse_heading(block):
+    match = HEADING_PATTERN.match(block)
+    if match:
+        return len(match[1]), match[2]
+
+
+def parse_heading_block(block):
+    match = BLOCK_HEADING_PATTERN.match(block)
+    if match:
+        return len(match[1]), match[2]
 
-    if block.startswith(("# ", "## ", "### ", "#### ", "##### ", "###### ")):
-        return BlockType.HEADING
-    if block.startswith("```") and block.endswith("```"):
-        return BlockType.CODE
+
+def parse_code(block):
+    if not block.startswith("```") or not block.endswith("```"):
+        return None
+    code = block[3:-3]
+    first_line_end = code.find("\n")
+    if first_line_end != -1 and CODE_LANGUAGE_PATTERN.fullmatch(code, 0, first_line_end):
+        return code[:first_line_end], code[first_line_end:]
+    return "", code
+
+
+def parse_quote(block):
     if block.startswith("> "):
-        return BlockType.QUOTES
+        return block[2:].replace("\n> ", "\n")
+
+
+def parse_unordered_list(block):
     if block.startswith("- "):
-        return BlockType.ULIST
-    if re.findall(r"^\d*\.\ ", block):
-        return BlockType.OLIST
+        return block[2:].replace("\n- ", "\n").split("\n")
+
+
+def parse_ordered_list(block):
+    if OLIST_MARKER_PATTERN.match(block):
+        return OLIST_MARKER_PATTERN.sub("", block).split("\n")
+
+
+PAYLOAD_PARSERS = {
+    BlockType.HEADING: parse_heading,
+    BlockType.CODE: parse_code,
+    BlockType.QUOTES: parse_quote,
+    BlockType.ULIST: parse_unordered_list,
+    BlockType.OLIST: parse_ordered_list,
+}
+
+BLOCK_DISPATCH = {
+    "#": (BlockType.HEADING, parse_heading_block),
+    "`": (BlockType.CODE, parse_code),
+    ">": (BlockType.QUOTES, parse_quote),
+    "-": (BlockType.ULIST, parse_unordered_list),
+    ".": (BlockType.OLIST, parse_ordered_list),
+    **{digit: (BlockType.OLIST, parse_ordered_list) for digit in "0123456789"},
+}
+PARAGRAPH = BlockType.PARAGRAPH
+
+
+def classify_block(block):
+    dispatch = BLOCK_DISPATCH.get(block[:1])
+    if dispatch is not None:
+        block_type, parse = dispatch
+        payload = parse(block)
+        if payload is not None:
+            return block_type, payload
+    return PARAGRAPH, block
+
 
-    return BlockType.PARAGRAPH
+def block_to_block_type(block):
+    return classify_block(block)[0]
 
 
 def markdown_to_blocks(markdown):
-    new_blocks = markdown.split("\n\n")
-    new_blocks = filter(lambda x: x not in ("", "\n"), new_blocks)
-    new_blocks = list(map(lambda x: x.strip(), new_blocks))
-    return new_blocks
+    return list(iter_blocks(markdown.split("\n")))
+
+
+def iter_blocks(lines):
+    return expand_includes(iter_raw_blocks(lines))
+
+
+def expand_includes(blocks, included=()):
+    for block in blocks:
+        if not block.startswith("{{"):
+            yield block
+            continue
+        match = INCLUDE_PATTERN.fullmatch(block)
+        include = match and load_include(match[1], split_include)
+        if not include:
+            yield block
+            continue
+        path, include_blocks = include
+        if path in included:
+            raise ValueError(f"Include cycle through {path}")
+        yield from expand_includes(include_blocks, included + (path,))
+
+
+def split_include(markdown):
+    return tuple(iter_raw_blocks(markdown.split("\n")))
+
+
+def iter_raw_blocks(lines):
+    block_lines = []
+    in_fence = False
+    for line in lines:
+        line = line.rstrip("\n")
+        if line.count("```") % 2:
+            in_fence = not in_fence
+        if line or in_fence:
+            block_lines.append(line)
+            continue
+        if block_lines:
+            block = "\n".join(block_lines).strip()
+            block_lines = []
+            if block:
+                yield block
+    block = "\n".join(block_lines).strip()
+    if block:
+        yield block
@@ -0,0 +1,665 @@
+import asyncio
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+
+from asset_sync import copy_file, remove_empty_directories, sync_assets
+from block_markdown import (
+    RENDERER_VERSION,
+    block_to_html_node,
+    classify_block,
+    iter_block_html_nodes,
+    iter_blocks,
+    markdown_to_blocks,
+    markdown_to_html_fragments,
+)
+from front_matter import page_context, read_front_matter, split_front_matter
+from htmlnode import ParentNode
+from image_pipeline import (
+    build_image_attributes,
+    configure_image_attributes,
+    process_images,
+    publish_variants,
+)
+from includes import configure_includes, record_dependencies, recorded_dependencies
+from inline_markdown import configure_inline_cache, get_inline_cache
+from link_graph import index_links, list_static_files, load_link_graph
+from manifest import hash_file, load_manifest, save_manifest
+from minify import asset_urls, process_assets, publish_assets
+from pages import extract_title, output_path_for, write_output
+from profiler import StageRecorder
+from render_cache import configure_render_cache, get_render_cache
+from template import configure_template, load_template, rebase_links
+
+
+def copy_files_form_source_to_destination(source, destination, strategy="auto"):
+    if os.path.exists(destination):
+        for content in os.listdir(destination):
+            destination_content_path = os.path.join(destination, content)
+            if os.path.isdir(destination_content_path) and not os.path.islink(
+                destination_content_path
+            ):
+                shutil.rmtree(destination_content_path)
+            else:
+                os.remove(destination_content_path)
+    else:
+        os.mkdir(destination)
+    content_of_source = os.listdir(source)
+    for content in content_of_source:
+        destination_content_path = os.path.join(destination, content)
+        source_content_path = os.path.join(source, content)
+        if os.path.isfile(source_content_path):
+            copy_file(source_content_path, destination_content_path, strategy)
+        else:
+            copy_files_form_source_to_destination(
+                source_content_path, destination_content_path, strategy
+            )
+
+
+def generate_page(base_path, from_path, template_path, dest_path):
+    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+    template = load_template(template_path, base_path)
+    render_cache = get_render_cache()
+    output_path = output_path_for(dest_path)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(from_path, "r") as markdown_file:
+        metadata = read_front_matter(markdown_file)
+        body_start = markdown_file.tell()
+        page_title = metadata.get("title") or extract_title(markdown_file)
+        markdown_file.seek(body_start)
+        if render_cache:
+            content = stream_fragments(
+                markdown_to_html_fragments(iter_blocks(markdown_file), render_cache),
+                base_path,
+            )
+        else:
+            content = stream_blocks(iter_blocks(markdown_file), base_path)
+        context = page_context(metadata, page_title, content)
+        write_output(output_path, lambda write: template.render_stream(context, write))
+    return metadata, page_title
+
+
+def render_page_html(base_path, markdown_file, template_path):
+    metadata, markdown_file = split_front_matter(markdown_file)
+    page_title = metadata.get("title") or extract_title(markdown_file)
+    render_cache = get_render_cache()
+    if render_cache:
+        content = stream_fragments(
+            markdown_to_html_fragments(markdown_file, render_cache), base_path
+        )
+    else:
+        content = stream_blocks(markdown_to_blocks(markdown_file), base_path)
+    html_page = load_template(template_path, base_path).render(
+        page_context(metadata, page_title, content)
+    )
+    return html_page, metadata, page_title
+
+
+def stream_blocks(blocks, base_path):
+    def write_content(write):
+        def write_rebased(chunk):
+            write(rebase_links(chunk, base_path))
+
+        write("<div>")
+        has_children = False
+        for html_node in iter_block_html_nodes(blocks):
+            html_node.to_html_stream(write_rebased)
+            has_children = True
+        if not has_children:
+            raise ValueError("children must be provided")
+        write("</div>")
+
+    return write_content
+
+
+def stream_fragments(fragments, base_path):
+    def write_content(write):
+        write("<div>")
+        for fragment in fragments:
+            write(rebase_links(fragment, base_path))
+        write("</div>")
+
+    return write_content
+
+
+def generate_page_profiled(base_path, from_path, template_path, dest_path):
+    print(f"Profiling page from {from_path} to {dest_path} using {template_path}")
+    recorder = StageRecorder()
+    with recorder.stage("read"):
+        with open(from_path, "r") as source_file:
+            metadata, markdown_file = split_front_matter(source_file.read())
+    with recorder.stage("markdown_to_blocks"):
+        blocks = [block for block in markdown_to_blocks(markdown_file) if block]
+    with recorder.stage("block_to_block_type"):
+        classified_blocks = [classify_block(block) for block in blocks]
+    with recorder.stage("inline_parsing"):
+        html_node = ParentNode(
+            "div",
+            children=[
+                block_to_html_node(block_type, payload)
+                for block_type, payload in classified_blocks
+            ],
+        )
+    with recorder.stage("to_html"):
+        html_string = html_node.to_html()
+    with recorder.stage("template"):
+        page_title = metadata.get("title") or extract_title(markdown_file)
+        new_html_page = load_template(template_path, base_path).render(
+            page_context(metadata, page_title, rebase_links(html_string, base_path))
+        )
+    with recorder.stage("write"):
+        output_path = output_path_for(dest_path)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with open(output_path, "w") as output_file:
+            output_file.write(new_html_page)
+    return recorder.stages, metadata, page_title
+
+
+def generate_pages_recursive(
+    base_path,
+    dir_path_content,
+    template_path,
+    dest_dir_path,
+    jobs=1,
+    profile=False,
+    worker_settings=None,
+):
+    return render_pages(
+        base_path,
+        collect_pages(dir_path_content, dest_dir_path),
+        template_path,
+        jobs,
+        profile,
+        worker_settings,
+    )
+
+
+_worker_pool = None
+_worker_settings = None
+
+
+@contextmanager
+def shared_worker_pool(jobs):
+    global _worker_pool
+    if jobs <= 1:
+        yield None
+        return
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=configure_worker, initargs=({},)
+    ) as executor:
+        _worker_pool = executor
+        try:
+            yield executor
+        finally:
+            _worker_pool = None
+
+
+def get_worker_pool():
+    return _worker_pool
+
+
+def run_with_settings(worker_settings, function, *args):
+    if worker_settings != _worker_settings:
+        configure_worker(worker_settings)
+    return function(*args)
+
+
+def configure_worker(worker_settings):
+    global _worker_settings
+    _worker_settings = worker_settings
+    configure_render_cache(*worker_settings.get("render_cache", (None,)))
+    configure_image_attributes(worker_settings.get("images"))
+    configure_template(**worker_settings.get("template", {}))
+    configure_inline_cache(worker_settings.get("inline_cache", 0))
+    configure_includes(worker_settings.get("includes"))
+
+
+def render_page(base_path, from_path, template_path, dest_path, profile=False):
+    start = time.perf_counter()
+    result = {"page": from_path, "worker": os.getpid()}
+    render_cache = get_render_cache()
+    if render_cache:
+        hits, misses = render_cache.hits, render_cache.misses
+    inline_cache = get_inline_cache()
+    if inline_cache:
+        inline_hits, inline_misses = inline_cache.hits, inline_cache.misses
+    record_dependencies()
+    if profile:
+        result["stages"], result["metadata"], result["title"] = generate_page_profiled(
+            base_path, from_path, template_path, dest_path
+        )
+    else:
+        result["metadata"], result["title"] = generate_page(
+            base_path, from_path, template_path, dest_path
+        )
+    result["dependencies"] = recorded_dependencies()
+    result["seconds"] = time.perf_counter() - start
+    if render_cache:
+        result["cache_hits"] = render_cache.hits - hits
+        result["cache_misses"] = render_cache.misses - misses
+    if inline_cache:
+        result["inline_hits"] = inline_cache.hits - inline_hits
+        result["inline_misses"] = inline_cache.misses - inline_misses
+    return result
+
+
+def render_pages(
+    base_path, pages, template_path, jobs=1, profile=False, worker_settings=None
+):
+    worker_settings = worker_settings or {}
+    arguments = (
+        [base_path] * len(pages),
+        [from_path for from_path, _ in pages],
+        [template_path] * len(pages),
+        [dest_path for _, dest_path in pages],
+        [profile] * len(pages),
+    )
+    if jobs <= 1 or len(pages) <= 1:
+        configure_worker(worker_settings)
+        return list(map(render_page, *arguments))
+    chunksize = max(1, len(pages) // (jobs * 4))
+    if _worker_pool:
+        results = list(
+            _worker_pool.map(
+                partial(run_with_settings, worker_settings, render_page),
+                *arguments,
+                chunksize=chunksize,
+            )
+        )
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs, initializer=configure_worker, initargs=(worker_settings,)
+        ) as executor:
+            results = list(executor.map(render_page, *arguments, chunksize=chunksize))
+    report_worker_timings(results)
+    return results
+
+
+def report_worker_timings(results):
+    worker_timings = {}
+    for result in results:
+        page_count, total = worker_timings.get(result["worker"], (0, 0.0))
+        worker_timings[result["worker"]] = (page_count + 1, total + result["seconds"])
+    for worker, (page_count, total) in sorted(worker_timings.items()):
+        print(f"Worker {worker}: rendered {page_count} pages in {total:.3f}s")
+
+
+def collect_pages(dir_path_content, dest_dir_path):
+    pages = []
+    for content in sorted(os.listdir(dir_path_content)):
+        dir_content_path = os.path.join(dir_path_content, content)
+        dest_content_path = os.path.join(dest_dir_path, content)
+        if os.path.isdir(dir_content_path):
+            pages.extend(collect_pages(dir_content_path, dest_content_path))
+        elif dir_content_path.split(".")[-1] == "md":
+            pages.append((dir_content_path, dest_content_path))
+    return pages
+
+
+def remove_stale_outputs(public_dir_path, previous_outputs, current_outputs):
+    for relative_path in sorted(set(previous_outputs) - set(current_outputs)):
+        output_path = os.path.join(public_dir_path, relative_path)
+        if not os.path.isfile(output_path):
+            continue
+        print(f"Removing stale output {output_path}")
+        os.remove(output_path)
+        remove_empty_directories(os.path.dirname(output_path), public_dir_path)
+
+
+def build_incremental(
+    base_path,
+    dir_path_content,
+    static_dir_path,
+    template_path,
+    public_dir_path,
+    manifest_path,
+    jobs=1,
+    profile=False,
+    asset_strategy="auto",
+    checksum_assets=False,
+    worker_settings=None,
+    pipeline=None,
+):
+    manifest = load_manifest(manifest_path)
+    template_hash = hash_file(template_path)
+    template_options = (worker_settings or {}).get("template", {})
+    rebuild_all = (
+        manifest["template"] != template_hash
+        or manifest["base_path"] != base_path
+        or manifest["template_options"] != template_options
+    )
+    changed_dependencies = {
+        path
+        for path, dependency_hash in manifest["dependencies"].items()
+        if not os.path.exists(path) or hash_file(path) != dependency_hash
+    }
+    graph_path = os.path.join(os.path.dirname(manifest_path), "link-graph.json")
+    images = (worker_settings or {}).get("images", {})
+    changed_images = {
+        url
+        for url in set(manifest["images"]) | set(images)
+        if manifest["images"].get(url) != images.get(url)
+    }
+    image_dependents = set()
+    if changed_images:
+        graph = load_link_graph(graph_path)
+        rebuild_all = rebuild_all or not graph["pages"]
+        for url in changed_images:
+            image_dependents.update(graph["backlinks"].get(url, ()))
+    os.makedirs(public_dir_path, exist_ok=True)
+    sync_static_files = partial(
+        sync_assets,
+        static_dir_path,
+        public_dir_path,
+        manifest["static"],
+        asset_strategy,
+        checksum_assets,
+    )
+    pages = {}
+    pages_to_render = []
+    for from_path, dest_path in collect_pages(dir_path_content, public_dir_path):
+        output_path = output_path_for(dest_path)
+        relative_source = os.path.relpath(from_path, dir_path_content)
+        source_hash = hash_file(from_path)
+        previous = manifest["pages"].get(relative_source)
+        pages[relative_source] = {
+            "hash": source_hash,
+            "output": os.path.relpath(output_path, public_dir_path),
+            "dependencies": previous["dependencies"] if previous else [],
+        }
+        if (
+            not rebuild_all
+            and previous
+            and previous["hash"] == source_hash
+            and relative_source not in image_dependents
+            and changed_dependencies.isdisjoint(previous["dependencies"])
+            and os.path.exists(output_path)
+        ):
+            continue
+        pages_to_render.append((from_path, dest_path))
+    if pipeline and not profile:
+        results, (static_files, _) = run_async_build(
+            base_path,
+            pages_to_render,
+            template_path,
+            jobs,
+            worker_settings,
+            sync_static_files,
+            pipeline,
+        )
+    else:
+        static_files, _ = sync_static_files()
+        results = render_pages(
+            base_path, pages_to_render, template_path, jobs, profile, worker_settings
+        )
+    for result in results:
+        relative_source = os.path.relpath(result["page"], dir_path_content)
+        pages[relative_source]["dependencies"] = result["dependencies"]
+    remove_stale_outputs(
+        public_dir_path,
+        [page["output"] for page in manifest["pages"].values()],
+        [page["output"] for page in pages.values()] + static_files,
+    )
+    index_links(
+        graph_path,
+        dir_path_content,
+        {relative_source: page["hash"] for relative_source, page in pages.items()},
+        static_files,
+    )
+    manifest["base_path"] = base_path
+    manifest["template"] = template_hash
+    manifest["pages"] = pages
+    manifest["static"] = static_files
+    manifest["images"] = images
+    manifest["template_options"] = template_options
+    manifest["dependencies"] = {
+        path: hash_file(path)
+        for path in sorted(
+            {path for page in pages.values() for path in page["dependencies"]}
+        )
+        if os.path.exists(path)
+    }
+    save_manifest(manifest_path, manifest)
+    return results
+
+
+def run_async_build(
+    base_path, pages, template_path, jobs, worker_settings, background, pipeline
+):
+    from async_pipeline import run_pipeline
+
+    return asyncio.run(
+        run_pipeline(
+            base_path,
+            pages,
+            template_path,
+            jobs,
+            worker_settings,
+            background,
+            **pipeline,
+        )
+    )
+
+
+def default_site(base_path):
+    base_path_start = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        "..",
+    )
+    return {
+        "name": None,
+        "base_path": base_path,
+        "content": os.path.join(base_path_start, "content"),
+        "static": os.path.join(base_path_start, "static"),
+        "template": os.path.join(base_path_start, "template.html"),
+        "includes": os.path.join(base_path_start, "includes"),
+        "output": os.path.join(base_path_start, "docs"),
+        "cache": os.path.join(base_path_start, ".cache"),
+        "shared_cache": os.path.join(base_path_start, ".cache"),
+        "site_url": None,
+    }
+
+
+def build(args, site=None):
+    site = site or default_site(args.base_path)
+    base_path = site["base_path"]
+    dir_path_content = site["content"]
+    static_dir_path = site["static"]
+    template_path = site["template"]
+    public_dir_path = site["output"]
+    cache_dir_path = site["cache"]
+    site_url = site["site_url"] or args.site_url
+    worker_settings = {
+        "inline_cache": args.inline_cache_size,
+        "includes": site["includes"],
+    }
+    if args.render_cache:
+        worker_settings["render_cache"] = (
+            os.path.join(site["shared_cache"], "render-cache.sqlite"),
+            args.render_cache_size * 1024 * 1024,
+            RENDERER_VERSION,
+        )
+    if args.images:
+        image_index, stale_variants = process_images(
+            static_dir_path, cache_dir_path, args.image_widths, args.jobs
+        )
+        worker_settings["images"] = build_image_attributes(image_index)
+    if args.minify:
+        asset_index, stale_assets = process_assets(static_dir_path, cache_dir_path)
+        worker_settings["template"] = {
+            "minify": True,
+            "asset_urls": asset_urls(asset_index),
+        }
+    configure_worker(worker_settings)
+    pipeline = None
+    if args.async_pipeline:
+        if args.profile:
+            print("--profile renders pages synchronously, ignoring --async-pipeline")
+        pipeline = {
+            "read_concurrency": args.read_concurrency,
+            "write_concurrency": args.write_concurrency,
+            "queue_size": args.queue_size,
+        }
+    if args.incremental:
+        manifest_path = os.path.join(cache_dir_path, "manifest.json")
+        results = build_incremental(
+            base_path,
+            dir_path_content,
+            static_dir_path,
+            template_path,
+            public_dir_path,
+            manifest_path,
+            args.jobs,
+            bool(args.profile),
+            args.asset_strategy,
+            args.checksum_assets,
+            worker_settings,
+            pipeline,
+        )
+        sources = {
+            relative_source: page["hash"]
+            for relative_source, page in load_manifest(manifest_path)["pages"].items()
+        }
+    else:
+        results = build_full(
+            base_path,
+            dir_path_content,
+            static_dir_path,
+            template_path,
+            public_dir_path,
+            args.jobs,
+            bool(args.profile),
+            worker_settings,
+            pipeline,
+            args.asset_strategy,
+        )
+        sources = {
+            os.path.relpath(from_path, dir_path_content): hash_file(from_path)
+            for from_path, _ in collect_pages(dir_path_content, public_dir_path)
+        }
+        index_links(
+            os.path.join(cache_dir_path, "link-graph.json"),
+            dir_path_content,
+            sources,
+            list_static_files(static_dir_path),
+        )
+    from metadata_index import index_metadata
+
+    metadata_index = index_metadata(
+        os.path.join(cache_dir_path, "metadata-index.json"),
+        dir_path_content,
+        sources,
+        {
+            os.path.relpath(result["page"], dir_path_content): (
+                result["metadata"],
+                result["title"],
+            )
+            for result in results
+        },
+    )
+    if args.listings:
+        from listings import build_listings
+
+        build_listings(
+            metadata_index,
+            template_path,
+            public_dir_path,
+            base_path,
+            os.path.join(cache_dir_path, "listings.json"),
+            args.listing_section,
+            args.page_size,
+        )
+    if args.sitemap or args.feeds:
+        from feeds import write_feeds, write_sitemap
+
+        if args.sitemap:
+            urls, shards = write_sitemap(
+                metadata_index, public_dir_path, site_url, base_path
+            )
+            print(f"Sitemap: {urls} URLs in {shards or 1} files")
+        if args.feeds:
+            entries = write_feeds(
+                metadata_index, public_dir_path, site_url, base_path, args.feed_size
+            )
+            print(f"Feeds: {entries} entries")
+    if args.images:
+        publish_variants(
+            image_index,
+            cache_dir_path,
+            public_dir_path,
+            stale_variants,
+            args.asset_strategy,
+        )
+    if args.minify:
+        publish_assets(
+            asset_index,
+            cache_dir_path,
+            public_dir_path,
+            stale_assets,
+            args.asset_strategy,
+        )
+    if args.search_index:
+        from search_index import update_search_index
+
+        update_search_index(
+            os.path.join(cache_dir_path, "search-index.json"),
+            dir_path_content,
+            sources,
+            public_dir_path,
+            base_path,
+            args.search_prefix_length,
+        )
+    if args.precompress:
+        from precompress import precompress, report_precompression
+
+        report_precompression(precompress(public_dir_path, args.jobs))
+    return results
+
+
+def build_full(
+    base_path,
+    dir_path_content,
+    static_dir_path,
+    template_path,
+    public_dir_path,
+    jobs=1,
+    profile=False,
+    worker_settings=None,
+    pipeline=None,
+    asset_strategy="auto",
+):
+    if not os.path.exists(public_dir_path):
+        os.makedirs(public_dir_path)
+    else:
+        for content in os.listdir(public_dir_path):
+            content_path = os.path.join(public_dir_path, content)
+            if os.path.isdir(content_path):
+                shutil.rmtree(content_path)
+                continue
+            os.remove(content_path)
+    if pipeline and not profile:
+        results, _ = run_async_build(
+            base_path,
+            collect_pages(dir_path_content, public_dir_path),
+            template_path,
+            jobs,
+            worker_settings,
+            partial(sync_assets, static_dir_path, public_dir_path, (), asset_strategy),
+            pipeline,
+        )
+        return results
+    copy_files_form_source_to_destination(
+        static_dir_path, public_dir_path, asset_strategy
+    )
+    return generate_pages_recursive(
+        base_path,
+        dir_path_content,
+        template_path,
+        public_dir_path,
+        jobs,
+        profile,
+        worker_settings,
+    )
@@ -0,0 +1,87 @@
+import os
+import random
+
+WORDS = (
+    "hobbit wizard ring shire elf dwarf mountain river forest road tower king "
+    "sword song fellowship journey council shadow light star ship harbour "
+    "lore age map gate hall fire stone tree"
+).split()
+
+
+def generate_paragraph(rng, paragraph_words, link_density):
+    words = []
+    for index in range(paragraph_words):
+        word = rng.choice(WORDS)
+        roll = rng.random()
+        if roll < link_density:
+            word = f"[{word} {index}](/{rng.choice(WORDS)}/{index})"
+        elif roll < link_density + 0.03:
+            word = f"**{word}**"
+        elif roll < link_density + 0.06:
+            word = f"_{word}_"
+        elif roll < link_density + 0.08:
+            word = f"`{word}`"
+        words.append(word)
+    return " ".join(words) + "."
+
+
+def generate_markdown(
+    rng, title, paragraphs=8, paragraph_words=80, link_density=0.05, list_length=5
+):
+    blocks = [f"# {title}"]
+    for index in range(paragraphs):
+        if index % 4 == 1:
+            blocks.append(f"## {rng.choice(WORDS).title()} {index}")
+        blocks.append(generate_paragraph(rng, paragraph_words, link_density))
+        if index % 4 == 2:
+            blocks.append(
+                "\n".join(
+                    f"- {generate_paragraph(rng, 6, link_density)}"
+                    for _ in range(list_length)
+                )
+            )
+        if index % 4 == 3:
+            blocks.append(
+                "\n".join(
+                    f"{number}. {generate_paragraph(rng, 6, link_density)}"
+                    for number in range(1, list_length + 1)
+                )
+            )
+            blocks.append(f"> {generate_paragraph(rng, 20, 0)}")
+            blocks.append(f"```{generate_paragraph(rng, 10, 0)}```")
+    return "\n\n".join(blocks) + "\n"
+
+
+def corpus_page_path(index, nesting):
+    sections = [f"section{(index >> (3 * level)) % 8}" for level in range(nesting)]
+    return os.path.join(*sections, f"page{index}", "index.md")
+
+
+def generate_corpus(
+    content_dir,
+    pages=100,
+    paragraphs=8,
+    paragraph_words=80,
+    link_density=0.05,
+    list_length=5,
+    nesting=2,
+    seed=0,
+):
+    rng = random.Random(seed)
+    paths = []
+    for index in range(pages):
+        path = os.path.join(content_dir, corpus_page_path(index, nesting))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as page_file:
+            page_file.write(
+                generate_markdown(
+                    rng,
+                    f"Page {index}",
+                    paragraphs,
+                    paragraph_words,
+                    link_density,
+                    list_length,
+                )
+            )
+        paths.append(path)
+    return paths
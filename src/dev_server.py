@@ -0,0 +1,443 @@
+import argparse
+import os
+import threading
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from asset_sync import copy_file
+from block_markdown import markdown_to_html_node
+from builder import build_incremental, collect_pages
+from front_matter import page_context, split_front_matter
+from includes import configure_includes, record_dependencies, recorded_dependencies
+from manifest import load_manifest
+from pages import extract_title, output_path_for
+from template import load_template, rebase_links
+
+try:
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
+RELOAD_PATH = "/__livereload"
+DIRECTORY_MTIME_SLACK_NS = 10**9
+RELOAD_SCRIPT = (
+    "<script>new EventSource('" + RELOAD_PATH + "').onmessage = "
+    "function () { location.reload(); };</script>"
+)
+
+
+def inject_reload_script(html):
+    closing_body = html.rfind("</body>")
+    if closing_body == -1:
+        return html + RELOAD_SCRIPT
+    return html[:closing_body] + RELOAD_SCRIPT + html[closing_body:]
+
+
+class ReloadBroadcaster:
+    __slots__ = ("condition", "generation")
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.generation = 0
+
+    def notify(self):
+        with self.condition:
+            self.generation += 1
+            self.condition.notify_all()
+
+    def wait(self, generation, timeout):
+        with self.condition:
+            self.condition.wait_for(lambda: self.generation != generation, timeout)
+            return self.generation
+
+
+class SiteWatcher:
+    __slots__ = ("roots", "snapshot", "listings")
+
+    def __init__(self, roots):
+        self.roots = roots
+        self.listings = {}
+        self.snapshot = self.scan()
+
+    def list_directory(self, directory):
+        stat = os.stat(directory)
+        cached = self.listings.get(directory)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] > stat.st_mtime_ns:
+            return cached[2], cached[3]
+        listed_at = time.time_ns() - DIRECTORY_MTIME_SLACK_NS
+        file_paths, directory_paths = [], []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    file_paths.append(entry.path)
+                elif not entry.is_symlink():
+                    directory_paths.append(entry.path)
+        self.listings[directory] = (stat.st_mtime_ns, listed_at, file_paths, directory_paths)
+        return file_paths, directory_paths
+
+    def scan(self):
+        snapshot = {}
+        for root in self.roots:
+            if os.path.isfile(root):
+                stat = os.stat(root)
+                snapshot[root] = (stat.st_mtime_ns, stat.st_size)
+                continue
+            directories = [root] if os.path.isdir(root) else []
+            while directories:
+                directory = directories.pop()
+                try:
+                    file_paths, directory_paths = self.list_directory(directory)
+                except FileNotFoundError:
+                    self.listings.pop(directory, None)
+                    continue
+                for path in file_paths:
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+                directories.extend(directory_paths)
+        return snapshot
+
+    def poll(self):
+        snapshot = self.scan()
+        changed = {
+            path
+            for path, stamp in snapshot.items()
+            if self.snapshot.get(path) != stamp
+        }
+        removed = set(self.snapshot) - set(snapshot)
+        self.snapshot = snapshot
+        return changed, removed
+
+    def stop(self):
+        pass
+
+
+class EventWatcher(SiteWatcher):
+    __slots__ = ("observer", "lock", "pending", "rescan", "watched_directories")
+
+    def __init__(self, roots):
+        self.roots = roots
+        self.lock = threading.Lock()
+        self.pending = set()
+        self.rescan = False
+        self.observer = Observer()
+        self.watched_directories = set()
+        self.schedule_roots()
+        self.observer.start()
+        super().__init__(roots)
+
+    def schedule_roots(self):
+        for root in self.roots:
+            if os.path.isdir(root):
+                directory, recursive = root, True
+            else:
+                directory, recursive = os.path.dirname(root), False
+            if (directory, recursive) in self.watched_directories:
+                continue
+            if os.path.isdir(directory):
+                self.observer.schedule(self, directory, recursive=recursive)
+                self.watched_directories.add((directory, recursive))
+
+    def is_watched(self, path):
+        return any(path == root or is_inside(path, root) for root in self.roots)
+
+    def dispatch(self, event):
+        paths = [os.fsdecode(event.src_path)]
+        if event.event_type == "moved":
+            paths.append(os.fsdecode(event.dest_path))
+        with self.lock:
+            if event.is_directory:
+                if event.event_type != "modified":
+                    self.rescan = True
+                return
+            self.pending.update(path for path in paths if self.is_watched(path))
+
+    def poll(self):
+        with self.lock:
+            pending, self.pending = self.pending, set()
+            rescan, self.rescan = self.rescan, False
+        if rescan:
+            self.schedule_roots()
+            return super().poll()
+        changed, removed = set(), set()
+        for path in pending:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                if self.snapshot.pop(path, None) is not None:
+                    removed.add(path)
+                continue
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if self.snapshot.get(path) != stamp:
+                self.snapshot[path] = stamp
+                changed.add(path)
+        return changed, removed
+
+    def stop(self):
+        self.observer.stop()
+        self.observer.join()
+
+
+def watch(roots):
+    if Observer is None:
+        return SiteWatcher(roots)
+    return EventWatcher(roots)
+
+
+class LiveBuilder:
+    def __init__(
+        self, base_path, dir_path_content, static_dir_path, template_path, public_dir_path
+    ):
+        self.base_path = base_path
+        self.dir_path_content = dir_path_content
+        self.static_dir_path = static_dir_path
+        self.template_path = template_path
+        self.public_dir_path = public_dir_path
+        self.parse_cache = {}
+        self.parsed_pages = 0
+        self.dependencies = {}
+
+    def output_path(self, from_path):
+        relative_path = os.path.relpath(from_path, self.dir_path_content)
+        return output_path_for(os.path.join(self.public_dir_path, relative_path))
+
+    def parsed_page(self, from_path):
+        stat = os.stat(from_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self.parse_cache.get(from_path)
+        if cached and cached[0] == stamp:
+            return cached[1:]
+        record_dependencies()
+        try:
+            with open(from_path, "r") as source_file:
+                metadata, markdown_file = split_front_matter(source_file.read())
+            html_string = markdown_to_html_node(markdown_file).to_html()
+        finally:
+            dependencies = recorded_dependencies()
+        page_title = metadata.get("title") or extract_title(markdown_file)
+        self.parse_cache[from_path] = (
+            stamp,
+            metadata,
+            page_title,
+            html_string,
+            dependencies,
+        )
+        self.parsed_pages += 1
+        return metadata, page_title, html_string, dependencies
+
+    def render(self, from_path):
+        metadata, page_title, html_string, dependencies = self.parsed_page(from_path)
+        output_path = self.output_path(from_path)
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        record_dependencies()
+        try:
+            with open(output_path, "w") as output_file:
+                load_template(self.template_path, self.base_path).render_stream(
+                    page_context(
+                        metadata, page_title, rebase_links(html_string, self.base_path)
+                    ),
+                    output_file.write,
+                )
+        finally:
+            self.dependencies[from_path] = sorted(
+                set(dependencies) | set(recorded_dependencies())
+            )
+
+    def dependent_pages(self, paths):
+        paths = {os.path.abspath(path) for path in paths}
+        pages = set()
+        for from_path, dependencies in self.dependencies.items():
+            if paths.intersection(dependencies):
+                self.parse_cache.pop(from_path, None)
+                pages.add(from_path)
+        return pages
+
+    def remove(self, output_path):
+        if os.path.isfile(output_path):
+            os.remove(output_path)
+
+    def is_page(self, path):
+        return is_inside(path, self.dir_path_content) and path.endswith(".md")
+
+    def apply(self, changed, removed):
+        rendered = 0
+        if self.template_path in changed:
+            pages = [from_path for from_path, _ in collect_pages(self.dir_path_content, "")]
+        else:
+            pages = sorted(
+                {path for path in changed if self.is_page(path)}
+                | self.dependent_pages(changed | removed)
+            )
+        for from_path in pages:
+            try:
+                self.render(from_path)
+                rendered += 1
+            except Exception as e:
+                print(f"Failed to render {from_path}: {e}")
+        for path in sorted(removed):
+            if self.is_page(path):
+                self.parse_cache.pop(path, None)
+                self.dependencies.pop(path, None)
+                self.remove(self.output_path(path))
+            elif is_inside(path, self.static_dir_path):
+                self.remove(
+                    os.path.join(
+                        self.public_dir_path, os.path.relpath(path, self.static_dir_path)
+                    )
+                )
+        for path in sorted(changed):
+            if is_inside(path, self.static_dir_path):
+                destination_path = os.path.join(
+                    self.public_dir_path, os.path.relpath(path, self.static_dir_path)
+                )
+                copy_file(path, destination_path)
+        return rendered
+
+
+def is_inside(path, directory):
+    return path.startswith(directory.rstrip(os.sep) + os.sep)
+
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    broadcaster = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == RELOAD_PATH:
+            self.send_reload_events()
+            return
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        if not path.endswith(".html") or not os.path.isfile(path):
+            super().do_GET()
+            return
+        with open(path, "r") as html_file:
+            body = inject_reload_script(html_file.read()).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_reload_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        generation = self.broadcaster.generation
+        try:
+            while True:
+                current = self.broadcaster.wait(generation, 15)
+                if current == generation:
+                    self.wfile.write(b": ping\n\n")
+                else:
+                    generation = current
+                    self.wfile.write(b"data: reload\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            return
+
+
+def start_server(public_dir_path, host, port, broadcaster):
+    handler = type(
+        "BoundDevRequestHandler", (DevRequestHandler,), {"broadcaster": broadcaster}
+    )
+    server = ThreadingHTTPServer(
+        (host, port), partial(handler, directory=public_dir_path)
+    )
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def parse_serve_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="main.py serve", description="Serve docs/ and optionally rebuild on change."
+    )
+    parser.add_argument("base_path", nargs="?", default="/")
+    parser.add_argument("--watch", action="store_true", help="rebuild pages on change")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.05,
+        help="seconds between polls for changed files (default 0.05)",
+    )
+    return parser.parse_args(argv)
+
+
+def serve(argv, base_path_start):
+    args = parse_serve_args(argv)
+    dir_path_content = os.path.join(base_path_start, "content")
+    static_dir_path = os.path.join(base_path_start, "static")
+    template_path = os.path.join(base_path_start, "template.html")
+    public_dir_path = os.path.join(base_path_start, "docs")
+    includes_dir_path = os.path.join(base_path_start, "includes")
+    partials_dir_path = os.path.join(base_path_start, "partials")
+    manifest_path = os.path.join(base_path_start, ".cache", "manifest.json")
+    configure_includes(includes_dir_path)
+    build_incremental(
+        args.base_path,
+        dir_path_content,
+        static_dir_path,
+        template_path,
+        public_dir_path,
+        manifest_path,
+        worker_settings={"includes": includes_dir_path},
+    )
+    broadcaster = ReloadBroadcaster()
+    server = start_server(public_dir_path, args.host, args.port, broadcaster)
+    print(f"Serving {public_dir_path} at http://{args.host}:{server.server_port}/")
+    watcher = None
+    try:
+        if not args.watch:
+            threading.Event().wait()
+        builder = LiveBuilder(
+            args.base_path,
+            dir_path_content,
+            static_dir_path,
+            template_path,
+            public_dir_path,
+        )
+        builder.dependencies = {
+            os.path.join(dir_path_content, relative_source): page["dependencies"]
+            for relative_source, page in load_manifest(manifest_path)["pages"].items()
+        }
+        watcher = watch(
+            [
+                dir_path_content,
+                static_dir_path,
+                template_path,
+                includes_dir_path,
+                partials_dir_path,
+            ]
+        )
+        print(
+            "Watching content/, static/, includes/, partials/ and template.html"
+            " for changes"
+        )
+        while True:
+            time.sleep(args.interval)
+            changed, removed = watcher.poll()
+            if not changed and not removed:
+                continue
+            start = time.perf_counter()
+            rendered = builder.apply(changed, removed)
+            broadcaster.notify()
+            print(
+                f"Rebuilt {rendered} pages for {len(changed) + len(removed)} changed files"
+                f" in {(time.perf_counter() - start) * 1000:.1f}ms"
+            )
+    except KeyboardInterrupt:
+        if watcher:
+            watcher.stop()
+        server.shutdown()
+
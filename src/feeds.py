@@ -0,0 +1,146 @@
+import datetime
+import email.utils
+import os
+import re
+from xml.sax.saxutils import escape
+
+from metadata_index import published_pages
+from pages import write_output
+
+SITEMAP_URL_LIMIT = 50000
+SITEMAP_SHARD_PATTERN = re.compile(r"sitemap-\d+\.xml")
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
+ATTRIBUTE_ENTITIES = {'"': "&quot;"}
+
+
+def absolute_url(site_url, base_path, url):
+    return site_url.rstrip("/") + base_path + url.lstrip("/")
+
+
+def write_urlset(path, entries):
+    def render(write):
+        write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        write(f'<urlset xmlns="{SITEMAP_NAMESPACE}">\n')
+        for location, last_modified in entries:
+            write(f"<url><loc>{escape(location)}</loc>")
+            if last_modified:
+                write(f"<lastmod>{last_modified}</lastmod>")
+            write("</url>\n")
+        write("</urlset>\n")
+
+    return write_output(path, render, skip_unchanged=True)
+
+
+def write_sitemap_index(path, locations):
+    def render(write):
+        write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        write(f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n')
+        for location in locations:
+            write(f"<sitemap><loc>{escape(location)}</loc></sitemap>\n")
+        write("</sitemapindex>\n")
+
+    return write_output(path, render, skip_unchanged=True)
+
+
+def write_sitemap(index, public_dir_path, site_url, base_path, limit=SITEMAP_URL_LIMIT):
+    entries = [
+        (absolute_url(site_url, base_path, page["url"]), page["date"])
+        for page in sorted(published_pages(index), key=lambda page: page["url"])
+    ]
+    shard_names = []
+    if len(entries) > limit:
+        for start in range(0, len(entries), limit):
+            shard_names.append(f"sitemap-{len(shard_names) + 1}.xml")
+            write_urlset(
+                os.path.join(public_dir_path, shard_names[-1]),
+                entries[start : start + limit],
+            )
+        write_sitemap_index(
+            os.path.join(public_dir_path, "sitemap.xml"),
+            [absolute_url(site_url, base_path, name) for name in shard_names],
+        )
+    else:
+        write_urlset(os.path.join(public_dir_path, "sitemap.xml"), entries)
+    for file_name in os.listdir(public_dir_path):
+        if SITEMAP_SHARD_PATTERN.fullmatch(file_name) and file_name not in shard_names:
+            os.remove(os.path.join(public_dir_path, file_name))
+    return len(entries), len(shard_names)
+
+
+def feed_entries(index, site_url, base_path, size):
+    return [
+        {
+            "title": page["title"],
+            "link": absolute_url(site_url, base_path, page["url"]),
+            "date": datetime.datetime.fromisoformat(page["date"]).replace(
+                tzinfo=datetime.timezone.utc
+            ),
+            "summary": page["metadata"].get("description"),
+        }
+        for page in published_pages(index)
+        if page["date"]
+    ][:size]
+
+
+def write_atom(path, title, site_link, entries):
+    def render(write):
+        write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        write(f'<feed xmlns="{ATOM_NAMESPACE}">\n')
+        write(f"<title>{escape(title)}</title>\n")
+        write(f"<id>{escape(site_link)}</id>\n")
+        write(f'<link href="{escape(site_link, ATTRIBUTE_ENTITIES)}" />\n')
+        write(f"<updated>{entries[0]['date'].isoformat()}</updated>\n")
+        for entry in entries:
+            write("<entry>")
+            write(f"<title>{escape(entry['title'])}</title>")
+            write(f"<id>{escape(entry['link'])}</id>")
+            write(f'<link href="{escape(entry["link"], ATTRIBUTE_ENTITIES)}" />')
+            write(f"<updated>{entry['date'].isoformat()}</updated>")
+            if entry["summary"]:
+                write(f"<summary>{escape(str(entry['summary']))}</summary>")
+            write("</entry>\n")
+        write("</feed>\n")
+
+    return write_output(path, render, skip_unchanged=True)
+
+
+def write_rss(path, title, site_link, entries):
+    def render(write):
+        write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        write('<rss version="2.0"><channel>\n')
+        write(f"<title>{escape(title)}</title>\n")
+        write(f"<link>{escape(site_link)}</link>\n")
+        write(f"<description>{escape(title)}</description>\n")
+        for entry in entries:
+            write("<item>")
+            write(f"<title>{escape(entry['title'])}</title>")
+            write(f"<link>{escape(entry['link'])}</link>")
+            write(f"<guid>{escape(entry['link'])}</guid>")
+            write(f"<pubDate>{email.utils.format_datetime(entry['date'])}</pubDate>")
+            if entry["summary"]:
+                write(f"<description>{escape(str(entry['summary']))}</description>")
+            write("</item>\n")
+        write("</channel></rss>\n")
+
+    return write_output(path, render, skip_unchanged=True)
+
+
+def write_feeds(index, public_dir_path, site_url, base_path, size=20, title=None):
+    entries = feed_entries(index, site_url, base_path, size)
+    feed_paths = [
+        os.path.join(public_dir_path, "atom.xml"),
+        os.path.join(public_dir_path, "rss.xml"),
+    ]
+    if not entries:
+        for path in feed_paths:
+            if os.path.exists(path):
+                os.remove(path)
+        return 0
+    if title is None:
+        home = [page for page in index["pages"].values() if page["url"] == "/"]
+        title = home[0]["title"] if home else site_url
+    site_link = absolute_url(site_url, base_path, "/")
+    write_atom(feed_paths[0], title, site_link, entries)
+    write_rss(feed_paths[1], title, site_link, entries)
+    return len(entries)
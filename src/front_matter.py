@@ -0,0 +1,74 @@
+import io
+import re
+
+FRONT_MATTER_DELIMITER = "---"
+FIELD_PATTERN = re.compile(r"([A-Za-z_]\w*)\s*:\s*(.*)")
+LIST_ITEM_PATTERN = re.compile(r"\s+-\s+(.*)")
+
+
+def parse_scalar(value):
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    if value in ("true", "false"):
+        return value == "true"
+    if value.startswith("[") and value.endswith("]"):
+        return [parse_scalar(item) for item in value[1:-1].split(",") if item.strip()]
+    return value
+
+
+def parse_front_matter_lines(lines):
+    metadata = {}
+    list_key = None
+    for line in lines:
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        item = LIST_ITEM_PATTERN.fullmatch(line)
+        if item and list_key:
+            metadata[list_key].append(parse_scalar(item[1]))
+            continue
+        field = FIELD_PATTERN.fullmatch(line)
+        if not field:
+            raise ValueError(f"Invalid front matter line: {line}")
+        key, value = field.groups()
+        if value.strip():
+            metadata[key] = parse_scalar(value)
+            list_key = None
+        else:
+            metadata[key] = []
+            list_key = key
+    return metadata
+
+
+def read_front_matter(markdown_file):
+    start = markdown_file.tell()
+    if markdown_file.readline().rstrip("\n") != FRONT_MATTER_DELIMITER:
+        markdown_file.seek(start)
+        return {}
+    lines = []
+    while line := markdown_file.readline():
+        if line.rstrip("\n") == FRONT_MATTER_DELIMITER:
+            return parse_front_matter_lines(lines)
+        lines.append(line.rstrip("\n"))
+    raise ValueError("Front matter is not closed with ---")
+
+
+def split_front_matter(markdown):
+    markdown_file = io.StringIO(markdown)
+    metadata = read_front_matter(markdown_file)
+    return metadata, markdown_file.read()
+
+
+def format_value(value):
+    if isinstance(value, list):
+        return ", ".join(format_value(item) for item in value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def page_context(metadata, title, content):
+    context = {key: format_value(value) for key, value in metadata.items()}
+    context["Title"] = title
+    context["Content"] = content
+    return context
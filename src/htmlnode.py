@@ -1,4 +1,5 @@
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
 
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
@@ -7,6 +8,11 @@ class HTMLNode:
         self.props = props
 
     def to_html(self):
+        chunks = []
+        self.to_html_stream(chunks.append)
+        return "".join(chunks)
+
+    def to_html_stream(self, write):
         # return ""
         raise NotImplementedError
 
@@ -33,29 +39,32 @@ class HTMLNode:
 
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
 
     def __init__(self, tag, value, props=None):
         super().__init__(tag=tag, value=value, props=props)
 
-    def to_html(self):
+    def to_html_stream(self, write):
         if not self.value and not self.tag == "img":
             raise ValueError
         if not self.tag:
-            return str(self.value)
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+            write(str(self.value))
+            return
+        write(f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>")
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
 
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
 
-    def to_html(self):
+    def to_html_stream(self, write):
         if not self.tag:
             raise ValueError("tag not provided")
         if not self.children:
             raise ValueError("children must be provided")
-        value = ""
+        write(f"<{self.tag}{self.props_to_html()}>")
         for child in self.children:
-            value += child.to_html()
-        return f"<{self.tag}{self.props_to_html()}>{value}</{self.tag}>"
+            child.to_html_stream(write)
+        write(f"</{self.tag}>")
@@ -0,0 +1,234 @@
+import json
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+from asset_sync import copy_file, is_up_to_date
+from manifest import hash_file
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+IMAGE_INDEX_VERSION = 1
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+DEFAULT_WIDTHS = (480, 960, 1440)
+
+_image_attributes = {}
+
+
+def configure_image_attributes(image_attributes):
+    global _image_attributes
+    _image_attributes = image_attributes or {}
+
+
+def image_attributes(url):
+    return _image_attributes.get(url)
+
+
+def png_size(header):
+    if header[:8] == b"\x89PNG\r\n\x1a\n" and header[12:16] == b"IHDR":
+        return struct.unpack(">II", header[16:24])
+
+
+def gif_size(header):
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return struct.unpack("<HH", header[6:10])
+
+
+def webp_size(header):
+    if header[:4] != b"RIFF" or header[8:12] != b"WEBP":
+        return None
+    chunk = header[12:16]
+    if chunk == b"VP8 ":
+        width, height = struct.unpack("<HH", header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        bits = int.from_bytes(header[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        return (
+            int.from_bytes(header[24:27], "little") + 1,
+            int.from_bytes(header[27:30], "little") + 1,
+        )
+
+
+def jpeg_size(file):
+    file.seek(0)
+    if file.read(2) != b"\xff\xd8":
+        return None
+    while True:
+        marker = file.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        if marker[1] in (0xD8, 0x01) or 0xD0 <= marker[1] <= 0xD7:
+            continue
+        (length,) = struct.unpack(">H", file.read(2))
+        if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">xHH", file.read(5))
+            return width, height
+        file.seek(length - 2, os.SEEK_CUR)
+
+
+def read_image_size(path):
+    with open(path, "rb") as file:
+        header = file.read(32)
+        size = png_size(header) or gif_size(header) or webp_size(header)
+        if size is None:
+            size = jpeg_size(file)
+    return size
+
+
+def variant_name(relative_path, width):
+    root, extension = os.path.splitext(relative_path)
+    return f"{root}-{width}w{extension}"
+
+
+def process_image(source_path, relative_path, cache_dir_path, widths):
+    source_hash = hash_file(source_path)
+    size = read_image_size(source_path)
+    stat = os.stat(source_path)
+    entry = {
+        "hash": source_hash,
+        "stamp": [stat.st_size, stat.st_mtime_ns],
+        "width": size[0] if size else None,
+        "height": size[1] if size else None,
+        "resized": Image is not None,
+        "variants": [],
+    }
+    if size is None or Image is None:
+        return relative_path, entry
+    extension = os.path.splitext(relative_path)[1]
+    for width in sorted(widths):
+        if width >= size[0]:
+            continue
+        height = round(size[1] * width / size[0])
+        cached_path = os.path.join(cache_dir_path, f"{source_hash}-{width}w{extension}")
+        if not os.path.exists(cached_path):
+            os.makedirs(cache_dir_path, exist_ok=True)
+            with Image.open(source_path) as image:
+                resized = image.resize((width, height), Image.LANCZOS)
+                temporary_path = f"{cached_path}.tmp{extension}"
+                resized.save(temporary_path)
+            os.replace(temporary_path, cached_path)
+        entry["variants"].append([width, height, variant_name(relative_path, width)])
+    return relative_path, entry
+
+
+def load_image_index(path, widths):
+    try:
+        with open(path, "r") as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        index = {}
+    if index.get("version") != IMAGE_INDEX_VERSION or index.get("widths") != list(
+        widths
+    ):
+        index = {"version": IMAGE_INDEX_VERSION, "widths": list(widths), "images": {}}
+    index["resizing"] = Image is not None
+    return index
+
+
+def save_image_index(path, index):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(index, file, indent=1, sort_keys=True)
+    os.replace(temporary_path, path)
+
+
+def process_images(static_dir_path, cache_dir_path, widths=DEFAULT_WIDTHS, jobs=1):
+    index_path = os.path.join(cache_dir_path, "images.json")
+    index = load_image_index(index_path, widths)
+    resizing = index.pop("resizing")
+    previous_images = index["images"]
+    images = {}
+    pending = []
+    for directory, _, file_names in os.walk(static_dir_path):
+        for file_name in file_names:
+            if not file_name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            source_path = os.path.join(directory, file_name)
+            relative_path = os.path.relpath(source_path, static_dir_path)
+            stat = os.stat(source_path)
+            previous = previous_images.get(relative_path)
+            if (
+                previous
+                and previous["stamp"] == [stat.st_size, stat.st_mtime_ns]
+                and (previous["resized"] or not resizing)
+            ):
+                images[relative_path] = previous
+                continue
+            pending.append((source_path, relative_path))
+    variants_dir_path = os.path.join(cache_dir_path, "images")
+    arguments = (
+        [source_path for source_path, _ in pending],
+        [relative_path for _, relative_path in pending],
+        [variants_dir_path] * len(pending),
+        [tuple(widths)] * len(pending),
+    )
+    if jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            images.update(executor.map(process_image, *arguments))
+    else:
+        images.update(map(process_image, *arguments))
+    index["images"] = dict(sorted(images.items()))
+    save_image_index(index_path, index)
+    current_variants = {
+        name for entry in images.values() for _, _, name in entry["variants"]
+    }
+    stale_variants = sorted(
+        {
+            name
+            for entry in previous_images.values()
+            for _, _, name in entry["variants"]
+        }
+        - current_variants
+    )
+    if pending:
+        print(f"Processed {len(pending)} images ({len(images) - len(pending)} cached)")
+    if not resizing:
+        print("Pillow is not installed, skipping responsive image variants")
+    return index, stale_variants
+
+
+def build_image_attributes(index):
+    attributes = {}
+    for relative_path, entry in index["images"].items():
+        if entry["width"] is None:
+            continue
+        url = "/" + relative_path.replace(os.sep, "/")
+        image = {"width": entry["width"], "height": entry["height"]}
+        if entry["variants"]:
+            image["srcset"] = ", ".join(
+                [
+                    f"/{name.replace(os.sep, '/')} {width}w"
+                    for width, _, name in entry["variants"]
+                ]
+                + [f"{url} {entry['width']}w"]
+            )
+        attributes[url] = image
+    return attributes
+
+
+def publish_variants(
+    index, cache_dir_path, public_dir_path, stale_variants=(), strategy="auto"
+):
+    for name in stale_variants:
+        destination_path = os.path.join(public_dir_path, name)
+        if os.path.lexists(destination_path):
+            os.remove(destination_path)
+    published = []
+    variants_dir_path = os.path.join(cache_dir_path, "images")
+    for relative_path, entry in index["images"].items():
+        extension = os.path.splitext(relative_path)[1]
+        for width, _, name in entry["variants"]:
+            cached_path = os.path.join(
+                variants_dir_path, f"{entry['hash']}-{width}w{extension}"
+            )
+            destination_path = os.path.join(public_dir_path, name)
+            if not is_up_to_date(cached_path, destination_path):
+                copy_file(cached_path, destination_path, strategy)
+            published.append(name)
+    return published
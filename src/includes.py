@@ -0,0 +1,62 @@
+import os
+import re
+
+from manifest import hash_file
+
+INCLUDE_PATTERN = re.compile(r"\{\{\s*>\s*([\w./-]+?)\s*\}\}")
+
+_includes_dir = None
+_include_cache = {}
+_dependencies = None
+
+
+def configure_includes(includes_dir):
+    global _includes_dir
+    _includes_dir = includes_dir
+
+
+def record_dependencies():
+    global _dependencies
+    _dependencies = set()
+
+
+def recorded_dependencies():
+    global _dependencies
+    dependencies, _dependencies = _dependencies, None
+    return sorted(dependencies or ())
+
+
+def add_dependency(path):
+    if _dependencies is not None:
+        _dependencies.add(os.path.abspath(path))
+
+
+def dependency_hashes(paths, known_hashes=None):
+    known_hashes = {} if known_hashes is None else known_hashes
+    for path in paths:
+        if path not in known_hashes:
+            known_hashes[path] = hash_file(path) if os.path.exists(path) else None
+    return {path: known_hashes[path] for path in paths if known_hashes[path] is not None}
+
+
+def dependencies_changed(hashes, known_hashes=None):
+    return dependency_hashes(hashes, known_hashes) != hashes
+
+
+def load_include(name, parse):
+    if _includes_dir is None:
+        return None
+    if not name.endswith(".md"):
+        name = f"{name}.md"
+    path = os.path.abspath(os.path.join(_includes_dir, name))
+    if not path.startswith(os.path.abspath(_includes_dir) + os.sep):
+        raise ValueError(f"Include {name} is outside {_includes_dir}")
+    add_dependency(path)
+    stat = os.stat(path)
+    cached = _include_cache.get(path)
+    if cached and cached[0] == (stat.st_mtime_ns, stat.st_size):
+        return path, cached[1]
+    with open(path, "r") as include_file:
+        parsed = parse(include_file.read())
+    _include_cache[path] = ((stat.st_mtime_ns, stat.st_size), parsed)
+    return path, parsed
@@ -1,14 +1,144 @@
 import re
+from collections import OrderedDict
+
 from textnode import TextNode, TextType
 
 
+INLINE_MARKER_PATTERN = re.compile(r"\*\*|_|`|!?\[")
+LINK_MARKER_PATTERN = re.compile(r"!?\[")
+LINK_PATTERN = re.compile(r"\[([^\[\]]*)\]\(([^)]*)\)")
+IMAGE_PATTERN = re.compile(r"\!\[([^\[\]]*)\]\(([^)]*)\)")
+DELIMITER_TEXT_TYPES = {
+    "**": TextType.BOLD,
+    "_": TextType.ITALIC,
+    "`": TextType.CODE,
+}
+DEFAULT_INLINE_CACHE_ENTRIES = 4096
+
+_inline_cache = None
+
+
+class InlineCache:
+    __slots__ = ("max_entries", "entries", "hits", "misses")
+
+    def __init__(self, max_entries=DEFAULT_INLINE_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def text_to_textnodes(self, text):
+        fields = self.entries.get(text)
+        if fields is None:
+            self.misses += 1
+            fields = tuple(
+                (node.text, node.text_type, node.url) for node in text_to_textnodes(text)
+            )
+            self.entries[text] = fields
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self.entries.move_to_end(text)
+        return [TextNode(*node_fields) for node_fields in fields]
+
+
+def configure_inline_cache(max_entries):
+    global _inline_cache
+    if not max_entries:
+        _inline_cache = None
+    elif _inline_cache is None or _inline_cache.max_entries != max_entries:
+        _inline_cache = InlineCache(max_entries)
+
+
+def get_inline_cache():
+    return _inline_cache
+
+
+def parse_inline(text):
+    if _inline_cache is None:
+        return text_to_textnodes(text)
+    return _inline_cache.text_to_textnodes(text)
+
+
+def has_delimiter_pair(text):
+    for delimiter in DELIMITER_TEXT_TYPES:
+        start = text.find(delimiter)
+        if start != -1 and text.find(delimiter, start + len(delimiter)) != -1:
+            return True
+    return False
+
+
+def span_to_textnodes(text, text_type):
+    nodes = []
+    text_start = 0
+    position = 0
+    last_closing_parenthesis = text.rfind(")")
+    while True:
+        marker = LINK_MARKER_PATTERN.search(text, position, last_closing_parenthesis)
+        if not marker:
+            break
+        marker_start = marker.start()
+        if marker.group() == "[":
+            match, link_type = LINK_PATTERN.match(text, marker_start), TextType.LINK
+        else:
+            match, link_type = IMAGE_PATTERN.match(text, marker_start), TextType.IMAGE
+        if not match:
+            position = marker.end()
+            continue
+        if text_start < marker_start:
+            nodes.append(TextNode(text[text_start:marker_start], TextType.TEXT))
+        nodes.append(TextNode(match.group(1), link_type, match.group(2)))
+        text_start = position = match.end()
+    if not nodes:
+        return [TextNode(text, text_type)]
+    if text_start < len(text):
+        nodes.append(TextNode(text[text_start:], TextType.TEXT))
+    return nodes
+
+
 def text_to_textnodes(text):
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_link(nodes)
-    nodes = split_nodes_image(nodes)
+    nodes = []
+    text_start = 0
+    position = 0
+    last_closing_parenthesis = text.rfind(")")
+    while True:
+        marker = INLINE_MARKER_PATTERN.search(text, position)
+        if not marker:
+            break
+        marker_start = marker.start()
+        delimiter = marker.group()
+        if delimiter in DELIMITER_TEXT_TYPES:
+            closing_start = text.find(delimiter, marker.end())
+            if closing_start == -1:
+                raise ValueError("Invalid markdown syntax.")
+            if text_start < marker_start:
+                nodes.append(TextNode(text[text_start:marker_start], TextType.TEXT))
+            if closing_start > marker.end():
+                span = text[marker.end() : closing_start]
+                text_type = DELIMITER_TEXT_TYPES[delimiter]
+                if text_type == TextType.CODE:
+                    nodes.append(TextNode(span, text_type))
+                else:
+                    nodes.extend(span_to_textnodes(span, text_type))
+            text_start = position = closing_start + len(delimiter)
+            continue
+        if marker_start > last_closing_parenthesis:
+            position = marker.end()
+            continue
+        if delimiter == "[":
+            match, text_type = LINK_PATTERN.match(text, marker_start), TextType.LINK
+        else:
+            match, text_type = IMAGE_PATTERN.match(text, marker_start), TextType.IMAGE
+        if not match or has_delimiter_pair(match.group(1)):
+            position = marker.end()
+            continue
+        if text_start < marker_start:
+            nodes.append(TextNode(text[text_start:marker_start], TextType.TEXT))
+        nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+        text_start = position = match.end()
+    if text_start < len(text):
+        nodes.append(TextNode(text[text_start:], TextType.TEXT))
     return nodes
 
 
@@ -51,17 +181,19 @@ def split_nodes(old_nodes, text_type):
         if not len(links_with_alt):
             new_nodes.append(old_node)
             continue
+        remaining_text = old_node.text
         for item in links_with_alt:
+            before, remaining_text = remaining_text.split(
+                (
+                    f"[{item[0]}]({item[1]})"
+                    if text_type == TextType.LINK
+                    else f"![{item[0]}]({item[1]})"
+                ),
+                1,
+            )
             new_nodes.extend(
                 [
-                    TextNode(
-                        old_node.text.split(
-                            f"[{item[0]}]({item[1]})"
-                            if text_type == TextType.LINK
-                            else f"![{item[0]}]({item[1]})"
-                        )[0],
-                        text_type=TextType.TEXT,
-                    ),
+                    TextNode(before, text_type=TextType.TEXT),
                     TextNode(
                         text=item[0],
                         text_type=(
@@ -73,17 +205,11 @@ def split_nodes(old_nodes, text_type):
                     ),
                 ]
             )
-
-            old_node.text = old_node.text.split(
-                f"[{item[0]}]({item[1]})"
-                if text_type == TextType.LINK
-                else f"![{item[0]}]({item[1]})"
-            )[1]
-        if old_node.text:
+        if remaining_text:
             new_nodes.extend(
                 [
                     TextNode(
-                        old_node.text,
+                        remaining_text,
                         text_type=TextType.TEXT,
                     )
                 ]
@@ -97,4 +223,4 @@ def extract_markdown_links(text):
 
 
 def extract_markdown_images(text):
-    return re.findall(r"\!\[(.*?)\]\((.*?)\)", text)
+    return IMAGE_PATTERN.findall(text)
@@ -0,0 +1,167 @@
+import json
+import os
+import posixpath
+from urllib.parse import urlsplit
+
+from inline_markdown import extract_markdown_images, extract_markdown_links
+
+LINK_GRAPH_VERSION = 1
+
+
+def new_link_graph():
+    return {"version": LINK_GRAPH_VERSION, "pages": {}, "static": [], "backlinks": {}}
+
+
+def load_link_graph(path):
+    if not os.path.exists(path):
+        return new_link_graph()
+    try:
+        with open(path, "r") as file:
+            graph = json.load(file)
+    except (OSError, ValueError):
+        return new_link_graph()
+    if graph.get("version") != LINK_GRAPH_VERSION:
+        return new_link_graph()
+    return graph
+
+
+def save_link_graph(path, graph):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(graph, file, indent=1, sort_keys=True)
+    os.replace(temporary_path, path)
+
+
+def page_url(relative_source):
+    path = "/" + os.path.splitext(relative_source)[0].replace(os.sep, "/")
+    if path == "/index":
+        return "/"
+    if path.endswith("/index"):
+        return path[: -len("/index")]
+    return path
+
+
+def resolve_target(url, relative_source):
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+    directory = "/" + posixpath.dirname(relative_source.replace(os.sep, "/"))
+    path = posixpath.normpath(posixpath.join(directory, parts.path))
+    if path.endswith("/index.html"):
+        path = path[: -len("/index.html")] or "/"
+    elif path.endswith(".html"):
+        path = path[: -len(".html")]
+    return path
+
+
+def scan_page(from_path):
+    with open(from_path, "r") as markdown_file:
+        markdown = markdown_file.read()
+    return (
+        [url for _, url in extract_markdown_links(markdown)],
+        [url for _, url in extract_markdown_images(markdown)],
+    )
+
+
+def list_static_files(static_dir_path):
+    return sorted(
+        os.path.relpath(os.path.join(directory, file_name), static_dir_path)
+        for directory, _, file_names in os.walk(static_dir_path)
+        for file_name in file_names
+    )
+
+
+def page_targets(relative_source, page):
+    return {
+        target
+        for url in page["links"] + page["images"]
+        if (target := resolve_target(url, relative_source)) is not None
+    }
+
+
+def update_link_graph(graph, dir_path_content, sources, static_files):
+    pages = graph["pages"]
+    backlinks = {target: set(linked) for target, linked in graph["backlinks"].items()}
+    changed_urls = set()
+    to_check = set()
+
+    def unlink(relative_source):
+        for target in page_targets(relative_source, pages[relative_source]):
+            backlinks[target].discard(relative_source)
+            if not backlinks[target]:
+                del backlinks[target]
+
+    for relative_source in sorted(set(pages) - set(sources)):
+        unlink(relative_source)
+        changed_urls.add(pages.pop(relative_source)["url"])
+    for relative_source, source_hash in sorted(sources.items()):
+        previous = pages.get(relative_source)
+        if previous and previous["hash"] == source_hash:
+            continue
+        if previous:
+            unlink(relative_source)
+        else:
+            changed_urls.add(page_url(relative_source))
+        links, images = scan_page(os.path.join(dir_path_content, relative_source))
+        pages[relative_source] = page = {
+            "url": page_url(relative_source),
+            "hash": source_hash,
+            "links": links,
+            "images": images,
+        }
+        for target in page_targets(relative_source, page):
+            backlinks.setdefault(target, set()).add(relative_source)
+        to_check.add(relative_source)
+    changed_urls.update(
+        "/" + path.replace(os.sep, "/")
+        for path in set(graph["static"]) ^ set(static_files)
+    )
+    for url in changed_urls:
+        to_check.update(backlinks.get(url, ()))
+    page_urls = {page["url"] for page in pages.values()}
+    static_urls = {"/" + path.replace(os.sep, "/") for path in static_files}
+    for relative_source in to_check:
+        page = pages[relative_source]
+        page["broken_links"] = [
+            url
+            for url in page["links"]
+            if (target := resolve_target(url, relative_source)) is not None
+            and target not in page_urls
+            and target not in static_urls
+        ]
+        page["missing_images"] = [
+            url
+            for url in page["images"]
+            if (target := resolve_target(url, relative_source)) is not None
+            and target not in static_urls
+        ]
+    graph["static"] = sorted(static_files)
+    graph["backlinks"] = {
+        target: sorted(linked) for target, linked in sorted(backlinks.items())
+    }
+    return sorted(to_check)
+
+
+def linking_pages(graph, relative_source):
+    return graph["backlinks"].get(page_url(relative_source), [])
+
+
+def report_broken_links(graph):
+    broken = 0
+    for relative_source, page in sorted(graph["pages"].items()):
+        for url in page["broken_links"]:
+            print(f"Broken link in {relative_source}: {url}")
+            broken += 1
+        for url in page["missing_images"]:
+            print(f"Missing image in {relative_source}: {url}")
+            broken += 1
+    return broken
+
+
+def index_links(graph_path, dir_path_content, sources, static_files):
+    graph = load_link_graph(graph_path)
+    update_link_graph(graph, dir_path_content, sources, static_files)
+    save_link_graph(graph_path, graph)
+    report_broken_links(graph)
+    return graph
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import re
+
+from asset_sync import remove_empty_directories
+from front_matter import page_context
+from htmlnode import LeafNode, ParentNode
+from includes import (
+    dependencies_changed,
+    dependency_hashes,
+    record_dependencies,
+    recorded_dependencies,
+)
+from manifest import hash_file
+from metadata_index import published_pages, tag_counts
+from pages import write_output
+from template import get_template_options, load_template, rebase_links
+
+LISTINGS_VERSION = 2
+SLUG_PATTERN = re.compile(r"[^a-z0-9]+")
+
+
+def slugify(text):
+    return SLUG_PATTERN.sub("-", text.lower()).strip("-") or "untitled"
+
+
+def listing_url(base_url, number):
+    if number == 1:
+        return base_url
+    return f"{base_url}/page/{number}"
+
+
+def post_entry(page):
+    return {"url": page["url"], "title": page["title"], "date": page["date"]}
+
+
+def paginate(collections, page_size):
+    listings = {}
+    for base_url, title, entries in collections:
+        page_count = max(1, -(-len(entries) // page_size))
+        for number in range(1, page_count + 1):
+            listings[listing_url(base_url, number)] = {
+                "title": title if number == 1 else f"{title} (page {number})",
+                "entries": entries[(number - 1) * page_size : number * page_size],
+                "newer": listing_url(base_url, number - 1) if number > 1 else None,
+                "older": (
+                    listing_url(base_url, number + 1) if number < page_count else None
+                ),
+            }
+    return listings
+
+
+def collect_listings(index, section, page_size):
+    posts = [
+        page
+        for page in published_pages(index)
+        if page["source"].startswith(section + os.sep)
+    ]
+    collections = [
+        (f"/{section}", section.replace("-", " ").title(), [post_entry(page) for page in posts])
+    ]
+    tags = tag_counts(index)
+    if tags:
+        collections.append(
+            (
+                "/tags",
+                "Tags",
+                [
+                    {"url": f"/tags/{slugify(tag)}", "title": f"{tag} ({count})", "date": None}
+                    for tag, count in tags.items()
+                ],
+            )
+        )
+    for tag in tags:
+        collections.append(
+            (
+                f"/tags/{slugify(tag)}",
+                f"Posts tagged {tag}",
+                [post_entry(page) for page in published_pages(index, tag)],
+            )
+        )
+    years = {}
+    for page in published_pages(index):
+        if page["date"]:
+            years.setdefault(page["date"][:4], []).append(post_entry(page))
+    if years:
+        collections.append(
+            (
+                "/archive",
+                "Archive",
+                [
+                    {"url": f"/archive/{year}", "title": f"{year} ({len(entries)})", "date": None}
+                    for year, entries in years.items()
+                ],
+            )
+        )
+    for year, entries in years.items():
+        collections.append((f"/archive/{year}", f"Posts from {year}", entries))
+    return paginate(collections, page_size)
+
+
+def listing_html_node(listing):
+    items = []
+    for entry in listing["entries"]:
+        children = [LeafNode("a", entry["title"], {"href": entry["url"]})]
+        if entry["date"]:
+            children += [LeafNode(None, " "), LeafNode("time", entry["date"])]
+        items.append(ParentNode("li", children=children))
+    children = [LeafNode("h1", listing["title"])]
+    if items:
+        children.append(ParentNode("ul", children=items))
+    navigation = []
+    if listing["newer"]:
+        navigation.append(LeafNode("a", "Newer", {"href": listing["newer"]}))
+    if listing["older"]:
+        if navigation:
+            navigation.append(LeafNode(None, " "))
+        navigation.append(LeafNode("a", "Older", {"href": listing["older"]}))
+    if navigation:
+        children.append(ParentNode("p", children=navigation))
+    return ParentNode("div", children=children)
+
+
+def listing_output_path(public_dir_path, url):
+    return os.path.join(public_dir_path, *url.strip("/").split("/"), "index.html")
+
+
+def load_listing_state(path):
+    try:
+        with open(path, "r") as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    if state.get("version") != LISTINGS_VERSION:
+        return {}
+    return state["pages"]
+
+
+def save_listing_state(path, pages):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump({"version": LISTINGS_VERSION, "pages": pages}, file, indent=1)
+    os.replace(temporary_path, path)
+
+
+def build_listings(
+    index,
+    template_path,
+    public_dir_path,
+    base_path,
+    state_path,
+    section="blog",
+    page_size=10,
+):
+    previous = load_listing_state(state_path)
+    content_urls = {page["url"] for page in index["pages"].values()}
+    listings = {
+        url: listing
+        for url, listing in collect_listings(index, section, page_size).items()
+        if url not in content_urls
+    }
+    template_hash = hash_file(template_path)
+    template = load_template(template_path, base_path)
+    template_options = get_template_options()
+    known_hashes = {}
+    states = {}
+    rendered = []
+    for url, listing in listings.items():
+        fingerprint = hashlib.sha256(
+            json.dumps(
+                [template_hash, base_path, template_options, listing], sort_keys=True
+            ).encode()
+        ).hexdigest()
+        output_path = listing_output_path(public_dir_path, url)
+        state = previous.get(url)
+        if (
+            state
+            and state["fingerprint"] == fingerprint
+            and not dependencies_changed(state["dependencies"], known_hashes)
+            and os.path.exists(output_path)
+        ):
+            states[url] = state
+            continue
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        context = page_context(
+            {},
+            listing["title"],
+            rebase_links(listing_html_node(listing).to_html(), base_path),
+        )
+        record_dependencies()
+        try:
+            write_output(
+                output_path, lambda write: template.render_stream(context, write)
+            )
+        finally:
+            dependencies = recorded_dependencies()
+        states[url] = {
+            "fingerprint": fingerprint,
+            "dependencies": dependency_hashes(dependencies, known_hashes),
+        }
+        rendered.append(url)
+    for url in sorted(set(previous) - set(listings)):
+        output_path = listing_output_path(public_dir_path, url)
+        if os.path.exists(output_path):
+            os.remove(output_path)
+            remove_empty_directories(os.path.dirname(output_path), public_dir_path)
+    save_listing_state(state_path, states)
+    print(f"Listings: rendered {len(rendered)} of {len(listings)} pages")
+    return rendered
@@ -1,107 +1,268 @@
+import argparse
+import cProfile
 import os
 import sys
-from os.path import isdir
-import shutil
 
-from block_markdown import markdown_to_html_node
+from asset_sync import COPY_STRATEGIES
+from builder import build
+from image_pipeline import DEFAULT_WIDTHS
+from inline_markdown import DEFAULT_INLINE_CACHE_ENTRIES, get_inline_cache
+from profiler import build_profile_report, print_profile_summary, write_profile_report
+from render_cache import get_render_cache
 
 
-def copy_files_form_source_to_destination(source, destination):
-    if os.path.exists(destination):
-        destination_content = os.listdir(destination)
-        if len(destination_content):
-            map(
-                lambda x: shutil.rmtree(os.path.join(destination, x)),
-                destination_content,
-            )
-    else:
-        os.mkdir(destination)
-    content_of_source = os.listdir(source)
-    for content in content_of_source:
-        destination_content_path = os.path.join(destination, content)
-        source_content_path = os.path.join(source, content)
-        if os.path.isfile(source_content_path):
-            shutil.copy(source_content_path, destination_content_path)
-        else:
-            copy_files_form_source_to_destination(
-                source_content_path, destination_content_path
-            )
-
-
-def extract_title(markdown):
-    h1_headings = list(filter(lambda x: x.startswith("# "), markdown.split("\n")))
-    if len(h1_headings):
-        return h1_headings[0].strip().replace("# ", "")
-    raise Exception("Markdown file does not contain any headers.")
-
-
-def generate_page(base_path, from_path, template_path, dest_path):
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
-    markdown_file = open(from_path, "r").read()
-    template_file = open(template_path, "r").read()
-    HTML_string = markdown_to_html_node(markdown_file).to_html()
-    page_title = extract_title(markdown_file)
-    new_Html_page = template_file.replace("{{ Title }}", page_title).replace(
-        "{{ Content }}", HTML_string
-    )
-    new_Html_page = new_Html_page.replace("href='/", f"href='{base_path}").replace(
-        "src='/", f"src='{base_path}"
-    )
-    for directory in dest_path.split(os.sep):
-        path = ""
-        if directory and not os.path.exists(directory) and not directory.split(".")[0]:
-            os.mkdir(os.path.join(path, directory))
-    open(".".join(dest_path.split(".")[:-1] + ["html"]), "w").write(new_Html_page)
-
-
-def generate_pages_recursive(base_path, dir_path_content, template_path, dest_dir_path):
-    for content in os.listdir(dir_path_content):
-        dir_content_path = os.path.join(dir_path_content, content)
-        dest_content_dir_path = os.path.join(dest_dir_path, content)
-        if (
-            not os.path.isdir(dir_content_path)
-            and dir_content_path.split(".")[-1] == "md"
-        ):
-            generate_page(
-                base_path, dir_content_path, template_path, dest_content_dir_path
-            )
-        if os.path.isdir(dir_content_path):
-            os.mkdir(dest_content_dir_path)
-            generate_pages_recursive(
-                base_path, dir_content_path, template_path, dest_content_dir_path
-            )
+def parse_widths(value):
+    return tuple(sorted({int(width) for width in value.split(",") if width}))
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Generate the static site.")
+    parser.add_argument("base_path", nargs="?", default="/")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only re-render pages and copy static files that changed since the last build",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="render pages across N worker processes",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=os.path.join(".cache", "profile.json"),
+        metavar="REPORT",
+        help="record per-stage timings and allocations for every page into a JSON report",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="number of slowest pages to list after a profiled build",
+    )
+    parser.add_argument(
+        "--cprofile",
+        metavar="PATH",
+        help="dump cProfile statistics of the build to PATH (forces --jobs 1)",
+    )
+    parser.add_argument(
+        "--asset-strategy",
+        choices=sorted(COPY_STRATEGIES),
+        default="auto",
+        help="how changed static files reach docs/: reflink or copy_file_range with a plain "
+        "copy fallback (auto), hard links first (hardlink) or always a plain copy (copy)",
+    )
+    parser.add_argument(
+        "--checksum-assets",
+        action="store_true",
+        help="compare static files by content when only their mtime differs",
+    )
+    parser.add_argument(
+        "--render-cache",
+        action="store_true",
+        help="reuse rendered HTML of unchanged markdown blocks from .cache/render-cache.sqlite",
+    )
+    parser.add_argument(
+        "--render-cache-size",
+        type=int,
+        default=256,
+        metavar="MB",
+        help="evict least recently used fragments above this size (default 256)",
+    )
+    parser.add_argument(
+        "--inline-cache-size",
+        type=int,
+        default=DEFAULT_INLINE_CACHE_ENTRIES,
+        metavar="N",
+        help="inline markdown strings memoised per process, 0 disables"
+        f" (default {DEFAULT_INLINE_CACHE_ENTRIES})",
+    )
+    parser.add_argument(
+        "--images",
+        action="store_true",
+        help="emit image dimensions and srcset variants (variants need Pillow)",
+    )
+    parser.add_argument(
+        "--image-widths",
+        type=parse_widths,
+        default=DEFAULT_WIDTHS,
+        metavar="W,W,...",
+        help="widths of downscaled image variants (default 480,960,1440)",
+    )
+    parser.add_argument(
+        "--search-index",
+        action="store_true",
+        help="write a sharded full-text search index to docs/search/",
+    )
+    parser.add_argument(
+        "--search-prefix-length",
+        type=int,
+        default=2,
+        metavar="N",
+        help="shard search terms by their first N characters (default 2)",
+    )
+    parser.add_argument(
+        "--listings",
+        action="store_true",
+        help="generate paginated section, tag and archive listing pages",
+    )
+    parser.add_argument(
+        "--listing-section",
+        default="blog",
+        metavar="DIR",
+        help="content directory whose pages form the main listing (default blog)",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=positive_int,
+        default=10,
+        metavar="N",
+        help="entries per listing page (default 10)",
+    )
+    parser.add_argument(
+        "--site-url",
+        metavar="URL",
+        help="absolute site address used in the sitemap and feeds",
+    )
+    parser.add_argument(
+        "--sitemap",
+        action="store_true",
+        help="write sitemap.xml (sharded above 50000 URLs), needs --site-url",
+    )
+    parser.add_argument(
+        "--feeds",
+        action="store_true",
+        help="write atom.xml and rss.xml for dated pages, needs --site-url",
+    )
+    parser.add_argument(
+        "--feed-size",
+        type=int,
+        default=20,
+        metavar="N",
+        help="newest pages listed in the feeds (default 20)",
+    )
+    parser.add_argument(
+        "--minify",
+        action="store_true",
+        help="minify the template and CSS and fingerprint CSS/JS files with content hashes",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="write .gz (and .br when brotli is installed) siblings for text outputs",
+    )
+    parser.add_argument(
+        "--async-pipeline",
+        action="store_true",
+        help="overlap reading, rendering and writing pages in an asyncio pipeline",
+    )
+    parser.add_argument(
+        "--read-concurrency",
+        type=positive_int,
+        default=8,
+        metavar="N",
+        help="source files read at once by --async-pipeline (default 8)",
+    )
+    parser.add_argument(
+        "--write-concurrency",
+        type=positive_int,
+        default=8,
+        metavar="N",
+        help="output files written at once by --async-pipeline (default 8)",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=positive_int,
+        default=32,
+        metavar="N",
+        help="pages buffered between --async-pipeline stages (default 32)",
+    )
+    parser.add_argument(
+        "--config",
+        metavar="PATH",
+        help="build every site listed in a JSON site configuration",
+    )
+    parser.add_argument(
+        "--site",
+        action="append",
+        metavar="NAME",
+        help="with --config, only build the named site (repeatable)",
+    )
+    args = parser.parse_args(argv)
+    if (args.sitemap or args.feeds) and not (args.site_url or args.config):
+        parser.error("--sitemap and --feeds need --site-url")
+    if args.site and not args.config:
+        parser.error("--site needs --config")
+    return args
 
 
 def main():
-    base_path = ""
-    if len(sys.argv) > 1:
-        base_path = sys.argv[1]
-    else:
-        base_path = "/"
-    base_path_start = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)),
-        "..",
-    )
-    public_dir_path = os.path.join(base_path_start, "docs")
-    if not os.path.exists(public_dir_path):
-        os.mkdir(public_dir_path)
+    if sys.argv[1:2] == ["serve"]:
+        from dev_server import serve
+
+        serve(
+            sys.argv[2:],
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."),
+        )
+        return
+    args = parse_args(sys.argv[1:])
+    if args.cprofile and args.jobs > 1:
+        print("cProfile only sees the main process, rendering with --jobs 1")
+        args.jobs = 1
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler:
+        profiler.enable()
+    if args.config:
+        from sites import build_sites, load_site_config
+
+        results = build_sites(args, load_site_config(args.config, args.site))
     else:
-        for content in os.listdir(public_dir_path):
-            content_path = os.path.join(public_dir_path, content)
-            if os.path.isdir(content_path):
-                shutil.rmtree(content_path)
-                continue
-            os.remove(content_path)
-    copy_files_form_source_to_destination(
-        os.path.join(base_path_start, "static"), public_dir_path
-    )
-    generate_pages_recursive(
-        base_path,
-        os.path.join(base_path_start, "content"),
-        os.path.join(base_path_start, "template.html"),
-        os.path.join(base_path_start, "docs"),
+        results = build(args)
+    render_cache = get_render_cache()
+    if render_cache:
+        report_render_cache(results, render_cache)
+    if get_inline_cache():
+        report_inline_cache(results)
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.cprofile)
+        print(f"cProfile statistics written to {args.cprofile}")
+    if args.profile:
+        report = build_profile_report(results)
+        write_profile_report(report, args.profile)
+        print_profile_summary(report, args.profile_top)
+        print(f"Profile report written to {args.profile}")
+
+
+def report_render_cache(results, render_cache):
+    hits = sum(result.get("cache_hits", 0) for result in results)
+    misses = sum(result.get("cache_misses", 0) for result in results)
+    evicted = render_cache.evict()
+    hit_rate = hits / (hits + misses) if hits + misses else 0.0
+    print(
+        f"Render cache: {hits} hits, {misses} misses ({hit_rate:.1%} hit rate),"
+        f" {evicted} fragments evicted"
     )
 
 
+def report_inline_cache(results):
+    hits = sum(result.get("inline_hits", 0) for result in results)
+    misses = sum(result.get("inline_misses", 0) for result in results)
+    hit_rate = hits / (hits + misses) if hits + misses else 0.0
+    print(f"Inline cache: {hits} hits, {misses} misses ({hit_rate:.1%} hit rate)")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,47 @@
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 5
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def new_manifest():
+    return {
+        "version": MANIFEST_VERSION,
+        "base_path": None,
+        "template": None,
+        "pages": {},
+        "static": [],
+        "images": {},
+        "template_options": {},
+        "dependencies": {},
+    }
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return new_manifest()
+    try:
+        with open(path, "r") as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return new_manifest()
+    if manifest.get("version") != MANIFEST_VERSION:
+        return new_manifest()
+    return manifest
+
+
+def save_manifest(path, manifest):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(manifest, file, indent=1, sort_keys=True)
+    os.replace(temporary_path, path)
@@ -0,0 +1,108 @@
+import datetime
+import json
+import os
+
+from front_matter import read_front_matter
+from link_graph import page_url
+from pages import extract_title
+
+METADATA_INDEX_VERSION = 1
+
+
+def new_metadata_index():
+    return {"version": METADATA_INDEX_VERSION, "pages": {}}
+
+
+def load_metadata_index(path):
+    try:
+        with open(path, "r") as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        return new_metadata_index()
+    if index.get("version") != METADATA_INDEX_VERSION:
+        return new_metadata_index()
+    return index
+
+
+def save_metadata_index(path, index):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(index, file, indent=1, sort_keys=True)
+    os.replace(temporary_path, path)
+
+
+def read_page_metadata(from_path):
+    with open(from_path, "r") as markdown_file:
+        metadata = read_front_matter(markdown_file)
+        title = metadata.get("title") or extract_title(markdown_file)
+    return page_metadata(from_path, metadata, title)
+
+
+def page_metadata(from_path, metadata, title):
+    date = metadata.get("date")
+    if date is not None:
+        try:
+            date = datetime.datetime.fromisoformat(str(date)).date().isoformat()
+        except ValueError:
+            raise ValueError(f"Invalid date {date!r} in {from_path}")
+    tags = metadata.get("tags", [])
+    return {
+        "title": title,
+        "date": date,
+        "tags": [tags] if isinstance(tags, str) else [str(tag) for tag in tags],
+        "draft": metadata.get("draft") is True,
+        "metadata": metadata,
+    }
+
+
+def update_metadata_index(index, dir_path_content, sources, rendered=None):
+    rendered = rendered or {}
+    pages = index["pages"]
+    for relative_source in set(pages) - set(sources):
+        del pages[relative_source]
+    updated = []
+    for relative_source, source_hash in sorted(sources.items()):
+        previous = pages.get(relative_source)
+        if previous and previous["hash"] == source_hash:
+            continue
+        from_path = os.path.join(dir_path_content, relative_source)
+        if relative_source in rendered:
+            metadata = page_metadata(from_path, *rendered[relative_source])
+        else:
+            metadata = read_page_metadata(from_path)
+        pages[relative_source] = {
+            "hash": source_hash,
+            "url": page_url(relative_source),
+            **metadata,
+        }
+        updated.append(relative_source)
+    return updated
+
+
+def published_pages(index, tag=None):
+    pages = [
+        {"source": relative_source, **page}
+        for relative_source, page in index["pages"].items()
+        if not page["draft"] and (tag is None or tag in page["tags"])
+    ]
+    pages.sort(key=lambda page: page["source"])
+    pages.sort(key=lambda page: page["date"] or "", reverse=True)
+    return pages
+
+
+def tag_counts(index):
+    counts = {}
+    for page in index["pages"].values():
+        if page["draft"]:
+            continue
+        for tag in page["tags"]:
+            counts[tag] = counts.get(tag, 0) + 1
+    return dict(sorted(counts.items()))
+
+
+def index_metadata(index_path, dir_path_content, sources, rendered=None):
+    index = load_metadata_index(index_path)
+    update_metadata_index(index, dir_path_content, sources, rendered)
+    save_metadata_index(index_path, index)
+    return index
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+import re
+
+from asset_sync import copy_file, is_up_to_date
+
+ASSET_INDEX_VERSION = 1
+FINGERPRINT_EXTENSIONS = (".css", ".js")
+CSS_TOKEN_PATTERN = re.compile(
+    r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')|/\*.*?\*/|\s*([{};,>])\s*|(:)\s*|\s+",
+    re.DOTALL,
+)
+HTML_RAW_PATTERN = re.compile(
+    r"(<(pre|textarea|script)\b.*?</\2>)|(<style\b[^>]*>)(.*?)(</style>)",
+    re.DOTALL | re.IGNORECASE,
+)
+HTML_COMMENT_PATTERN = re.compile(r"<!--(?!\[if).*?-->", re.DOTALL)
+HTML_LINE_BREAK_PATTERN = re.compile(r"(^|>)\s*\n\s*(?=<|$)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def replace_css_token(match):
+    if match[1]:
+        return match[1]
+    if match[2]:
+        return match[2]
+    if match[3]:
+        return match[3]
+    if match[0].startswith("/*"):
+        return ""
+    return " "
+
+
+def minify_css(css):
+    css = CSS_TOKEN_PATTERN.sub(replace_css_token, css)
+    return WHITESPACE_PATTERN.sub(" ", css).replace(";}", "}").strip()
+
+
+def minify_html_text(html):
+    html = HTML_COMMENT_PATTERN.sub("", html)
+    html = HTML_LINE_BREAK_PATTERN.sub(r"\1", html)
+    return WHITESPACE_PATTERN.sub(" ", html)
+
+
+def minify_html(html):
+    chunks = []
+    position = 0
+    for match in HTML_RAW_PATTERN.finditer(html):
+        chunks.append(minify_html_text(html[position : match.start()]))
+        if match[1]:
+            chunks.append(match[1])
+        else:
+            chunks.append(match[3] + minify_css(match[4]) + match[5])
+        position = match.end()
+    chunks.append(minify_html_text(html[position:]))
+    return "".join(chunks)
+
+
+def fingerprint_name(relative_path, data):
+    root, extension = os.path.splitext(relative_path)
+    return f"{root}.{hashlib.sha256(data).hexdigest()[:10]}{extension}"
+
+
+def process_asset(source_path, relative_path, assets_dir_path):
+    with open(source_path, "rb") as file:
+        data = file.read()
+    if relative_path.endswith(".css"):
+        data = minify_css(data.decode()).encode()
+    name = fingerprint_name(relative_path, data)
+    cached_path = os.path.join(assets_dir_path, name)
+    if not os.path.exists(cached_path):
+        os.makedirs(os.path.dirname(cached_path), exist_ok=True)
+        temporary_path = f"{cached_path}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+        os.replace(temporary_path, cached_path)
+    stat = os.stat(source_path)
+    return {"stamp": [stat.st_size, stat.st_mtime_ns], "name": name}
+
+
+def load_asset_index(path):
+    try:
+        with open(path, "r") as file:
+            index = json.load(file)
+    except (OSError, ValueError):
+        return {"version": ASSET_INDEX_VERSION, "assets": {}}
+    if index.get("version") != ASSET_INDEX_VERSION:
+        return {"version": ASSET_INDEX_VERSION, "assets": {}}
+    return index
+
+
+def save_asset_index(path, index):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(index, file, indent=1, sort_keys=True)
+    os.replace(temporary_path, path)
+
+
+def process_assets(static_dir_path, cache_dir_path):
+    index_path = os.path.join(cache_dir_path, "assets.json")
+    index = load_asset_index(index_path)
+    assets_dir_path = os.path.join(cache_dir_path, "assets")
+    previous_assets = index["assets"]
+    assets = {}
+    for directory, _, file_names in os.walk(static_dir_path):
+        for file_name in file_names:
+            if not file_name.endswith(FINGERPRINT_EXTENSIONS):
+                continue
+            source_path = os.path.join(directory, file_name)
+            relative_path = os.path.relpath(source_path, static_dir_path)
+            stat = os.stat(source_path)
+            previous = previous_assets.get(relative_path)
+            if (
+                previous
+                and previous["stamp"] == [stat.st_size, stat.st_mtime_ns]
+                and os.path.exists(os.path.join(assets_dir_path, previous["name"]))
+            ):
+                assets[relative_path] = previous
+                continue
+            assets[relative_path] = process_asset(
+                source_path, relative_path, assets_dir_path
+            )
+    index["assets"] = dict(sorted(assets.items()))
+    save_asset_index(index_path, index)
+    stale_assets = sorted(
+        {entry["name"] for entry in previous_assets.values()}
+        - {entry["name"] for entry in assets.values()}
+    )
+    for name in stale_assets:
+        cached_path = os.path.join(assets_dir_path, name)
+        if os.path.exists(cached_path):
+            os.remove(cached_path)
+    return index, stale_assets
+
+
+def asset_urls(index):
+    return {
+        "/" + relative_path.replace(os.sep, "/"): "/" + entry["name"].replace(os.sep, "/")
+        for relative_path, entry in index["assets"].items()
+    }
+
+
+def publish_assets(
+    index, cache_dir_path, public_dir_path, stale_assets=(), strategy="auto"
+):
+    for name in stale_assets:
+        destination_path = os.path.join(public_dir_path, name)
+        if os.path.lexists(destination_path):
+            os.remove(destination_path)
+    published = []
+    assets_dir_path = os.path.join(cache_dir_path, "assets")
+    for entry in index["assets"].values():
+        cached_path = os.path.join(assets_dir_path, entry["name"])
+        destination_path = os.path.join(public_dir_path, entry["name"])
+        if not is_up_to_date(cached_path, destination_path):
+            copy_file(cached_path, destination_path, strategy)
+        published.append(entry["name"])
+    return published
@@ -0,0 +1,34 @@
+import filecmp
+import os
+
+
+def extract_title(markdown):
+    lines = markdown.split("\n") if isinstance(markdown, str) else markdown
+    for line in lines:
+        if line.startswith("# "):
+            return line.strip().replace("# ", "")
+    raise Exception("Markdown file does not contain any headers.")
+
+
+def output_path_for(dest_path):
+    return os.path.splitext(dest_path)[0] + ".html"
+
+
+def write_output(output_path, render, skip_unchanged=False):
+    temporary_path = f"{output_path}.tmp"
+    try:
+        with open(temporary_path, "w") as output_file:
+            render(output_file.write)
+        if (
+            skip_unchanged
+            and os.path.isfile(output_path)
+            and filecmp.cmp(temporary_path, output_path, shallow=False)
+        ):
+            os.remove(temporary_path)
+            return False
+        os.replace(temporary_path, output_path)
+        return True
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
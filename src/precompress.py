@@ -0,0 +1,115 @@
+import gzip
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (".html", ".css", ".js", ".svg", ".xml")
+
+
+def gzip_compress(data):
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def brotli_compress(data):
+    return brotli.compress(data, quality=11)
+
+
+def available_encodings():
+    encodings = {".gz": gzip_compress}
+    if brotli is not None:
+        encodings[".br"] = brotli_compress
+    return encodings
+
+
+def is_compressible(path):
+    return path.endswith(COMPRESSIBLE_EXTENSIONS)
+
+
+def is_up_to_date(path, sibling_path):
+    try:
+        sibling_stat = os.stat(sibling_path)
+    except FileNotFoundError:
+        return False
+    return sibling_stat.st_mtime_ns == os.stat(path).st_mtime_ns
+
+
+def compress_file(path, suffixes):
+    stat = os.stat(path)
+    result = {"path": path, "size": stat.st_size, "encodings": {}}
+    encodings = available_encodings()
+    data = None
+    for suffix in suffixes:
+        sibling_path = path + suffix
+        if is_up_to_date(path, sibling_path):
+            continue
+        if data is None:
+            with open(path, "rb") as file:
+                data = file.read()
+        compressed = encodings[suffix](data)
+        if len(compressed) >= len(data):
+            if os.path.exists(sibling_path):
+                os.remove(sibling_path)
+            continue
+        temporary_path = f"{sibling_path}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(compressed)
+        os.utime(temporary_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.replace(temporary_path, sibling_path)
+        result["encodings"][suffix] = len(compressed)
+    return result
+
+
+def remove_orphaned_siblings(public_dir_path, suffixes):
+    removed = 0
+    for directory, _, file_names in os.walk(public_dir_path):
+        for file_name in file_names:
+            source_name, suffix = os.path.splitext(file_name)
+            if suffix not in suffixes or not is_compressible(source_name):
+                continue
+            if source_name in file_names:
+                continue
+            os.remove(os.path.join(directory, file_name))
+            removed += 1
+    return removed
+
+
+def precompress(public_dir_path, jobs=1):
+    suffixes = tuple(available_encodings())
+    paths = sorted(
+        os.path.join(directory, file_name)
+        for directory, _, file_names in os.walk(public_dir_path)
+        for file_name in file_names
+        if is_compressible(file_name)
+    )
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(
+                executor.map(compress_file, paths, [suffixes] * len(paths), chunksize=8)
+            )
+    else:
+        results = [compress_file(path, suffixes) for path in paths]
+    removed = remove_orphaned_siblings(public_dir_path, suffixes)
+    stats = {"files": len(paths), "compressed": 0, "removed": removed, "saved": {}}
+    for result in results:
+        if result["encodings"]:
+            stats["compressed"] += 1
+        for suffix, size in result["encodings"].items():
+            stats["saved"][suffix] = stats["saved"].get(suffix, 0) + result["size"] - size
+    return stats
+
+
+def report_precompression(stats):
+    saved = ", ".join(
+        f"{suffix} saved {size / 1024:.1f} KiB"
+        for suffix, size in sorted(stats["saved"].items())
+    )
+    print(
+        f"Precompressed {stats['compressed']} of {stats['files']} files"
+        f" ({stats['files'] - stats['compressed']} unchanged)"
+        + (f", {saved}" if saved else "")
+        + (f", removed {stats['removed']} orphaned siblings" if stats["removed"] else "")
+    )
@@ -0,0 +1,98 @@
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_STAGES = (
+    "read",
+    "markdown_to_blocks",
+    "block_to_block_type",
+    "inline_parsing",
+    "to_html",
+    "template",
+    "write",
+)
+
+
+class StageRecorder:
+    __slots__ = ("stages",)
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        traced_before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            traced_after, traced_peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            stage = self.stages.setdefault(
+                name,
+                {"seconds": 0.0, "allocated_bytes": 0, "retained_bytes": 0},
+            )
+            stage["seconds"] += elapsed
+            stage["allocated_bytes"] += traced_peak - traced_before
+            stage["retained_bytes"] += traced_after - traced_before
+
+
+def build_profile_report(results):
+    pages = sorted(
+        (
+            {
+                "page": result["page"],
+                "worker": result["worker"],
+                "seconds": result["seconds"],
+                "stages": result["stages"],
+            }
+            for result in results
+            if "stages" in result
+        ),
+        key=lambda page: page["seconds"],
+        reverse=True,
+    )
+    stages = {}
+    for stage in PROFILE_STAGES:
+        stages[stage] = {
+            "seconds": sum(page["stages"][stage]["seconds"] for page in pages),
+            "allocated_bytes": sum(
+                page["stages"][stage]["allocated_bytes"] for page in pages
+            ),
+        }
+    return {
+        "page_count": len(pages),
+        "total_seconds": sum(page["seconds"] for page in pages),
+        "stages": stages,
+        "pages": pages,
+    }
+
+
+def write_profile_report(report, report_path):
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, "w") as report_file:
+        json.dump(report, report_file, indent=1)
+
+
+def print_profile_summary(report, top):
+    print(
+        f"Profiled {report['page_count']} pages in {report['total_seconds']:.3f}s"
+    )
+    for stage, totals in report["stages"].items():
+        print(
+            f"  {stage:<20} {totals['seconds']:>9.4f}s {totals['allocated_bytes']:>12} B"
+        )
+    print(f"Slowest {min(top, report['page_count'])} pages:")
+    for page in report["pages"][:top]:
+        slowest_stage = max(
+            page["stages"], key=lambda stage: page["stages"][stage]["seconds"]
+        )
+        print(f"  {page['seconds']:>9.4f}s {page['page']} (mostly {slowest_stage})")
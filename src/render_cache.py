@@ -0,0 +1,111 @@
+import hashlib
+import os
+import sqlite3
+import time
+
+_render_cache_settings = None
+_render_cache = None
+_render_cache_pid = None
+
+
+class RenderCache:
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, renderer_version=1):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.renderer_version = renderer_version
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS fragments ("
+            "key TEXT PRIMARY KEY, html TEXT NOT NULL, "
+            "size INTEGER NOT NULL, last_used INTEGER NOT NULL)"
+        )
+        self.connection.commit()
+
+    def key(self, block, block_type):
+        return hashlib.sha256(
+            f"{self.renderer_version}\0{block_type.value}\0{block}".encode()
+        ).hexdigest()
+
+    def render_blocks(self, classified_blocks, render_block):
+        keys = [self.key(block, block_type) for block, block_type, _ in classified_blocks]
+        cached = {}
+        unique_keys = list(set(keys))
+        for start in range(0, len(unique_keys), 500):
+            chunk = unique_keys[start : start + 500]
+            cached.update(
+                self.connection.execute(
+                    "SELECT key, html FROM fragments WHERE key IN "
+                    f"({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+            )
+        now = time.time_ns()
+        fragments = []
+        rows = {}
+        for key, (_, block_type, payload) in zip(keys, classified_blocks):
+            if key in cached:
+                self.hits += 1
+            else:
+                self.misses += 1
+                cached[key] = render_block(block_type, payload)
+                rows[key] = cached[key]
+            fragments.append(cached[key])
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO fragments (key, html, size, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, html, len(html), now) for key, html in rows.items()],
+            )
+            self.connection.executemany(
+                "UPDATE fragments SET last_used = ? WHERE key = ?",
+                [(now, key) for key in set(keys) - set(rows)],
+            )
+        return fragments
+
+    def total_bytes(self):
+        return self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM fragments"
+        ).fetchone()[0]
+
+    def evict(self):
+        excess = self.total_bytes() - self.max_bytes
+        evicted = 0
+        if excess <= 0:
+            return evicted
+        stale_keys = []
+        for key, size in self.connection.execute(
+            "SELECT key, size FROM fragments ORDER BY last_used"
+        ):
+            if excess <= 0:
+                break
+            stale_keys.append((key,))
+            excess -= size
+        with self.connection:
+            self.connection.executemany("DELETE FROM fragments WHERE key = ?", stale_keys)
+        return len(stale_keys)
+
+    def close(self):
+        self.connection.close()
+
+
+def configure_render_cache(path, max_bytes=256 * 1024 * 1024, renderer_version=1):
+    global _render_cache_settings, _render_cache
+    settings = (path, max_bytes, renderer_version) if path else None
+    if settings == _render_cache_settings:
+        return
+    _render_cache_settings = settings
+    _render_cache = None
+
+
+def get_render_cache():
+    global _render_cache, _render_cache_pid
+    if _render_cache_settings is None:
+        return None
+    if _render_cache is None or _render_cache_pid != os.getpid():
+        _render_cache = RenderCache(*_render_cache_settings)
+        _render_cache_pid = os.getpid()
+    return _render_cache
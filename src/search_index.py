@@ -0,0 +1,219 @@
+import gzip
+import json
+import os
+import re
+from urllib.parse import quote
+
+from block_markdown import BlockType, classify_block, markdown_to_blocks
+from front_matter import split_front_matter
+from includes import (
+    dependencies_changed,
+    dependency_hashes,
+    record_dependencies,
+    recorded_dependencies,
+)
+from inline_markdown import text_to_textnodes
+from link_graph import page_url
+from pages import extract_title
+
+SEARCH_INDEX_VERSION = 2
+TITLE_WEIGHT = 5
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have he her his i in is it its of on"
+    " or she that the their them they this to was were which with you your".split()
+)
+STEM_SUFFIXES = (
+    "ational",
+    "ization",
+    "fulness",
+    "ousness",
+    "iveness",
+    "ations",
+    "ation",
+    "ments",
+    "ment",
+    "ness",
+    "ings",
+    "ing",
+    "edly",
+    "ed",
+    "ly",
+    "es",
+    "s",
+)
+
+
+def stem(word):
+    if len(word) <= 3 or word.isdigit():
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("ss", "us", "is")):
+        return word
+    for suffix in STEM_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)]
+            if word[-1] == word[-2] and word[-1] not in "lsz":
+                word = word[:-1]
+            return word
+    return word
+
+
+def tokenize(text):
+    return [
+        stem(token)
+        for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOP_WORDS
+    ]
+
+
+def block_texts(block_type, payload):
+    match block_type:
+        case BlockType.HEADING | BlockType.CODE:
+            return [payload[1]]
+        case BlockType.ULIST | BlockType.OLIST:
+            return payload
+        case _:
+            return [payload]
+
+
+def page_text(markdown):
+    for block in markdown_to_blocks(markdown):
+        for text in block_texts(*classify_block(block)):
+            for text_node in text_to_textnodes(text.replace("\n", " ")):
+                yield text_node.text
+
+
+def index_page(markdown):
+    metadata, markdown = split_front_matter(markdown)
+    title = metadata.get("title") or extract_title(markdown)
+    terms = {}
+    for text in page_text(markdown):
+        for term in tokenize(text):
+            terms[term] = terms.get(term, 0) + 1
+    for term in tokenize(title):
+        terms[term] = terms.get(term, 0) + TITLE_WEIGHT
+    return {"title": title, "terms": terms}
+
+
+def load_search_cache(path):
+    try:
+        with open(path, "r") as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return {"version": SEARCH_INDEX_VERSION, "pages": {}}
+    if cache.get("version") != SEARCH_INDEX_VERSION:
+        return {"version": SEARCH_INDEX_VERSION, "pages": {}}
+    return cache
+
+
+def save_search_cache(path, cache):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(cache, file, sort_keys=True)
+    os.replace(temporary_path, path)
+
+
+def update_search_pages(cache, dir_path_content, sources):
+    pages = cache["pages"]
+    for relative_source in set(pages) - set(sources):
+        del pages[relative_source]
+    known_hashes = {}
+    indexed = []
+    for relative_source, source_hash in sorted(sources.items()):
+        previous = pages.get(relative_source)
+        if (
+            previous
+            and previous["hash"] == source_hash
+            and not dependencies_changed(previous["dependencies"], known_hashes)
+        ):
+            continue
+        record_dependencies()
+        try:
+            with open(
+                os.path.join(dir_path_content, relative_source), "r"
+            ) as markdown_file:
+                page = index_page(markdown_file.read())
+        finally:
+            dependencies = recorded_dependencies()
+        pages[relative_source] = {
+            "hash": source_hash,
+            "dependencies": dependency_hashes(dependencies, known_hashes),
+            **page,
+        }
+        indexed.append(relative_source)
+    return indexed
+
+
+def build_shards(pages, base_path, prefix_length):
+    documents = []
+    shards = {}
+    for document_id, (relative_source, page) in enumerate(sorted(pages.items())):
+        documents.append(
+            {"url": base_path + page_url(relative_source)[1:], "title": page["title"]}
+        )
+        for term, weight in page["terms"].items():
+            shard = shards.setdefault(term[:prefix_length], {})
+            shard.setdefault(term, []).append([document_id, weight])
+    return documents, shards
+
+
+def write_compressed_json(path, data):
+    compressed = gzip.compress(
+        json.dumps(data, separators=(",", ":"), sort_keys=True).encode(), mtime=0
+    )
+    try:
+        with open(path, "rb") as file:
+            if file.read() == compressed:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, "wb") as file:
+        file.write(compressed)
+    return True
+
+
+def shard_file_name(prefix):
+    return f"terms-{quote(prefix, safe='')}.json.gz"
+
+
+def write_search_index(search_dir_path, documents, shards, prefix_length):
+    os.makedirs(search_dir_path, exist_ok=True)
+    written = 0
+    shard_files = {shard_file_name(prefix) for prefix in shards}
+    for prefix, terms in shards.items():
+        written += write_compressed_json(
+            os.path.join(search_dir_path, shard_file_name(prefix)), terms
+        )
+    written += write_compressed_json(
+        os.path.join(search_dir_path, "index.json.gz"),
+        {
+            "version": SEARCH_INDEX_VERSION,
+            "prefix_length": prefix_length,
+            "documents": documents,
+            "shards": {prefix: shard_file_name(prefix) for prefix in sorted(shards)},
+        },
+    )
+    for file_name in os.listdir(search_dir_path):
+        if file_name.startswith("terms-") and file_name not in shard_files:
+            os.remove(os.path.join(search_dir_path, file_name))
+    return written
+
+
+def update_search_index(
+    cache_path, dir_path_content, sources, public_dir_path, base_path, prefix_length=2
+):
+    cache = load_search_cache(cache_path)
+    indexed = update_search_pages(cache, dir_path_content, sources)
+    save_search_cache(cache_path, cache)
+    documents, shards = build_shards(cache["pages"], base_path, prefix_length)
+    written = write_search_index(
+        os.path.join(public_dir_path, "search"), documents, shards, prefix_length
+    )
+    print(
+        f"Search index: {len(indexed)} pages tokenised, {len(shards)} shards,"
+        f" {written} files written"
+    )
+    return indexed
@@ -0,0 +1,101 @@
+import json
+import os
+import time
+
+from builder import build, shared_worker_pool
+
+SITE_KEYS = (
+    "name",
+    "base_path",
+    "content",
+    "static",
+    "template",
+    "includes",
+    "output",
+    "cache",
+    "site_url",
+)
+PATH_KEYS = ("content", "static", "template", "includes", "output", "cache")
+
+
+def is_inside(path, directory):
+    return os.path.commonpath([path, directory]) == directory
+
+
+def resolve_site(entry, defaults, root, shared_cache_dir_path):
+    site = {
+        "base_path": "/",
+        "content": "content",
+        "static": "static",
+        "template": "template.html",
+        "includes": "includes",
+        "site_url": None,
+        **defaults,
+        **entry,
+    }
+    unknown_keys = sorted(set(site) - set(SITE_KEYS))
+    if unknown_keys:
+        raise ValueError(f"Unknown site settings: {', '.join(unknown_keys)}")
+    name = site.get("name")
+    if not name:
+        raise ValueError("Every site needs a name")
+    site.setdefault("output", os.path.join("docs", name))
+    site.setdefault("cache", os.path.join(shared_cache_dir_path, "sites", name))
+    if not site["base_path"].startswith("/") or not site["base_path"].endswith("/"):
+        raise ValueError(f"Base path of site {name} must start and end with /")
+    for key in PATH_KEYS:
+        site[key] = os.path.normpath(os.path.join(root, site[key]))
+    site["shared_cache"] = shared_cache_dir_path
+    return site
+
+
+def load_site_config(path, names=None):
+    with open(path, "r") as file:
+        config = json.load(file)
+    root = os.path.dirname(os.path.abspath(path))
+    shared_cache_dir_path = os.path.normpath(
+        os.path.join(root, config.get("cache", ".cache"))
+    )
+    defaults = config.get("defaults", {})
+    sites = [
+        resolve_site(entry, defaults, root, shared_cache_dir_path)
+        for entry in config["sites"]
+    ]
+    site_names = [site["name"] for site in sites]
+    duplicates = sorted({name for name in site_names if site_names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate site names: {', '.join(duplicates)}")
+    for site in sites:
+        for other in sites:
+            if site is not other and is_inside(site["output"], other["output"]):
+                raise ValueError(
+                    f"Output of site {site['name']} is inside the output of"
+                    f" site {other['name']}"
+                )
+    if names:
+        missing = sorted(set(names) - set(site_names))
+        if missing:
+            raise ValueError(f"Unknown sites: {', '.join(missing)}")
+        sites = [site for site in sites if site["name"] in names]
+    return sites
+
+
+def build_sites(args, sites):
+    if args.sitemap or args.feeds:
+        for site in sites:
+            if not (site["site_url"] or args.site_url):
+                raise ValueError(f"Site {site['name']} needs a site_url for --sitemap/--feeds")
+    results = []
+    with shared_worker_pool(args.jobs):
+        for site in sites:
+            start = time.perf_counter()
+            print(f"Building site {site['name']} into {site['output']}")
+            site_results = build(args, site)
+            for result in site_results:
+                result["site"] = site["name"]
+            results.extend(site_results)
+            print(
+                f"Built site {site['name']} ({len(site_results)} pages rendered)"
+                f" in {time.perf_counter() - start:.2f}s"
+            )
+    return results
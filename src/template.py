@@ -0,0 +1,160 @@
+import os
+import re
+
+from includes import add_dependency
+from minify import minify_html
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(>\s*)?(\w+)\s*\}\}")
+SRCSET_PATTERN = re.compile(r"srcset='([^']*)'")
+ASSET_LINK_PATTERN = re.compile(r"((?:href|src)=([\"']))([^\"']*)(\2)")
+
+_template_cache = {}
+_template_options = {}
+
+
+class Template:
+    __slots__ = ("segments", "base_path")
+
+    def __init__(self, segments, base_path="/"):
+        self.segments = segments
+        self.base_path = base_path
+
+    def placeholders(self):
+        return [
+            name
+            for name, _ in self.segments
+            if name is not None and not name.startswith(">")
+        ]
+
+    def partials(self):
+        return [path for name, path in self.segments if name and name.startswith(">")]
+
+    def render_stream(self, context, write, partials=()):
+        for name, text in self.segments:
+            if name is None:
+                write(text)
+                continue
+            if name.startswith(">"):
+                path = os.path.abspath(text)
+                if path in partials:
+                    raise ValueError(f"Partial cycle through {path}")
+                add_dependency(path)
+                load_template(
+                    text, self.base_path, os.path.dirname(text)
+                ).render_stream(context, write, partials + (path,))
+                continue
+            value = context.get(name)
+            if value is None:
+                write(text)
+            elif callable(value):
+                value(write)
+            else:
+                write(str(value))
+
+    def render(self, context):
+        chunks = []
+        self.render_stream(context, chunks.append)
+        return "".join(chunks)
+
+    def __eq__(self, template):
+        return self.segments == template.segments
+
+    def __repr__(self):
+        return f"Template({self.segments})"
+
+
+def parse_template(
+    template_text, base_path="/", minify=False, asset_urls=None, partials_dir="partials"
+):
+    if asset_urls:
+        template_text = fingerprint_links(template_text, base_path, asset_urls)
+    if minify:
+        template_text = minify_html(template_text)
+    segments = []
+    position = 0
+    for match in PLACEHOLDER_PATTERN.finditer(template_text):
+        if match.start() > position:
+            segments.append(
+                (None, rebase_links(template_text[position : match.start()], base_path))
+            )
+        if match.group(1):
+            segments.append(
+                (">" + match.group(2), os.path.join(partials_dir, match.group(2) + ".html"))
+            )
+        else:
+            segments.append((match.group(2), match.group()))
+        position = match.end()
+    if position < len(template_text):
+        segments.append((None, rebase_links(template_text[position:], base_path)))
+    return Template(segments, base_path)
+
+
+def configure_template(minify=False, asset_urls=None):
+    global _template_options
+    options = {"minify": minify, "asset_urls": asset_urls or {}}
+    if options != _template_options:
+        _template_options = options
+        _template_cache.clear()
+
+
+def get_template_options():
+    return _template_options
+
+
+def load_template(template_path, base_path="/", partials_dir=None):
+    if partials_dir is None:
+        partials_dir = os.path.join(os.path.dirname(template_path), "partials")
+    key = (os.path.abspath(template_path), base_path, partials_dir)
+    stat = os.stat(template_path)
+    cached = _template_cache.get(key)
+    if cached and cached[0] == (stat.st_mtime_ns, stat.st_size):
+        return cached[1]
+    with open(template_path, "r") as template_file:
+        template = parse_template(
+            template_file.read(),
+            base_path,
+            partials_dir=partials_dir,
+            **_template_options,
+        )
+    _template_cache[key] = ((stat.st_mtime_ns, stat.st_size), template)
+    return template
+
+
+def clear_template_cache():
+    _template_cache.clear()
+
+
+def fingerprint_links(html, base_path, asset_urls):
+    def replace(match):
+        url = match[3]
+        if url.startswith(base_path):
+            path = url[len(base_path) - 1 :]
+        elif url.startswith("/"):
+            path = url
+        else:
+            return match[0]
+        if path not in asset_urls:
+            return match[0]
+        return match[1] + url[: len(url) - len(path)] + asset_urls[path] + match[4]
+
+    return ASSET_LINK_PATTERN.sub(replace, html)
+
+
+def rebase_links(html, base_path):
+    if base_path == "/":
+        return html
+    html = html.replace("href='/", f"href='{base_path}").replace(
+        "src='/", f"src='{base_path}"
+    )
+    if "srcset='" in html:
+        html = SRCSET_PATTERN.sub(
+            lambda match: "srcset='" + rebase_srcset(match[1], base_path) + "'", html
+        )
+    return html
+
+
+def rebase_srcset(srcset, base_path):
+    return ", ".join(
+        base_path + candidate[1:] if candidate.startswith("/") else candidate
+        for candidate in srcset.split(", ")
+    )
@@ -0,0 +1,116 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from asset_sync import copy_file, copy_range, is_up_to_date, sync_assets
+
+
+def read_file(path, mode="r"):
+    with open(path, mode) as file:
+        return file.read()
+
+
+class TestCopyFile(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.root = self.temporary_directory.name
+        self.source = os.path.join(self.root, "source.png")
+        with open(self.source, "wb") as file:
+            file.write(b"\x89PNG" * 1000)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_copy_strategies(self):
+        for strategy in ("auto", "hardlink", "copy"):
+            destination = os.path.join(self.root, strategy, "images", "a.png")
+            method = copy_file(self.source, destination, strategy)
+            self.assertTrue(method)
+            self.assertEqual(read_file(destination, "rb"), b"\x89PNG" * 1000)
+            self.assertTrue(is_up_to_date(self.source, destination))
+
+    @unittest.skipUnless(hasattr(os, "copy_file_range"), "needs os.copy_file_range")
+    def test_short_copy_range_raises(self):
+        copy_file_range = os.copy_file_range
+        os.copy_file_range = lambda source, destination, count: 0
+        self.addCleanup(setattr, os, "copy_file_range", copy_file_range)
+        destination = os.path.join(self.root, "a.png")
+        with self.assertRaises(OSError):
+            copy_range(self.source, destination)
+
+    def test_copy_replaces_hard_link_instead_of_writing_through(self):
+        destination = os.path.join(self.root, "a.png")
+        self.assertEqual(copy_file(self.source, destination, "hardlink"), "hard_link")
+        other = os.path.join(self.root, "other.png")
+        with open(other, "wb") as file:
+            file.write(b"other")
+        copy_file(other, destination, "copy")
+        self.assertEqual(read_file(self.source, "rb"), b"\x89PNG" * 1000)
+        self.assertEqual(read_file(destination, "rb"), b"other")
+
+
+class TestSyncAssets(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.temporary_directory.name, "static")
+        self.destination = os.path.join(self.temporary_directory.name, "docs")
+        os.makedirs(os.path.join(self.source, "images"))
+        with open(os.path.join(self.source, "index.css"), "w") as file:
+            file.write("body {}")
+        with open(os.path.join(self.source, "images", "a.png"), "w") as file:
+            file.write("png")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def sync(self, previous_files=(), checksum=False):
+        with redirect_stdout(io.StringIO()):
+            return sync_assets(self.source, self.destination, previous_files, "auto", checksum)
+
+    def test_unchanged_files_are_skipped(self):
+        files, stats = self.sync()
+        self.assertEqual(files, [os.path.join("images", "a.png"), "index.css"])
+        self.assertEqual(stats["copied"], 2)
+        _, stats = self.sync(files)
+        self.assertEqual((stats["copied"], stats["unchanged"]), (0, 2))
+
+    def test_changed_files_are_copied(self):
+        files, _ = self.sync()
+        with open(os.path.join(self.source, "index.css"), "w") as file:
+            file.write("body { margin: 0 }")
+        _, stats = self.sync(files)
+        self.assertEqual(stats["copied"], 1)
+        self.assertEqual(
+            read_file(os.path.join(self.destination, "index.css")), "body { margin: 0 }"
+        )
+
+    def test_touched_file_with_same_content_is_not_copied_with_checksum(self):
+        files, _ = self.sync()
+        os.utime(os.path.join(self.source, "index.css"), ns=(0, 0))
+        _, stats = self.sync(files, checksum=True)
+        self.assertEqual(stats["copied"], 0)
+        self.assertTrue(
+            is_up_to_date(
+                os.path.join(self.source, "index.css"),
+                os.path.join(self.destination, "index.css"),
+            )
+        )
+
+    def test_stale_files_are_removed(self):
+        files, _ = self.sync()
+        with open(os.path.join(self.destination, "page.html"), "w") as file:
+            file.write("<p></p>")
+        os.remove(os.path.join(self.source, "images", "a.png"))
+        files, stats = self.sync(files)
+        self.assertEqual(files, ["index.css"])
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.destination, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.destination, "page.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
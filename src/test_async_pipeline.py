@@ -0,0 +1,90 @@
+import asyncio
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from async_pipeline import run_pipeline
+from builder import collect_pages, generate_pages_recursive
+from main import parse_args
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def read_file(path):
+    with open(path, "r") as file:
+        return file.read()
+
+
+def read_tree(root):
+    return {
+        os.path.relpath(os.path.join(directory, name), root): read_file(
+            os.path.join(directory, name)
+        )
+        for directory, _, names in os.walk(root)
+        for name in names
+    }
+
+
+class TestAsyncPipeline(unittest.TestCase):
+
+    def test_pipeline_output_matches_serial_output(self):
+        content = os.path.join(ROOT, "content")
+        template = os.path.join(ROOT, "template.html")
+        with tempfile.TemporaryDirectory() as root:
+            serial = os.path.join(root, "serial")
+            with redirect_stdout(io.StringIO()):
+                generate_pages_recursive("/base/", content, template, serial)
+            for jobs in (1, 2):
+                public = os.path.join(root, f"pipeline{jobs}")
+                pages = collect_pages(content, public)
+                with redirect_stdout(io.StringIO()):
+                    results, _ = asyncio.run(
+                        run_pipeline(
+                            "/base/",
+                            pages,
+                            template,
+                            jobs,
+                            read_concurrency=2,
+                            write_concurrency=2,
+                            queue_size=1,
+                        )
+                    )
+                self.assertEqual(len(results), len(pages))
+                self.assertEqual(read_tree(serial), read_tree(public))
+
+    def test_background_result_is_returned(self):
+        _, background_result = asyncio.run(
+            run_pipeline(
+                "/", [], os.path.join(ROOT, "template.html"), background=lambda: "synced"
+            )
+        )
+        self.assertEqual(background_result, "synced")
+
+    def test_render_error_is_raised(self):
+        with tempfile.TemporaryDirectory() as root:
+            template = os.path.join(root, "template.html")
+            with open(template, "w") as file:
+                file.write("{{ Title }}{{ Content }}")
+            pages = []
+            for index in range(20):
+                source = os.path.join(root, f"page{index}.md")
+                text = "# Title\n\nSome **broken text\n" if index == 3 else "# Title\n"
+                with open(source, "w") as file:
+                    file.write(text)
+                pages.append((source, os.path.join(root, "out", f"page{index}.md")))
+            with redirect_stdout(io.StringIO()):
+                with self.assertRaises(ValueError):
+                    asyncio.run(run_pipeline("/", pages, template, queue_size=1))
+
+    def test_pipeline_options_must_be_positive(self):
+        for option, name in (
+            ("--read-concurrency", "read_concurrency"),
+            ("--write-concurrency", "write_concurrency"),
+            ("--queue-size", "queue_size"),
+        ):
+            self.assertEqual(getattr(parse_args([option, "1"]), name), 1)
+            for value in ("0", "-2"):
+                with self.assertRaises(SystemExit), redirect_stderr(io.StringIO()):
+                    parse_args([option, value])
@@ -0,0 +1,28 @@
+import unittest
+
+from bench import compare_results
+
+
+def report(**seconds):
+    return {"results": {name: {"seconds": value} for name, value in seconds.items()}}
+
+
+class TestCompareResults(unittest.TestCase):
+
+    def test_flags_slowdowns_above_threshold(self):
+        comparison = compare_results(
+            report(to_html=1.0, full_build=2.0),
+            report(to_html=1.05, full_build=2.5),
+            0.10,
+        )
+        self.assertEqual(
+            [(name, is_regression) for name, _, _, _, is_regression in comparison],
+            [("to_html", False), ("full_build", True)],
+        )
+
+    def test_ignores_benchmarks_missing_from_baseline(self):
+        self.assertEqual(compare_results(report(), report(to_html=1.0), 0.10), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
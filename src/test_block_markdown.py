@@ -1,14 +1,18 @@
+import io
 import unittest
 
 from block_markdown import (
     BlockType,
     block_to_block_type,
+    classify_block,
+    iter_blocks,
     markdown_to_blocks,
     markdown_to_html_node,
     text_node_to_parent_html_node,
     text_to_leaf_html_nodes,
 )
 from htmlnode import LeafNode, ParentNode
+from image_pipeline import configure_image_attributes
 from textnode import TextNode, TextType
 
 
@@ -47,6 +51,41 @@ This is the same paragraph on a new line
         self.assertEqual(blocks, expected)
 
 
+    def test_markdown_to_blocks_keeps_blank_lines_in_fences(self):
+        md = "Intro\n\n```\nfirst\n\n\nsecond\n```\n\nOutro"
+        expected = ["Intro", "```\nfirst\n\n\nsecond\n```", "Outro"]
+        self.assertEqual(markdown_to_blocks(md), expected)
+
+    def test_markdown_to_blocks_with_single_line_fence(self):
+        md = "```Code```\n\nText"
+        self.assertEqual(markdown_to_blocks(md), ["```Code```", "Text"])
+
+
+class TestIterBlocks(unittest.TestCase):
+
+    def test_iter_blocks_from_file_lines(self):
+        markdown_file = io.StringIO("# Title\n\n\n\nFirst line\nsecond line\n\n- a\n- b\n")
+        self.assertEqual(
+            list(iter_blocks(markdown_file)),
+            ["# Title", "First line\nsecond line", "- a\n- b"],
+        )
+
+    def test_iter_blocks_is_lazy(self):
+        def lines():
+            yield "First\n"
+            yield "\n"
+            raise AssertionError("read past the first block")
+
+        self.assertEqual(next(iter_blocks(lines())), "First")
+
+    def test_markdown_to_html_node_with_blocks(self):
+        blocks = iter_blocks(io.StringIO("# Title\n\nSome **bold** text\n"))
+        self.assertEqual(
+            markdown_to_html_node(blocks).to_html(),
+            "<div><h1>Title</h1><p>Some <b>bold</b> text</p></div>",
+        )
+
+
 class TestBlockToBlockType(unittest.TestCase):
 
     def test_with_heading1_block(self):
@@ -120,6 +159,53 @@ class TestBlockToBlockType(unittest.TestCase):
         self.assertEqual(actual, BlockType.PARAGRAPH)
 
 
+class TestClassifyBlock(unittest.TestCase):
+
+    def test_heading_payload(self):
+        self.assertEqual(
+            classify_block("### A # heading"), (BlockType.HEADING, (3, "A # heading"))
+        )
+
+    def test_heading_with_too_many_markers_is_a_paragraph(self):
+        self.assertEqual(
+            classify_block("####### Heading"), (BlockType.PARAGRAPH, "####### Heading")
+        )
+
+    def test_code_payload_with_fence_info(self):
+        self.assertEqual(
+            classify_block("```python\nprint()\n```"),
+            (BlockType.CODE, ("python", "\nprint()\n")),
+        )
+
+    def test_single_line_code_payload(self):
+        self.assertEqual(
+            classify_block("```Code here```"), (BlockType.CODE, ("", "Code here"))
+        )
+
+    def test_bare_fence_is_an_empty_code_block(self):
+        self.assertEqual(classify_block("```"), (BlockType.CODE, ("", "")))
+        with self.assertRaises(ValueError) as context:
+            markdown_to_html_node("```").to_html()
+        self.assertEqual(str(context.exception), "children must be provided")
+
+    def test_quote_payload_strips_line_markers_only(self):
+        self.assertEqual(
+            classify_block("> a > b\n> c"), (BlockType.QUOTES, "a > b\nc")
+        )
+
+    def test_list_payloads(self):
+        self.assertEqual(
+            classify_block("- a - b\n- c"), (BlockType.ULIST, ["a - b", "c"])
+        )
+        self.assertEqual(
+            classify_block("1. a\n10. b"), (BlockType.OLIST, ["a", "b"])
+        )
+
+    def test_classification_matches_block_to_block_type(self):
+        for block in ("# H", "```c```", "> q", "- u", "1. o", "text", "-no space"):
+            self.assertEqual(classify_block(block)[0], block_to_block_type(block))
+
+
 class TestTextToLeafHtmlNodes(unittest.TestCase):
 
     test_cases = [
@@ -161,6 +247,16 @@ class TestTextToLeafHtmlNodes(unittest.TestCase):
                 print(actual)
                 self.fail("Test failed for test_text_to_leaf_html_nodes.")
 
+    def test_image_attributes(self):
+        configure_image_attributes({"/a.png": {"width": 10, "height": 5}})
+        try:
+            children = text_to_leaf_html_nodes("See ![A](/a.png)")
+        finally:
+            configure_image_attributes(None)
+        self.assertEqual(
+            children[1].to_html(), "<img src='/a.png' alt='A' width='10' height='5'></img>"
+        )
+
 
 class TestTextNodeToParentHtmlNode(unittest.TestCase):
     test_cases = [
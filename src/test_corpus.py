@@ -0,0 +1,52 @@
+import os
+import random
+import tempfile
+import unittest
+
+from block_markdown import markdown_to_html_node
+from corpus import generate_corpus, generate_markdown
+from pages import extract_title
+
+
+def read_file(path):
+    with open(path, "r") as file:
+        return file.read()
+
+
+class TestGenerateMarkdown(unittest.TestCase):
+
+    def test_same_seed_same_markdown(self):
+        first = generate_markdown(random.Random(3), "Title")
+        second = generate_markdown(random.Random(3), "Title")
+        self.assertEqual(first, second)
+
+    def test_markdown_renders(self):
+        markdown = generate_markdown(random.Random(0), "Title", list_length=7)
+        html = markdown_to_html_node(markdown).to_html()
+        self.assertEqual(extract_title(markdown), "Title")
+        self.assertIn("<ul>", html)
+        self.assertIn("<ol>", html)
+        self.assertEqual(html.count("<li>"), 28)
+
+    def test_link_density(self):
+        markdown = generate_markdown(
+            random.Random(0), "Title", paragraphs=1, paragraph_words=1000, link_density=0.5
+        )
+        self.assertGreater(markdown.count("]("), 400)
+
+
+class TestGenerateCorpus(unittest.TestCase):
+
+    def test_corpus_is_deterministic_and_nested(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = generate_corpus(os.path.join(directory, "a"), pages=20, nesting=3)
+            second = generate_corpus(os.path.join(directory, "b"), pages=20, nesting=3)
+            self.assertEqual(len(first), 20)
+            for first_path, second_path in zip(first, second):
+                self.assertEqual(read_file(first_path), read_file(second_path))
+                relative_path = os.path.relpath(first_path, os.path.join(directory, "a"))
+                self.assertEqual(len(relative_path.split(os.sep)), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
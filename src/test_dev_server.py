@@ -0,0 +1,186 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+import urllib.request
+from contextlib import redirect_stdout
+
+from dev_server import (
+    RELOAD_SCRIPT,
+    EventWatcher,
+    LiveBuilder,
+    Observer,
+    ReloadBroadcaster,
+    SiteWatcher,
+    inject_reload_script,
+    start_server,
+)
+from includes import configure_includes
+
+
+def read_file(path):
+    with open(path, "r") as file:
+        return file.read()
+
+
+class TestInjectReloadScript(unittest.TestCase):
+
+    def test_script_before_closing_body(self):
+        self.assertEqual(
+            inject_reload_script("<body><p>Hi</p></body></html>"),
+            f"<body><p>Hi</p>{RELOAD_SCRIPT}</body></html>",
+        )
+
+    def test_script_appended_without_body(self):
+        self.assertEqual(inject_reload_script("<p>Hi</p>"), f"<p>Hi</p>{RELOAD_SCRIPT}")
+
+
+class TestReloadBroadcaster(unittest.TestCase):
+
+    def test_wait_returns_new_generation(self):
+        broadcaster = ReloadBroadcaster()
+        broadcaster.notify()
+        self.assertEqual(broadcaster.wait(0, 0.01), 1)
+        self.assertEqual(broadcaster.wait(1, 0.01), 1)
+
+
+class TestLiveBuild(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        root = self.temporary_directory.name
+        self.content = os.path.join(root, "content")
+        self.static = os.path.join(root, "static")
+        self.template = os.path.join(root, "template.html")
+        self.public = os.path.join(root, "docs")
+        os.makedirs(os.path.join(self.content, "blog"))
+        os.makedirs(self.static)
+        self.write(os.path.join(self.content, "index.md"), "# Home")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        self.watcher = SiteWatcher([self.content, self.static, self.template])
+        self.builder = LiveBuilder(
+            "/", self.content, self.static, self.template, self.public
+        )
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def write(self, path, text):
+        with open(path, "w") as file:
+            file.write(text)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def apply_changes(self):
+        with redirect_stdout(io.StringIO()):
+            return self.builder.apply(*self.watcher.poll())
+
+    def test_poll_reports_changes(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home 2")
+        os.remove(os.path.join(self.static, "index.css"))
+        changed, removed = self.watcher.poll()
+        self.assertEqual(changed, {os.path.join(self.content, "index.md")})
+        self.assertEqual(removed, {os.path.join(self.static, "index.css")})
+        self.assertEqual(self.watcher.poll(), (set(), set()))
+
+    def test_unchanged_directories_are_not_listed_again(self):
+        for directory in (self.content, os.path.join(self.content, "blog")):
+            os.utime(directory, ns=(0, 10**9))
+        watcher = SiteWatcher([self.content])
+        listing = watcher.listings[self.content]
+        self.assertEqual(watcher.poll(), (set(), set()))
+        self.assertIs(watcher.listings[self.content], listing)
+        new_page = os.path.join(self.content, "blog", "new.md")
+        self.write(new_page, "# New")
+        self.assertEqual(watcher.poll(), ({new_page}, set()))
+
+    @unittest.skipIf(Observer is None, "watchdog is not installed")
+    def test_event_watcher_reports_changes(self):
+        watcher = EventWatcher([self.content, self.template])
+        self.addCleanup(watcher.stop)
+        page = os.path.join(self.content, "blog", "index.md")
+        self.write(page, "# Blog 2")
+        os.remove(os.path.join(self.content, "index.md"))
+        changes = (set(), set())
+        for _ in range(100):
+            time.sleep(0.02)
+            polled = watcher.poll()
+            changes = (changes[0] | polled[0], changes[1] | polled[1])
+            if changes[0] and changes[1]:
+                break
+        self.assertEqual(changes, ({page}, {os.path.join(self.content, "index.md")}))
+
+    def test_only_changed_page_is_rendered(self):
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog 2")
+        self.assertEqual(self.apply_changes(), 1)
+        self.assertEqual(
+            read_file(os.path.join(self.public, "blog", "index.html")),
+            "<h1>Blog 2</h1><div><h1>Blog 2</h1></div>",
+        )
+        self.assertFalse(os.path.exists(os.path.join(self.public, "index.html")))
+
+    def test_template_change_reuses_parsed_pages(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home 2")
+        self.apply_changes()
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.assertEqual(self.apply_changes(), 2)
+        self.assertEqual(self.builder.parsed_pages, 2)
+        self.assertEqual(
+            read_file(os.path.join(self.public, "index.html")),
+            "<title>Home 2</title><div><h1>Home 2</h1></div>",
+        )
+
+    def test_include_change_renders_dependent_pages(self):
+        includes = os.path.join(self.temporary_directory.name, "includes")
+        os.makedirs(includes)
+        configure_includes(includes)
+        self.addCleanup(configure_includes, None)
+        self.watcher = SiteWatcher([self.content, self.template, includes])
+        self.write(os.path.join(includes, "note.md"), "A note")
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n{{> note }}")
+        self.apply_changes()
+        self.write(os.path.join(includes, "note.md"), "A new note")
+        self.assertEqual(self.apply_changes(), 1)
+        self.assertEqual(
+            read_file(os.path.join(self.public, "index.html")),
+            "<h1>Home</h1><div><h1>Home</h1><p>A new note</p></div>",
+        )
+
+    def test_static_and_page_removal(self):
+        self.write(os.path.join(self.static, "index.css"), "body { margin: 0 }")
+        self.write(os.path.join(self.content, "index.md"), "# Home 2")
+        self.apply_changes()
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.css")))
+        os.remove(os.path.join(self.static, "index.css"))
+        os.remove(os.path.join(self.content, "index.md"))
+        self.apply_changes()
+        self.assertFalse(os.path.exists(os.path.join(self.public, "index.css")))
+        self.assertFalse(os.path.exists(os.path.join(self.public, "index.html")))
+
+    def test_invalid_markdown_does_not_stop_watching(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home **broken")
+        self.assertEqual(self.apply_changes(), 0)
+
+
+class TestDevServer(unittest.TestCase):
+
+    def test_html_is_served_with_reload_script(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "index.html"), "w") as file:
+                file.write("<body></body>")
+            server = start_server(directory, "localhost", 0, ReloadBroadcaster())
+            try:
+                body = urllib.request.urlopen(
+                    f"http://localhost:{server.server_port}/"
+                ).read().decode()
+            finally:
+                server.shutdown()
+                server.server_close()
+        self.assertEqual(body, f"<body>{RELOAD_SCRIPT}</body>")
+
+
+if __name__ == "__main__":
+    unittest.main()
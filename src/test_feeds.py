@@ -0,0 +1,122 @@
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+
+from feeds import write_feeds, write_sitemap
+
+
+def page(url, title, date=None, draft=False, metadata=None):
+    return {
+        "hash": "1",
+        "url": url,
+        "title": title,
+        "date": date,
+        "tags": [],
+        "draft": draft,
+        "metadata": metadata or {},
+    }
+
+
+class TestFeeds(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.public = self.temporary_directory.name
+        self.index = {
+            "version": 1,
+            "pages": {
+                "index.md": page("/", "Tolkien Fan Club"),
+                "old.md": page("/old", "Old & busted", "2023-05-01"),
+                "new.md": page(
+                    "/new", "New", "2024-02-01", metadata={"description": "<Fresh>"}
+                ),
+                "draft.md": page("/draft", "Draft", "2024-03-01", draft=True),
+            },
+        }
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def parse(self, file_name):
+        return ElementTree.parse(os.path.join(self.public, file_name)).getroot()
+
+    def test_sitemap(self):
+        self.assertEqual(
+            write_sitemap(self.index, self.public, "https://example.com/", "/site/"),
+            (3, 0),
+        )
+        namespace = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+        root = self.parse("sitemap.xml")
+        self.assertEqual(root.tag, f"{namespace}urlset")
+        self.assertEqual(
+            [url.findtext(f"{namespace}loc") for url in root],
+            [
+                "https://example.com/site/",
+                "https://example.com/site/new",
+                "https://example.com/site/old",
+            ],
+        )
+        self.assertEqual(root[1].findtext(f"{namespace}lastmod"), "2024-02-01")
+
+    def test_sitemap_shards(self):
+        self.assertEqual(
+            write_sitemap(self.index, self.public, "https://example.com", "/", limit=2),
+            (3, 2),
+        )
+        namespace = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+        root = self.parse("sitemap.xml")
+        self.assertEqual(root.tag, f"{namespace}sitemapindex")
+        self.assertEqual(
+            [sitemap.findtext(f"{namespace}loc") for sitemap in root],
+            ["https://example.com/sitemap-1.xml", "https://example.com/sitemap-2.xml"],
+        )
+        self.assertEqual(len(self.parse("sitemap-2.xml")), 1)
+        write_sitemap(self.index, self.public, "https://example.com", "/")
+        self.assertFalse(os.path.exists(os.path.join(self.public, "sitemap-1.xml")))
+
+    def test_feeds(self):
+        self.assertEqual(write_feeds(self.index, self.public, "https://example.com", "/"), 2)
+        namespace = "{http://www.w3.org/2005/Atom}"
+        atom = self.parse("atom.xml")
+        self.assertEqual(atom.findtext(f"{namespace}title"), "Tolkien Fan Club")
+        self.assertEqual(atom.findtext(f"{namespace}updated"), "2024-02-01T00:00:00+00:00")
+        entries = atom.findall(f"{namespace}entry")
+        self.assertEqual(
+            [entry.findtext(f"{namespace}title") for entry in entries],
+            ["New", "Old & busted"],
+        )
+        self.assertEqual(entries[0].findtext(f"{namespace}summary"), "<Fresh>")
+        items = self.parse("rss.xml").findall("channel/item")
+        self.assertEqual(items[1].findtext("link"), "https://example.com/old")
+        self.assertEqual(items[0].findtext("pubDate"), "Thu, 01 Feb 2024 00:00:00 +0000")
+
+    def test_unchanged_outputs_are_not_rewritten(self):
+        write_sitemap(self.index, self.public, "https://example.com", "/")
+        write_feeds(self.index, self.public, "https://example.com", "/")
+        paths = [
+            os.path.join(self.public, file_name)
+            for file_name in ("sitemap.xml", "atom.xml", "rss.xml")
+        ]
+        for path in paths:
+            os.utime(path, ns=(0, 0))
+        write_sitemap(self.index, self.public, "https://example.com", "/")
+        write_feeds(self.index, self.public, "https://example.com", "/")
+        self.assertEqual([os.stat(path).st_mtime_ns for path in paths], [0, 0, 0])
+        self.assertEqual(
+            sorted(os.listdir(self.public)), ["atom.xml", "rss.xml", "sitemap.xml"]
+        )
+        self.index["pages"]["old.md"]["title"] = "Old"
+        write_feeds(self.index, self.public, "https://example.com", "/")
+        self.assertNotEqual(os.stat(paths[1]).st_mtime_ns, 0)
+
+    def test_feeds_without_dated_pages(self):
+        write_feeds(self.index, self.public, "https://example.com", "/")
+        for relative_source in ("old.md", "new.md", "draft.md"):
+            del self.index["pages"][relative_source]
+        self.assertEqual(write_feeds(self.index, self.public, "https://example.com", "/"), 0)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "atom.xml")))
+
+
+if __name__ == "__main__":
+    unittest.main()
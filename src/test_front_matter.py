@@ -0,0 +1,58 @@
+import io
+import unittest
+
+from front_matter import (
+    page_context,
+    parse_front_matter_lines,
+    read_front_matter,
+    split_front_matter,
+)
+
+
+class TestFrontMatter(unittest.TestCase):
+
+    def test_parse_values(self):
+        metadata = parse_front_matter_lines(
+            [
+                "title: \"Tom: a mistake\"",
+                "date: 2024-01-15",
+                "draft: true",
+                "tags: [tolkien, 'essays']",
+                "# a comment",
+                "authors:",
+                "  - Tom",
+                "  - Goldberry",
+            ]
+        )
+        self.assertEqual(
+            metadata,
+            {
+                "title": "Tom: a mistake",
+                "date": "2024-01-15",
+                "draft": True,
+                "tags": ["tolkien", "essays"],
+                "authors": ["Tom", "Goldberry"],
+            },
+        )
+
+    def test_invalid_line(self):
+        with self.assertRaises(ValueError):
+            parse_front_matter_lines(["not a field"])
+
+    def test_read_front_matter_leaves_file_at_body(self):
+        markdown_file = io.StringIO("---\ntitle: Hello\n---\n# Heading\n\nBody\n")
+        self.assertEqual(read_front_matter(markdown_file), {"title": "Hello"})
+        self.assertEqual(markdown_file.read(), "# Heading\n\nBody\n")
+
+    def test_markdown_without_front_matter(self):
+        self.assertEqual(split_front_matter("# Heading\n---\n"), ({}, "# Heading\n---\n"))
+
+    def test_unclosed_front_matter(self):
+        with self.assertRaises(ValueError):
+            split_front_matter("---\ntitle: Hello\n# Heading\n")
+
+    def test_page_context(self):
+        self.assertEqual(
+            page_context({"tags": ["a", "b"], "draft": False}, "Title", "<p></p>"),
+            {"tags": "a, b", "draft": "false", "Title": "Title", "Content": "<p></p>"},
+        )
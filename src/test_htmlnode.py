@@ -67,6 +67,11 @@ class TestLeafNode(unittest.TestCase):
         returned_value = node.to_html()
         self.assertEqual(returned_value, "Hello World")
 
+    def test_leaf_has_no_instance_dict(self):
+        node = LeafNode("p", "Hello, world!")
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertEqual(node, LeafNode("p", "Hello, world!"))
+
     def test_leaf_to_html_p(self):
         node = LeafNode("p", "Hello, world!")
         self.assertEqual(node.to_html(), "<p>Hello, world!</p>")
@@ -151,3 +156,35 @@ class TestParentNode(unittest.TestCase):
             parent_node.to_html(),
             "<div><span><b>grandchild</b></span></div>",
         )
+
+
+class TestHtmlStream(unittest.TestCase):
+
+    def test_stream_writes_chunks_in_order(self):
+        node = ParentNode(
+            "p",
+            [
+                LeafNode("b", "Bold text"),
+                LeafNode(None, "Normal text"),
+                LeafNode("a", "link", {"href": "/home"}),
+            ],
+        )
+        chunks = []
+        node.to_html_stream(chunks.append)
+        self.assertEqual(
+            chunks,
+            ["<p>", "<b>Bold text</b>", "Normal text", "<a href='/home'>link</a>", "</p>"],
+        )
+
+    def test_to_html_matches_stream(self):
+        node = ParentNode(
+            "div",
+            [ParentNode("p", [LeafNode("i", "child : 1")]), LeafNode(None, "child : 2")],
+        )
+        chunks = []
+        node.to_html_stream(chunks.append)
+        self.assertEqual(node.to_html(), "".join(chunks))
+
+    def test_stream_on_html_node(self):
+        with self.assertRaises(NotImplementedError):
+            HTMLNode("p", "text").to_html_stream(print)
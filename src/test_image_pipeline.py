@@ -0,0 +1,145 @@
+import io
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+from contextlib import redirect_stdout
+
+from block_markdown import render_cache_text
+from image_pipeline import (
+    Image,
+    build_image_attributes,
+    configure_image_attributes,
+    process_images,
+    publish_variants,
+    read_image_size,
+)
+
+
+def png_bytes(width, height):
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + struct.pack(">I", len(header))
+        + b"IHDR"
+        + header
+        + struct.pack(">I", zlib.crc32(b"IHDR" + header))
+    )
+
+
+def jpeg_bytes(width, height):
+    return (
+        b"\xff\xd8"
+        + b"\xff\xe0"
+        + struct.pack(">H", 16)
+        + b"JFIF\x00" + b"\x00" * 9
+        + b"\xff\xc0"
+        + struct.pack(">HBHHB", 11, 8, height, width, 1)
+        + b"\x01\x11\x00"
+    )
+
+
+class TestReadImageSize(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.root = self.temporary_directory.name
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.root, name)
+        with open(path, "wb") as file:
+            file.write(data)
+        return path
+
+    def test_png(self):
+        self.assertEqual(read_image_size(self.write("a.png", png_bytes(928, 468))), (928, 468))
+
+    def test_gif(self):
+        data = b"GIF89a" + struct.pack("<HH", 30, 20) + b"\x00" * 20
+        self.assertEqual(read_image_size(self.write("a.gif", data)), (30, 20))
+
+    def test_jpeg(self):
+        self.assertEqual(read_image_size(self.write("a.jpg", jpeg_bytes(640, 480))), (640, 480))
+
+    def test_unknown_format(self):
+        self.assertIsNone(read_image_size(self.write("a.png", b"not an image")))
+
+
+class TestProcessImages(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        root = self.temporary_directory.name
+        self.static = os.path.join(root, "static")
+        self.cache = os.path.join(root, ".cache")
+        self.public = os.path.join(root, "docs")
+        os.makedirs(os.path.join(self.static, "images"))
+        with open(os.path.join(self.static, "images", "tom.png"), "wb") as file:
+            file.write(png_bytes(1000, 500))
+        with open(os.path.join(self.static, "index.css"), "w") as file:
+            file.write("body {}")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def process(self):
+        with redirect_stdout(io.StringIO()) as output:
+            index, stale_variants = process_images(self.static, self.cache, (480,))
+        return index, output.getvalue()
+
+    def test_dimensions_are_indexed(self):
+        index, output = self.process()
+        self.assertIn("Processed 1 images", output)
+        entry = index["images"][os.path.join("images", "tom.png")]
+        self.assertEqual((entry["width"], entry["height"]), (1000, 500))
+        attributes = build_image_attributes(index)
+        self.assertEqual(attributes["/images/tom.png"]["width"], 1000)
+
+    def test_unchanged_images_are_not_processed_again(self):
+        self.process()
+        _, output = self.process()
+        self.assertNotIn("Processed", output)
+
+    def test_srcset_lists_variants(self):
+        index = {
+            "images": {
+                os.path.join("images", "tom.png"): {
+                    "hash": "abc",
+                    "width": 1000,
+                    "height": 500,
+                    "variants": [[480, 240, os.path.join("images", "tom-480w.png")]],
+                }
+            }
+        }
+        self.assertEqual(
+            build_image_attributes(index)["/images/tom.png"]["srcset"],
+            "/images/tom-480w.png 480w, /images/tom.png 1000w",
+        )
+
+    @unittest.skipIf(Image is None, "Pillow is not installed")
+    def test_variants_are_generated_and_published(self):
+        image_path = os.path.join(self.static, "images", "tom.png")
+        Image.new("RGB", (1000, 500)).save(image_path)
+        index, _ = self.process()
+        entry = index["images"][os.path.join("images", "tom.png")]
+        self.assertEqual(entry["variants"], [[480, 240, os.path.join("images", "tom-480w.png")]])
+        publish_variants(index, self.cache, self.public)
+        with Image.open(os.path.join(self.public, "images", "tom-480w.png")) as image:
+            self.assertEqual(image.size, (480, 240))
+
+
+class TestRenderCacheText(unittest.TestCase):
+
+    def test_image_attributes_are_part_of_the_key(self):
+        block = "![Tom](/images/tom.png)"
+        self.assertEqual(render_cache_text("No images"), "No images")
+        before = render_cache_text(block)
+        configure_image_attributes({"/images/tom.png": {"width": 10, "height": 5}})
+        try:
+            self.assertNotEqual(render_cache_text(block), before)
+        finally:
+            configure_image_attributes(None)
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+
+from block_markdown import markdown_to_blocks
+from includes import configure_includes, record_dependencies, recorded_dependencies
+
+
+class TestIncludes(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.includes = self.temporary_directory.name
+        configure_includes(self.includes)
+
+    def tearDown(self):
+        configure_includes(None)
+        self.temporary_directory.cleanup()
+
+    def write(self, name, markdown):
+        with open(os.path.join(self.includes, name), "w") as file:
+            file.write(markdown)
+
+    def test_blocks_are_expanded(self):
+        self.write("outer.md", "Outer\n\n{{> inner }}")
+        self.write("inner.md", "- one\n- two")
+        record_dependencies()
+        self.assertEqual(
+            markdown_to_blocks("# Page\n\n{{> outer.md }}\n\nAfter"),
+            ["# Page", "Outer", "- one\n- two", "After"],
+        )
+        self.assertEqual(
+            recorded_dependencies(),
+            [
+                os.path.join(self.includes, "inner.md"),
+                os.path.join(self.includes, "outer.md"),
+            ],
+        )
+
+    def test_inline_placeholder_is_kept(self):
+        self.assertEqual(
+            markdown_to_blocks("Text with {{> note }} inside"),
+            ["Text with {{> note }} inside"],
+        )
+
+    def test_disabled_without_directory(self):
+        configure_includes(None)
+        self.assertEqual(markdown_to_blocks("{{> note }}"), ["{{> note }}"])
+
+    def test_cycle_is_rejected(self):
+        self.write("a.md", "{{> b }}")
+        self.write("b.md", "{{> a }}")
+        with self.assertRaises(ValueError):
+            markdown_to_blocks("{{> a }}")
+
+    def test_outside_directory_is_rejected(self):
+        with self.assertRaises(ValueError):
+            markdown_to_blocks("{{> ../secret }}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ from typing import Text
 import unittest
 from htmlnode import LeafNode
 from inline_markdown import (
+    InlineCache,
     extract_markdown_images,
     extract_markdown_links,
     split_nodes_delimiter,
@@ -228,6 +229,22 @@ class TestSplitLinks(unittest.TestCase):
         new_nodes = split_nodes_link([node])
         self.assertListEqual([node], new_nodes)
 
+    def test_split_links_keeps_input_node(self):
+        text = "See [docs](/docs), then [docs](/docs) again"
+        node = TextNode(text, TextType.TEXT)
+        new_nodes = split_nodes_link([node])
+        self.assertEqual(node.text, text)
+        self.assertListEqual(
+            [
+                TextNode("See ", TextType.TEXT),
+                TextNode("docs", TextType.LINK, "/docs"),
+                TextNode(", then ", TextType.TEXT),
+                TextNode("docs", TextType.LINK, "/docs"),
+                TextNode(" again", TextType.TEXT),
+            ],
+            new_nodes,
+        )
+
 
 class TestSplitImages(unittest.TestCase):
     def test_split_images(self):
@@ -285,3 +302,125 @@ class TestTextToTextnodes(unittest.TestCase):
         ]
         actual = text_to_textnodes(text)
         self.assertEqual(expected, actual)
+
+    def test_with_delimiters_at_the_edges(self):
+        text = "**bold** and _italic_"
+        expected = [
+            TextNode("bold", TextType.BOLD),
+            TextNode(" and ", TextType.TEXT),
+            TextNode("italic", TextType.ITALIC),
+        ]
+        self.assertEqual(expected, text_to_textnodes(text))
+
+    def test_with_markers_inside_code_and_links(self):
+        text = "Run `snake_case` or read [the_docs](/docs/some_page)"
+        expected = [
+            TextNode("Run ", TextType.TEXT),
+            TextNode("snake_case", TextType.CODE),
+            TextNode(" or read ", TextType.TEXT),
+            TextNode("the_docs", TextType.LINK, "/docs/some_page"),
+        ]
+        self.assertEqual(expected, text_to_textnodes(text))
+
+    def test_with_unmatched_bracket(self):
+        text = "A [bracket and a [link](https://boot.dev)"
+        expected = [
+            TextNode("A [bracket and a ", TextType.TEXT),
+            TextNode("link", TextType.LINK, "https://boot.dev"),
+        ]
+        self.assertEqual(expected, text_to_textnodes(text))
+
+    def test_delimiters_inside_link_text_match_the_old_splitter(self):
+        self.assertEqual(
+            text_to_textnodes("[**bold** link](/x)"),
+            [
+                TextNode("[", TextType.TEXT),
+                TextNode("bold", TextType.BOLD),
+                TextNode(" link](/x)", TextType.TEXT),
+            ],
+        )
+        self.assertEqual(
+            text_to_textnodes("see ![_alt_ text](/a.png) now"),
+            [
+                TextNode("see ![", TextType.TEXT),
+                TextNode("alt", TextType.ITALIC),
+                TextNode(" text](/a.png) now", TextType.TEXT),
+            ],
+        )
+
+    def test_links_inside_bold_and_italic_match_the_old_splitter(self):
+        self.assertEqual(
+            text_to_textnodes("Click **[Download](/dl)** now"),
+            [
+                TextNode("Click ", TextType.TEXT),
+                TextNode("Download", TextType.LINK, "/dl"),
+                TextNode(" now", TextType.TEXT),
+            ],
+        )
+        self.assertEqual(
+            text_to_textnodes("_see [docs](/docs) and ![logo](/l.png)_"),
+            [
+                TextNode("see ", TextType.TEXT),
+                TextNode("docs", TextType.LINK, "/docs"),
+                TextNode(" and ", TextType.TEXT),
+                TextNode("logo", TextType.IMAGE, "/l.png"),
+            ],
+        )
+        self.assertEqual(
+            text_to_textnodes("**[_a_](/x)**"), [TextNode("_a_", TextType.LINK, "/x")]
+        )
+        self.assertEqual(
+            text_to_textnodes("`[docs](/docs)`"),
+            [TextNode("[docs](/docs)", TextType.CODE)],
+        )
+
+    def test_with_unterminated_links(self):
+        self.assertEqual(
+            text_to_textnodes("a [b](/c) [d]("),
+            [
+                TextNode("a ", TextType.TEXT),
+                TextNode("b", TextType.LINK, "/c"),
+                TextNode(" [d](", TextType.TEXT),
+            ],
+        )
+        text = "[x](" * 5000
+        self.assertEqual(text_to_textnodes(text), [TextNode(text, TextType.TEXT)])
+
+    def test_with_invalid_markdown_syntax(self):
+        with self.assertRaises(ValueError) as context:
+            text_to_textnodes("This is **not closed")
+        self.assertEqual(str(context.exception), "Invalid markdown syntax.")
+
+    def test_with_many_links(self):
+        text = " ".join(f"[link {index}](/page{index})" for index in range(1000))
+        nodes = text_to_textnodes(text)
+        self.assertEqual(len(nodes), 1999)
+        self.assertEqual(nodes[-1], TextNode("link 999", TextType.LINK, "/page999"))
+
+
+class TestInlineCache(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        cache = InlineCache(2)
+        text = "See the [docs](/docs)"
+        self.assertEqual(cache.text_to_textnodes(text), text_to_textnodes(text))
+        self.assertEqual(cache.text_to_textnodes(text), text_to_textnodes(text))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_results_are_copies(self):
+        cache = InlineCache(2)
+        nodes = cache.text_to_textnodes("**bold** text")
+        nodes[0].text = "changed"
+        nodes.append(TextNode("extra", TextType.TEXT))
+        self.assertEqual(
+            cache.text_to_textnodes("**bold** text"),
+            [TextNode("bold", TextType.BOLD), TextNode(" text", TextType.TEXT)],
+        )
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = InlineCache(2)
+        cache.text_to_textnodes("a")
+        cache.text_to_textnodes("b")
+        cache.text_to_textnodes("a")
+        cache.text_to_textnodes("c")
+        self.assertEqual(list(cache.entries), ["a", "c"])
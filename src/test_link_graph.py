@@ -0,0 +1,110 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from link_graph import (
+    linking_pages,
+    load_link_graph,
+    new_link_graph,
+    page_url,
+    report_broken_links,
+    resolve_target,
+    save_link_graph,
+    update_link_graph,
+)
+
+
+class TestLinkGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.content = self.temporary_directory.name
+        self.sources = {}
+        self.write("index.md", "# Home\n\n[Tom](/blog/tom) and [Missing](/blog/nobody)")
+        self.write("blog/tom/index.md", "# Tom\n\n![Tom](/images/tom.png) [Home](../../)")
+        self.write("about.md", "# About\n\n[External](https://example.com) [Top](#top)")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def write(self, relative_source, markdown):
+        path = os.path.join(self.content, relative_source)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(markdown)
+        self.sources[relative_source] = markdown
+
+    def update(self, graph, static_files=("images/tom.png",)):
+        return update_link_graph(graph, self.content, dict(self.sources), static_files)
+
+    def test_page_urls(self):
+        self.assertEqual(page_url("index.md"), "/")
+        self.assertEqual(page_url(os.path.join("blog", "tom", "index.md")), "/blog/tom")
+        self.assertEqual(page_url("about.md"), "/about")
+
+    def test_resolve_target(self):
+        self.assertEqual(resolve_target("/blog/tom/", "index.md"), "/blog/tom")
+        self.assertEqual(resolve_target("/about.html#team", "index.md"), "/about")
+        self.assertEqual(resolve_target("../majesty", "blog/tom/index.md"), "/blog/majesty")
+        self.assertEqual(resolve_target("/blog/index.html", "index.md"), "/blog")
+        self.assertIsNone(resolve_target("https://example.com/x", "index.md"))
+        self.assertIsNone(resolve_target("#top", "index.md"))
+
+    def test_broken_links_and_missing_images(self):
+        graph = new_link_graph()
+        self.update(graph)
+        self.assertEqual(graph["pages"]["index.md"]["broken_links"], ["/blog/nobody"])
+        self.assertEqual(graph["pages"]["about.md"]["broken_links"], [])
+        self.assertEqual(graph["pages"]["blog/tom/index.md"]["missing_images"], [])
+        self.update(graph, static_files=())
+        self.assertEqual(
+            graph["pages"]["blog/tom/index.md"]["missing_images"], ["/images/tom.png"]
+        )
+        with redirect_stdout(io.StringIO()) as output:
+            self.assertEqual(report_broken_links(graph), 2)
+        self.assertIn("Broken link in index.md: /blog/nobody", output.getvalue())
+
+    def test_backlinks(self):
+        graph = new_link_graph()
+        self.update(graph)
+        self.assertEqual(linking_pages(graph, "blog/tom/index.md"), ["index.md"])
+        self.assertEqual(linking_pages(graph, "index.md"), ["blog/tom/index.md"])
+        self.assertEqual(graph["backlinks"]["/images/tom.png"], ["blog/tom/index.md"])
+
+    def test_unchanged_pages_are_not_checked_again(self):
+        graph = new_link_graph()
+        self.assertEqual(len(self.update(graph)), 3)
+        self.assertEqual(self.update(graph), [])
+
+    def test_added_and_removed_pages_recheck_linking_pages(self):
+        graph = new_link_graph()
+        self.update(graph)
+        self.write("blog/nobody.md", "# Nobody")
+        self.assertEqual(self.update(graph), ["blog/nobody.md", "index.md"])
+        self.assertEqual(graph["pages"]["index.md"]["broken_links"], [])
+        os.remove(os.path.join(self.content, "blog", "tom", "index.md"))
+        del self.sources["blog/tom/index.md"]
+        self.assertEqual(self.update(graph), ["index.md"])
+        self.assertEqual(graph["pages"]["index.md"]["broken_links"], ["/blog/tom"])
+        self.assertNotIn("/images/tom.png", graph["backlinks"])
+
+    def test_changed_page_replaces_its_links(self):
+        graph = new_link_graph()
+        self.update(graph)
+        self.write("index.md", "# Home\n\n[About](/about)")
+        self.sources["index.md"] = "changed"
+        self.assertEqual(self.update(graph), ["index.md"])
+        self.assertEqual(linking_pages(graph, "about.md"), ["index.md"])
+        self.assertEqual(linking_pages(graph, "blog/tom/index.md"), [])
+
+    def test_save_and_load(self):
+        graph = new_link_graph()
+        self.update(graph)
+        path = os.path.join(self.content, ".cache", "link-graph.json")
+        save_link_graph(path, graph)
+        self.assertEqual(load_link_graph(path), graph)
+        with open(path, "w") as file:
+            file.write("{")
+        self.assertEqual(load_link_graph(path), new_link_graph())
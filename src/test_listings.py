@@ -0,0 +1,153 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+from listings import build_listings, collect_listings, listing_output_path, slugify
+from main import parse_args
+from template import configure_template
+
+
+def page(url, title, date=None, tags=(), draft=False):
+    return {
+        "hash": "1",
+        "url": url,
+        "title": title,
+        "date": date,
+        "tags": list(tags),
+        "draft": draft,
+        "metadata": {},
+    }
+
+
+class TestListings(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.public = os.path.join(self.temporary_directory.name, "docs")
+        self.state_path = os.path.join(self.temporary_directory.name, "listings.json")
+        self.template_path = os.path.join(self.temporary_directory.name, "template.html")
+        with open(self.template_path, "w") as file:
+            file.write("<title>{{ Title }}</title>{{ Content }}")
+        self.index = {
+            "version": 1,
+            "pages": {
+                "index.md": page("/", "Home"),
+                os.path.join("blog", "a", "index.md"): page(
+                    "/blog/a", "First", "2023-01-01", ["Tolkien"]
+                ),
+                os.path.join("blog", "b", "index.md"): page(
+                    "/blog/b", "Second", "2024-01-01", ["Tolkien", "Elves"]
+                ),
+                os.path.join("blog", "c", "index.md"): page(
+                    "/blog/c", "Third", "2024-06-01"
+                ),
+                os.path.join("blog", "d", "index.md"): page(
+                    "/blog/d", "Draft", "2024-07-01", ["Elves"], draft=True
+                ),
+            },
+        }
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def build(self):
+        return build_listings(
+            self.index, self.template_path, self.public, "/", self.state_path, "blog", 2
+        )
+
+    def read(self, url):
+        with open(listing_output_path(self.public, url), "r") as file:
+            return file.read()
+
+    def test_slugify(self):
+        self.assertEqual(slugify("Middle Earth & Beyond"), "middle-earth-beyond")
+        self.assertEqual(slugify("!!"), "untitled")
+
+    def test_page_size_must_be_positive(self):
+        self.assertEqual(parse_args(["--page-size", "1"]).page_size, 1)
+        for page_size in ("0", "-3"):
+            with self.assertRaises(SystemExit), redirect_stderr(io.StringIO()):
+                parse_args(["--page-size", page_size])
+
+    def test_collect(self):
+        listings = collect_listings(self.index, "blog", 2)
+        self.assertEqual(
+            sorted(listings),
+            [
+                "/archive",
+                "/archive/2023",
+                "/archive/2024",
+                "/blog",
+                "/blog/page/2",
+                "/tags",
+                "/tags/elves",
+                "/tags/tolkien",
+            ],
+        )
+        self.assertEqual(
+            [entry["url"] for entry in listings["/blog"]["entries"]],
+            ["/blog/c", "/blog/b"],
+        )
+        self.assertEqual(listings["/blog"]["older"], "/blog/page/2")
+        self.assertEqual(listings["/blog/page/2"]["newer"], "/blog")
+        self.assertIsNone(listings["/blog/page/2"]["older"])
+        self.assertEqual(
+            [entry["url"] for entry in listings["/tags/elves"]["entries"]], ["/blog/b"]
+        )
+
+    def test_render(self):
+        self.assertEqual(len(self.build()), 8)
+        html = self.read("/blog")
+        self.assertIn("<title>Blog</title>", html)
+        self.assertIn("<a href='/blog/c'>Third</a> <time>2024-06-01</time>", html)
+        self.assertIn("<a href='/blog/page/2'>Older</a>", html)
+        self.assertNotIn("Draft", html)
+
+    def test_incremental(self):
+        self.build()
+        self.assertEqual(self.build(), [])
+        self.index["pages"][os.path.join("blog", "a", "index.md")]["title"] = "Renamed"
+        self.assertEqual(
+            sorted(self.build()), ["/archive/2023", "/blog/page/2", "/tags/tolkien"]
+        )
+        self.assertIn("Renamed", self.read("/blog/page/2"))
+
+    def test_template_options_change_renders_everything(self):
+        self.build()
+        configure_template(minify=True, asset_urls={"/index.css": "/index.0123456789.css"})
+        self.addCleanup(configure_template)
+        self.assertEqual(len(self.build()), 8)
+        self.assertEqual(self.build(), [])
+
+    def test_partial_change_renders_everything(self):
+        partials = os.path.join(self.temporary_directory.name, "partials")
+        os.makedirs(partials)
+        footer = os.path.join(partials, "footer.html")
+        with open(footer, "w") as file:
+            file.write("<footer>1</footer>")
+        with open(self.template_path, "w") as file:
+            file.write("{{ Content }}{{> footer }}")
+        self.build()
+        self.assertEqual(self.build(), [])
+        with open(footer, "w") as file:
+            file.write("<footer>two</footer>")
+        self.assertEqual(len(self.build()), 8)
+        self.assertIn("<footer>two</footer>", self.read("/blog"))
+
+    def test_removes_stale_pages(self):
+        self.build()
+        del self.index["pages"][os.path.join("blog", "a", "index.md")]
+        self.build()
+        self.assertFalse(os.path.exists(listing_output_path(self.public, "/archive/2023")))
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog", "page")))
+
+    def test_skips_content_pages(self):
+        self.index["pages"][os.path.join("blog", "index.md")] = page("/blog", "Blog")
+        self.build()
+        self.assertFalse(os.path.exists(listing_output_path(self.public, "/blog")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,22 @@
+import io
+import os
+import tempfile
 import unittest
+from contextlib import redirect_stdout
 
-from main import extract_title
+from builder import (
+    build_full,
+    build_incremental,
+    generate_page,
+    generate_page_profiled,
+    generate_pages_recursive,
+)
+from pages import extract_title
+
+
+def read_file(path):
+    with open(path, "r") as file:
+        return file.read()
 
 
 class TestMain(unittest.TestCase):
@@ -91,3 +107,239 @@ Testing
         print("actual :")
         print(actual)
         self.fail("Test failed for extract_title in main Exception.")
+
+
+class TestIncrementalBuild(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        root = self.temporary_directory.name
+        self.content = os.path.join(root, "content")
+        self.static = os.path.join(root, "static")
+        self.template = os.path.join(root, "template.html")
+        self.public = os.path.join(root, "docs")
+        self.manifest = os.path.join(root, ".cache", "manifest.json")
+        os.makedirs(os.path.join(self.content, "blog"))
+        os.makedirs(os.path.join(self.static, "images"))
+        with open(os.path.join(self.content, "index.md"), "w") as file:
+            file.write("# Home")
+        with open(os.path.join(self.content, "blog", "index.md"), "w") as file:
+            file.write("# Blog")
+        with open(os.path.join(self.static, "index.css"), "w") as file:
+            file.write("body {}")
+        with open(os.path.join(self.static, "images", "a.png"), "w") as file:
+            file.write("png")
+        with open(self.template, "w") as file:
+            file.write("<title>{{ Title }}</title>{{ Content }}")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def build(self, worker_settings=None):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            build_incremental(
+                "/",
+                self.content,
+                self.static,
+                self.template,
+                self.public,
+                self.manifest,
+                worker_settings=worker_settings,
+            )
+        return output.getvalue()
+
+    def test_full_build_uses_asset_strategy(self):
+        with redirect_stdout(io.StringIO()):
+            build_full(
+                "/",
+                self.content,
+                self.static,
+                self.template,
+                self.public,
+                asset_strategy="hardlink",
+            )
+        self.assertTrue(
+            os.path.samefile(
+                os.path.join(self.static, "images", "a.png"),
+                os.path.join(self.public, "images", "a.png"),
+            )
+        )
+
+    def test_first_build_renders_everything(self):
+        output = self.build()
+        self.assertEqual(output.count("Generating page"), 2)
+        self.assertEqual(output.count("Copying"), 2)
+        self.assertTrue(os.path.exists(os.path.join(self.public, "blog", "index.html")))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "images", "a.png")))
+
+    def test_unchanged_build_does_nothing(self):
+        self.build()
+        output = self.build()
+        self.assertEqual(output, "")
+
+    def test_only_changed_page_is_rendered(self):
+        self.build()
+        with open(os.path.join(self.content, "blog", "index.md"), "w") as file:
+            file.write("# Blog 2")
+        output = self.build()
+        self.assertEqual(output.count("Generating page"), 1)
+        self.assertIn(os.path.join("blog", "index.md"), output)
+        self.assertIn(
+            "Blog 2", read_file(os.path.join(self.public, "blog", "index.html"))
+        )
+
+    def test_template_change_renders_everything(self):
+        self.build()
+        with open(self.template, "w") as file:
+            file.write("<h1>{{ Title }}</h1>{{ Content }}")
+        output = self.build()
+        self.assertEqual(output.count("Generating page"), 2)
+        self.assertNotIn("Copying", output)
+
+    def test_removed_sources_remove_outputs(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "index.md"))
+        os.remove(os.path.join(self.static, "images", "a.png"))
+        self.build()
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog")))
+        self.assertFalse(os.path.exists(os.path.join(self.public, "images")))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.html")))
+
+    def test_missing_output_is_rendered_again(self):
+        self.build()
+        os.remove(os.path.join(self.public, "index.html"))
+        output = self.build()
+        self.assertEqual(output.count("Generating page"), 1)
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.html")))
+
+
+    def test_changed_image_without_backlinks_renders_nothing(self):
+        self.build({"images": {}})
+        output = self.build({"images": {"/images/a.png": {"width": 1, "height": 1}}})
+        self.assertNotIn("Generating page", output)
+
+    def test_changed_include_renders_dependent_pages(self):
+        root = self.temporary_directory.name
+        os.makedirs(os.path.join(root, "includes"))
+        worker_settings = {"includes": os.path.join(root, "includes")}
+        with open(os.path.join(root, "includes", "note.md"), "w") as file:
+            file.write("A **note**")
+        with open(os.path.join(self.content, "index.md"), "w") as file:
+            file.write("# Home\n\n{{> note }}")
+        self.build(worker_settings)
+        with open(os.path.join(root, "includes", "note.md"), "w") as file:
+            file.write("A new note")
+        output = self.build(worker_settings)
+        self.assertEqual(output.count("Generating page"), 1)
+        self.assertIn(
+            "<p>A new note</p>", read_file(os.path.join(self.public, "index.html"))
+        )
+
+    def test_changed_partial_renders_dependent_pages(self):
+        os.makedirs(os.path.join(self.temporary_directory.name, "partials"))
+        footer = os.path.join(self.temporary_directory.name, "partials", "footer.html")
+        with open(footer, "w") as file:
+            file.write("<footer>1</footer>")
+        with open(self.template, "w") as file:
+            file.write("{{ Content }}{{> footer }}")
+        self.build()
+        with open(footer, "w") as file:
+            file.write("<footer>two</footer>")
+        output = self.build()
+        self.assertEqual(output.count("Generating page"), 2)
+        self.assertTrue(
+            read_file(os.path.join(self.public, "index.html")).endswith(
+                "<footer>two</footer>"
+            )
+        )
+
+
+class TestParallelRendering(unittest.TestCase):
+
+    def test_parallel_output_matches_serial_output(self):
+        content = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "content")
+        template = os.path.join(content, "..", "template.html")
+        with tempfile.TemporaryDirectory() as root:
+            outputs = []
+            for jobs in (1, 2):
+                public = os.path.join(root, f"docs{jobs}")
+                with redirect_stdout(io.StringIO()):
+                    generate_pages_recursive("/", content, template, public, jobs)
+                outputs.append(
+                    {
+                        os.path.relpath(os.path.join(directory, name), public): read_file(
+                            os.path.join(directory, name)
+                        )
+                        for directory, _, names in os.walk(public)
+                        for name in names
+                    }
+                )
+        self.assertTrue(outputs[0])
+        self.assertEqual(outputs[0], outputs[1])
+
+
+class TestProfiledPage(unittest.TestCase):
+
+    def test_profiled_page_matches_generated_page(self):
+        root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+        source = os.path.join(root, "content", "blog", "tom", "index.md")
+        template = os.path.join(root, "template.html")
+        with tempfile.TemporaryDirectory() as directory:
+            with redirect_stdout(io.StringIO()):
+                page = generate_page(
+                    "/base/", source, template, os.path.join(directory, "a.md")
+                )
+                stages, *profiled_page = generate_page_profiled(
+                    "/base/", source, template, os.path.join(directory, "b.md")
+                )
+            self.assertEqual(
+                read_file(os.path.join(directory, "a.html")),
+                read_file(os.path.join(directory, "b.html")),
+            )
+        self.assertEqual(tuple(profiled_page), page)
+        self.assertEqual(
+            list(stages),
+            [
+                "read",
+                "markdown_to_blocks",
+                "block_to_block_type",
+                "inline_parsing",
+                "to_html",
+                "template",
+                "write",
+            ],
+        )
+
+
+class TestGeneratePage(unittest.TestCase):
+
+    def test_front_matter_feeds_template(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "page.md")
+            template = os.path.join(directory, "template.html")
+            with open(source, "w") as file:
+                file.write(
+                    "---\ntitle: Front title\ntags: [a, b]\n---\n# Heading\n\nBody\n"
+                )
+            with open(template, "w") as file:
+                file.write("{{ Title }}|{{ tags }}|{{ Content }}")
+            with redirect_stdout(io.StringIO()):
+                generate_page("/", source, template, os.path.join(directory, "out.md"))
+            self.assertEqual(
+                read_file(os.path.join(directory, "out.html")),
+                "Front title|a, b|<div><h1>Heading</h1><p>Body</p></div>",
+            )
+
+    def test_invalid_markdown_leaves_no_output(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "page.md")
+            template = os.path.join(directory, "template.html")
+            with open(source, "w") as file:
+                file.write("# Title\n\nSome **broken text\n")
+            with open(template, "w") as file:
+                file.write("{{ Title }}{{ Content }}")
+            with redirect_stdout(io.StringIO()):
+                with self.assertRaises(ValueError):
+                    generate_page("/", source, template, os.path.join(directory, "out.md"))
+            self.assertEqual(sorted(os.listdir(directory)), ["page.md", "template.html"])
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+
+from manifest import (
+    MANIFEST_VERSION,
+    hash_file,
+    load_manifest,
+    new_manifest,
+    save_manifest,
+)
+
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.root = self.temporary_directory.name
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def test_hash_file_changes_with_content(self):
+        path = os.path.join(self.root, "page.md")
+        with open(path, "w") as file:
+            file.write("# Hello")
+        first_hash = hash_file(path)
+        with open(path, "w") as file:
+            file.write("# Hello World")
+        self.assertNotEqual(first_hash, hash_file(path))
+
+    def test_load_missing_manifest(self):
+        manifest = load_manifest(os.path.join(self.root, "manifest.json"))
+        self.assertEqual(manifest, new_manifest())
+
+    def test_save_and_load_manifest(self):
+        path = os.path.join(self.root, "cache", "manifest.json")
+        manifest = new_manifest()
+        manifest["pages"]["index.md"] = {"hash": "abc", "output": "index.html"}
+        save_manifest(path, manifest)
+        self.assertEqual(load_manifest(path), manifest)
+
+    def test_load_manifest_with_other_version(self):
+        path = os.path.join(self.root, "manifest.json")
+        manifest = new_manifest()
+        manifest["version"] = MANIFEST_VERSION + 1
+        manifest["template"] = "abc"
+        save_manifest(path, manifest)
+        self.assertEqual(load_manifest(path), new_manifest())
+
+    def test_load_corrupt_manifest(self):
+        path = os.path.join(self.root, "manifest.json")
+        with open(path, "w") as file:
+            file.write("{not json")
+        self.assertEqual(load_manifest(path), new_manifest())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import unittest
+
+from metadata_index import (
+    index_metadata,
+    load_metadata_index,
+    new_metadata_index,
+    published_pages,
+    tag_counts,
+    update_metadata_index,
+)
+
+
+class TestMetadataIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.content = self.temporary_directory.name
+        self.sources = {}
+        self.write(
+            "old.md", "---\ndate: 2023-05-01\ntags: [tolkien]\n---\n# Old post\n"
+        )
+        self.write(
+            "new.md",
+            "---\ntitle: Newest\ndate: 2024-02-01T10:30:00\ntags: [tolkien, essays]\n---\n",
+        )
+        self.write("draft.md", "---\ndraft: true\ntags: [essays]\n---\n# Draft\n")
+        self.write("about.md", "# About\n")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def write(self, relative_source, markdown, source_hash="1"):
+        with open(os.path.join(self.content, relative_source), "w") as file:
+            file.write(markdown)
+        self.sources[relative_source] = source_hash
+
+    def test_records(self):
+        index = new_metadata_index()
+        update_metadata_index(index, self.content, self.sources)
+        self.assertEqual(
+            {
+                key: index["pages"]["new.md"][key]
+                for key in ("title", "date", "tags", "draft", "url")
+            },
+            {
+                "title": "Newest",
+                "date": "2024-02-01",
+                "tags": ["tolkien", "essays"],
+                "draft": False,
+                "url": "/new",
+            },
+        )
+        self.assertEqual(index["pages"]["old.md"]["title"], "Old post")
+        self.assertTrue(index["pages"]["draft.md"]["draft"])
+
+    def test_queries(self):
+        index = new_metadata_index()
+        update_metadata_index(index, self.content, self.sources)
+        self.assertEqual(
+            [page["source"] for page in published_pages(index)],
+            ["new.md", "old.md", "about.md"],
+        )
+        self.assertEqual(
+            [page["source"] for page in published_pages(index, "essays")], ["new.md"]
+        )
+        self.assertEqual(tag_counts(index), {"essays": 1, "tolkien": 2})
+
+    def test_only_changed_pages_are_read(self):
+        index = new_metadata_index()
+        self.assertEqual(len(update_metadata_index(index, self.content, self.sources)), 4)
+        self.assertEqual(update_metadata_index(index, self.content, self.sources), [])
+        self.write("about.md", "---\ntitle: About us\n---\n", "2")
+        del self.sources["draft.md"]
+        self.assertEqual(
+            update_metadata_index(index, self.content, self.sources), ["about.md"]
+        )
+        self.assertEqual(index["pages"]["about.md"]["title"], "About us")
+        self.assertNotIn("draft.md", index["pages"])
+
+    def test_rendered_pages_are_not_read_again(self):
+        index = new_metadata_index()
+        os.remove(os.path.join(self.content, "about.md"))
+        update_metadata_index(
+            index,
+            self.content,
+            self.sources,
+            {"about.md": ({"date": "2024-03-01", "tags": "misc"}, "About")},
+        )
+        self.assertEqual(
+            {key: index["pages"]["about.md"][key] for key in ("title", "date", "tags")},
+            {"title": "About", "date": "2024-03-01", "tags": ["misc"]},
+        )
+
+    def test_invalid_date(self):
+        self.write("bad.md", "---\ndate: yesterday\n---\n# Bad\n")
+        with self.assertRaises(ValueError):
+            update_metadata_index(new_metadata_index(), self.content, self.sources)
+
+    def test_index_is_persisted(self):
+        path = os.path.join(self.content, ".cache", "metadata-index.json")
+        index = index_metadata(path, self.content, self.sources)
+        self.assertEqual(load_metadata_index(path), index)
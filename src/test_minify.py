@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+
+from minify import (
+    asset_urls,
+    minify_css,
+    minify_html,
+    process_assets,
+    publish_assets,
+)
+
+
+class TestMinify(unittest.TestCase):
+
+    def test_minify_css(self):
+        self.assertEqual(
+            minify_css(
+                "/* theme */\nh1,\nh2 > b {\n  color: #fff;\n  content: \"a ; b\";\n}\n"
+                "a :hover { margin: calc(1px + 2px); }\n"
+            ),
+            'h1,h2>b{color:#fff;content:"a ; b"}a :hover{margin:calc(1px + 2px)}',
+        )
+
+    def test_minify_html(self):
+        self.assertEqual(
+            minify_html(
+                "<html>\n  <head>\n    <!-- comment -->\n    <title>{{ Title }}</title>\n"
+                "  </head>\n  <body><b>a</b> <i>b</i>\n<pre>  keep\n  this</pre>\n"
+                "<style>\n  p {\n    margin: 0;\n  }\n</style>\n</body>\n</html>\n"
+            ),
+            "<html><head><title>{{ Title }}</title></head><body><b>a</b> <i>b</i>"
+            "<pre>  keep\n  this</pre><style>p{margin:0}</style></body></html>",
+        )
+
+
+class TestAssets(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.static = os.path.join(self.temporary_directory.name, "static")
+        self.cache = os.path.join(self.temporary_directory.name, ".cache")
+        self.public = os.path.join(self.temporary_directory.name, "docs")
+        os.makedirs(os.path.join(self.static, "js"))
+        self.write("index.css", "body {\n  margin: 0;\n}\n")
+        self.write(os.path.join("js", "app.js"), "console.log(1);\n")
+        self.write("logo.png", "png")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def write(self, relative_path, text):
+        with open(os.path.join(self.static, relative_path), "w") as file:
+            file.write(text)
+
+    def test_fingerprints(self):
+        index, stale = process_assets(self.static, self.cache)
+        self.assertEqual(stale, [])
+        urls = asset_urls(index)
+        self.assertEqual(sorted(urls), ["/index.css", "/js/app.js"])
+        self.assertRegex(urls["/index.css"], r"^/index\.[0-9a-f]{10}\.css$")
+        self.assertRegex(urls["/js/app.js"], r"^/js/app\.[0-9a-f]{10}\.js$")
+        publish_assets(index, self.cache, self.public)
+        with open(os.path.join(self.public, urls["/index.css"][1:]), "r") as file:
+            self.assertEqual(file.read(), "body{margin:0}")
+
+    def test_changed_asset(self):
+        index, _ = process_assets(self.static, self.cache)
+        publish_assets(index, self.cache, self.public)
+        old_name = index["assets"]["index.css"]["name"]
+        self.write("index.css", "body {\n  margin: 1px;\n}\n")
+        index, stale = process_assets(self.static, self.cache)
+        self.assertEqual(stale, [old_name])
+        self.assertNotEqual(index["assets"]["index.css"]["name"], old_name)
+        publish_assets(index, self.cache, self.public, stale)
+        self.assertFalse(os.path.exists(os.path.join(self.public, old_name)))
+        self.assertTrue(
+            os.path.exists(os.path.join(self.public, index["assets"]["index.css"]["name"]))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import gzip
+import os
+import tempfile
+import time
+import unittest
+
+from precompress import precompress
+
+
+class TestPrecompress(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.public = self.temporary_directory.name
+        self.write("index.html", "<p>hello</p>" * 200)
+        self.write(os.path.join("css", "site.css"), "body { color: red; }\n" * 100)
+        self.write("image.png", "not text" * 100)
+        self.write("tiny.js", "x")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def write(self, relative_path, text):
+        path = os.path.join(self.public, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as file:
+            file.write(text)
+        return path
+
+    def test_writes_gzip_siblings(self):
+        stats = precompress(self.public)
+        self.assertEqual((stats["files"], stats["compressed"]), (3, 2))
+        self.assertGreater(stats["saved"][".gz"], 0)
+        with open(os.path.join(self.public, "index.html.gz"), "rb") as file:
+            self.assertEqual(gzip.decompress(file.read()).decode(), "<p>hello</p>" * 200)
+        self.assertTrue(os.path.exists(os.path.join(self.public, "css", "site.css.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.public, "image.png.gz")))
+        self.assertFalse(os.path.exists(os.path.join(self.public, "tiny.js.gz")))
+
+    def test_up_to_date_siblings_are_skipped(self):
+        precompress(self.public)
+        self.assertEqual(precompress(self.public)["compressed"], 0)
+        path = self.write("index.html", "<p>changed</p>" * 200)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+        stats = precompress(self.public)
+        self.assertEqual(stats["compressed"], 1)
+        with open(path + ".gz", "rb") as file:
+            self.assertEqual(gzip.decompress(file.read()).decode(), "<p>changed</p>" * 200)
+
+    def test_orphaned_siblings_are_removed(self):
+        precompress(self.public)
+        os.remove(os.path.join(self.public, "index.html"))
+        self.write("search.json.gz", "already compressed")
+        self.assertEqual(precompress(self.public)["removed"], 1)
+        self.assertEqual(
+            sorted(os.listdir(self.public)),
+            ["css", "image.png", "search.json.gz", "tiny.js"],
+        )
+
+    def test_parallel_matches_serial(self):
+        self.assertEqual(precompress(self.public, jobs=2)["compressed"], 2)
+        self.assertEqual(precompress(self.public, jobs=2)["compressed"], 0)
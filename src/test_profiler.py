@@ -0,0 +1,67 @@
+import tracemalloc
+import unittest
+
+from profiler import PROFILE_STAGES, StageRecorder, build_profile_report
+
+
+def page_result(page, seconds):
+    return {
+        "page": page,
+        "worker": 1,
+        "seconds": seconds,
+        "stages": {
+            stage: {"seconds": seconds / len(PROFILE_STAGES), "allocated_bytes": 10}
+            for stage in PROFILE_STAGES
+        },
+    }
+
+
+class TestStageRecorder(unittest.TestCase):
+
+    def test_stage_records_time_and_allocations(self):
+        recorder = StageRecorder()
+        with recorder.stage("read"):
+            data = [str(number) for number in range(1000)]
+        with recorder.stage("read"):
+            pass
+        self.assertEqual(len(data), 1000)
+        self.assertEqual(
+            set(recorder.stages["read"]),
+            {"seconds", "allocated_bytes", "retained_bytes"},
+        )
+        self.assertGreater(recorder.stages["read"]["seconds"], 0)
+        self.assertGreater(recorder.stages["read"]["allocated_bytes"], 0)
+
+    def test_tracing_stops_after_each_stage(self):
+        recorder = StageRecorder()
+        with recorder.stage("read"):
+            self.assertTrue(tracemalloc.is_tracing())
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_stage_records_on_exception(self):
+        recorder = StageRecorder()
+        with self.assertRaises(ValueError):
+            with recorder.stage("to_html"):
+                raise ValueError
+        self.assertIn("to_html", recorder.stages)
+
+
+class TestBuildProfileReport(unittest.TestCase):
+
+    def test_pages_sorted_slowest_first(self):
+        report = build_profile_report(
+            [page_result("a.md", 0.1), page_result("b.md", 0.3), page_result("c.md", 0.2)]
+        )
+        self.assertEqual([page["page"] for page in report["pages"]], ["b.md", "c.md", "a.md"])
+        self.assertEqual(report["page_count"], 3)
+        self.assertAlmostEqual(report["total_seconds"], 0.6)
+        self.assertEqual(report["stages"]["write"]["allocated_bytes"], 30)
+
+    def test_results_without_stages_are_ignored(self):
+        report = build_profile_report([{"page": "a.md", "worker": 1, "seconds": 0.1}])
+        self.assertEqual(report["page_count"], 0)
+        self.assertEqual(report["pages"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
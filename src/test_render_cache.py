@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+
+from block_markdown import (
+    BlockType,
+    markdown_to_html_fragments,
+    markdown_to_html_node,
+)
+from render_cache import RenderCache
+
+
+class TestRenderCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temporary_directory.name, "cache", "render.sqlite")
+        self.rendered = []
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def render_block(self, block_type, payload):
+        self.rendered.append(payload)
+        return f"<{block_type.value}>{payload}</{block_type.value}>"
+
+    def test_hits_and_misses(self):
+        cache = RenderCache(self.path)
+        blocks = [("a", BlockType.PARAGRAPH, "a"), ("b", BlockType.PARAGRAPH, "b")]
+        fragments = cache.render_blocks(blocks, self.render_block)
+        self.assertEqual(fragments, ["<paragraph>a</paragraph>", "<paragraph>b</paragraph>"])
+        self.assertEqual(cache.render_blocks(blocks, self.render_block), fragments)
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+        self.assertEqual(self.rendered, ["a", "b"])
+
+    def test_block_type_is_part_of_key(self):
+        cache = RenderCache(self.path)
+        cache.render_blocks([("a", BlockType.PARAGRAPH, "a")], self.render_block)
+        fragments = cache.render_blocks([("a", BlockType.QUOTES, "a")], self.render_block)
+        self.assertEqual(fragments, ["<quotes>a</quotes>"])
+
+    def test_cache_is_persistent_per_renderer_version(self):
+        RenderCache(self.path).render_blocks([("a", BlockType.PARAGRAPH, "a")], self.render_block)
+        cache = RenderCache(self.path)
+        cache.render_blocks([("a", BlockType.PARAGRAPH, "a")], self.render_block)
+        self.assertEqual(cache.hits, 1)
+        cache = RenderCache(self.path, renderer_version=2)
+        cache.render_blocks([("a", BlockType.PARAGRAPH, "a")], self.render_block)
+        self.assertEqual(cache.misses, 1)
+
+    def test_least_recently_used_fragments_are_evicted(self):
+        cache = RenderCache(self.path, max_bytes=60)
+        for block in ("first", "second", "third"):
+            cache.render_blocks([(block, BlockType.PARAGRAPH, block)], self.render_block)
+        cache.render_blocks([("first", BlockType.PARAGRAPH, "first")], self.render_block)
+        self.assertEqual(cache.evict(), 1)
+        self.assertLessEqual(cache.total_bytes(), 60)
+        cache.render_blocks(
+            [("first", BlockType.PARAGRAPH, "first"), ("second", BlockType.PARAGRAPH, "second")],
+            self.render_block,
+        )
+        self.assertEqual(self.rendered, ["first", "second", "third", "second"])
+
+
+class TestMarkdownToHtmlFragments(unittest.TestCase):
+
+    def test_fragments_match_html_node(self):
+        markdown = "# Title\n\nSome **bold** text\n\n- a\n- b\n\n# Title"
+        with tempfile.TemporaryDirectory() as directory:
+            cache = RenderCache(os.path.join(directory, "render.sqlite"))
+            fragments = markdown_to_html_fragments(markdown, cache)
+            self.assertEqual(
+                f"<div>{''.join(fragments)}</div>",
+                markdown_to_html_node(markdown).to_html(),
+            )
+            self.assertEqual(cache.hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
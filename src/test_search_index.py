@@ -0,0 +1,117 @@
+import gzip
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from includes import configure_includes
+from search_index import index_page, stem, tokenize, update_search_index
+
+
+def read_compressed_json(path):
+    with open(path, "rb") as file:
+        return json.loads(gzip.decompress(file.read()))
+
+
+class TestTokenize(unittest.TestCase):
+
+    def test_stem(self):
+        self.assertEqual(stem("rings"), "ring")
+        self.assertEqual(stem("running"), "run")
+        self.assertEqual(stem("stories"), "story")
+        self.assertEqual(stem("class"), "class")
+        self.assertEqual(stem("rivendell"), "rivendell")
+
+    def test_tokenize_drops_stop_words(self):
+        self.assertEqual(tokenize("The Lord of the Rings, 1954"), ["lord", "ring", "1954"])
+
+    def test_index_page_uses_inline_text_and_title(self):
+        page = index_page("# The Hobbit\n\nA **hobbit** hole with [a link](/url) and `code`")
+        self.assertEqual(page["title"], "The Hobbit")
+        self.assertEqual(page["terms"]["hobbit"], 7)
+        self.assertEqual(page["terms"]["link"], 1)
+        self.assertEqual(page["terms"]["code"], 1)
+        self.assertNotIn("url", page["terms"])
+
+
+class TestUpdateSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        root = self.temporary_directory.name
+        self.content = os.path.join(root, "content")
+        self.public = os.path.join(root, "docs")
+        self.cache_path = os.path.join(root, ".cache", "search-index.json")
+        os.makedirs(os.path.join(self.content, "blog"))
+        with open(os.path.join(self.content, "index.md"), "w") as file:
+            file.write("# Home\n\nWelcome hobbits")
+        with open(os.path.join(self.content, "blog", "tom.md"), "w") as file:
+            file.write("# Tom\n\nBombadil")
+        self.sources = {"index.md": "1", os.path.join("blog", "tom.md"): "1"}
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def update(self):
+        with redirect_stdout(io.StringIO()):
+            return update_search_index(
+                self.cache_path, self.content, self.sources, self.public, "/base/"
+            )
+
+    def test_index_and_shards_are_written(self):
+        self.assertEqual(len(self.update()), 2)
+        search = os.path.join(self.public, "search")
+        index = read_compressed_json(os.path.join(search, "index.json.gz"))
+        self.assertEqual(
+            index["documents"],
+            [{"url": "/base/blog/tom", "title": "Tom"}, {"url": "/base/", "title": "Home"}],
+        )
+        shard = read_compressed_json(os.path.join(search, index["shards"]["ho"]))
+        self.assertEqual(shard, {"hobbit": [[1, 1]], "home": [[1, 6]]})
+
+    def test_unchanged_pages_are_not_tokenised_again(self):
+        self.update()
+        self.assertEqual(self.update(), [])
+        with open(os.path.join(self.content, "index.md"), "w") as file:
+            file.write("# Home\n\nShire")
+        self.sources["index.md"] = "2"
+        self.assertEqual(self.update(), ["index.md"])
+        search = os.path.join(self.public, "search")
+        self.assertEqual(
+            read_compressed_json(os.path.join(search, "terms-ho.json.gz")),
+            {"home": [[1, 6]]},
+        )
+        self.assertIn("terms-sh.json.gz", os.listdir(search))
+
+    def test_include_change_tokenises_dependent_pages(self):
+        includes = os.path.join(self.temporary_directory.name, "includes")
+        os.makedirs(includes)
+        configure_includes(includes)
+        self.addCleanup(configure_includes, None)
+        note = os.path.join(includes, "note.md")
+        with open(note, "w") as file:
+            file.write("Hobbits")
+        with open(os.path.join(self.content, "index.md"), "w") as file:
+            file.write("# Home\n\n{{> note }}")
+        self.update()
+        self.assertEqual(self.update(), [])
+        with open(note, "w") as file:
+            file.write("Wizards")
+        self.assertEqual(self.update(), ["index.md"])
+        search = os.path.join(self.public, "search")
+        self.assertIn("terms-wi.json.gz", os.listdir(search))
+        self.assertEqual(
+            read_compressed_json(os.path.join(search, "terms-ho.json.gz")),
+            {"home": [[1, 6]]},
+        )
+
+    def test_removed_pages_leave_the_index(self):
+        self.update()
+        del self.sources[os.path.join("blog", "tom.md")]
+        self.update()
+        search = os.path.join(self.public, "search")
+        index = read_compressed_json(os.path.join(search, "index.json.gz"))
+        self.assertEqual([document["title"] for document in index["documents"]], ["Home"])
+        self.assertNotIn("terms-bo.json.gz", os.listdir(search))
@@ -0,0 +1,108 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from main import parse_args
+from sites import build_sites, load_site_config
+
+
+class TestSites(unittest.TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.root = self.temporary_directory.name
+        self.config_path = os.path.join(self.root, "sites.json")
+        for locale, title in (("en", "Hello"), ("fr", "Bonjour")):
+            os.makedirs(os.path.join(self.root, "content", locale, "blog"))
+            for relative_path in ("index.md", os.path.join("blog", "index.md")):
+                with open(
+                    os.path.join(self.root, "content", locale, relative_path), "w"
+                ) as file:
+                    file.write(f"# {title}\n\nSee [home](/)")
+        os.makedirs(os.path.join(self.root, "static"))
+        with open(os.path.join(self.root, "static", "index.css"), "w") as file:
+            file.write("body {}")
+        with open(os.path.join(self.root, "template.html"), "w") as file:
+            file.write("<title>{{ Title }}</title>{{ Content }}")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def write_config(self, config):
+        with open(self.config_path, "w") as file:
+            json.dump(config, file)
+
+    def locales_config(self):
+        return {
+            "sites": [
+                {"name": "en", "content": "content/en"},
+                {"name": "fr", "content": "content/fr", "base_path": "/fr/"},
+            ]
+        }
+
+    def test_load_resolves_paths(self):
+        self.write_config(self.locales_config())
+        sites = load_site_config(self.config_path)
+        self.assertEqual([site["name"] for site in sites], ["en", "fr"])
+        self.assertEqual(sites[1]["content"], os.path.join(self.root, "content", "fr"))
+        self.assertEqual(sites[1]["output"], os.path.join(self.root, "docs", "fr"))
+        self.assertEqual(sites[1]["template"], os.path.join(self.root, "template.html"))
+        self.assertEqual(sites[0]["shared_cache"], os.path.join(self.root, ".cache"))
+        self.assertEqual(
+            sites[0]["cache"], os.path.join(self.root, ".cache", "sites", "en")
+        )
+        self.assertEqual(
+            [site["name"] for site in load_site_config(self.config_path, ["fr"])], ["fr"]
+        )
+
+    def test_invalid_configs(self):
+        for sites in (
+            [{"name": "en"}, {"name": "en"}],
+            [{"name": "en", "output": "docs"}, {"name": "fr", "output": "docs/fr"}],
+            [{"name": "en", "base_path": "/en"}],
+            [{"name": "en", "templates": "x"}],
+            [{"content": "content/en"}],
+        ):
+            self.write_config({"sites": sites})
+            with self.assertRaises(ValueError):
+                load_site_config(self.config_path)
+        self.write_config(self.locales_config())
+        with self.assertRaises(ValueError):
+            load_site_config(self.config_path, ["de"])
+
+    def build(self, *argv):
+        args = parse_args(["--config", self.config_path, *argv])
+        with redirect_stdout(io.StringIO()):
+            return build_sites(args, load_site_config(self.config_path, args.site))
+
+    def test_build_sites(self):
+        self.write_config(self.locales_config())
+        results = self.build("--jobs", "2")
+        self.assertEqual(
+            sorted(result["site"] for result in results), ["en", "en", "fr", "fr"]
+        )
+        with open(os.path.join(self.root, "docs", "fr", "blog", "index.html")) as file:
+            self.assertEqual(
+                file.read(),
+                "<title>Bonjour</title><div><h1>Bonjour</h1>"
+                "<p>See <a href='/fr/'>home</a></p></div>",
+            )
+        self.assertTrue(os.path.exists(os.path.join(self.root, "docs", "en", "index.css")))
+
+    def test_incremental_sites_keep_separate_manifests(self):
+        self.write_config(self.locales_config())
+        self.build("--incremental")
+        with open(os.path.join(self.root, "content", "fr", "index.md"), "w") as file:
+            file.write("# Salut")
+        results = self.build("--incremental")
+        self.assertEqual(
+            [(result["site"], os.path.basename(result["page"])) for result in results],
+            [("fr", "index.md")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import os
+import tempfile
+import unittest
+
+from htmlnode import LeafNode, ParentNode
+from template import clear_template_cache, load_template, parse_template, rebase_links
+
+
+class TestParseTemplate(unittest.TestCase):
+
+    def test_segments(self):
+        template = parse_template("<title>{{ Title }}</title><p>{{Content}}</p>")
+        self.assertEqual(
+            template.segments,
+            [
+                (None, "<title>"),
+                ("Title", "{{ Title }}"),
+                (None, "</title><p>"),
+                ("Content", "{{Content}}"),
+                (None, "</p>"),
+            ],
+        )
+        self.assertEqual(template.placeholders(), ["Title", "Content"])
+
+    def test_literals_are_rebased_once(self):
+        template = parse_template(
+            "<link href='/index.css'/>{{ Content }}", "/Static_Site_Generator/"
+        )
+        self.assertEqual(
+            template.render({"Content": "<img src='/a.png'></img>"}),
+            "<link href='/Static_Site_Generator/index.css'/><img src='/a.png'></img>",
+        )
+
+    def test_srcset_candidates_are_rebased(self):
+        self.assertEqual(
+            rebase_links(
+                "<img src='/a.png' srcset='/a-480w.png 480w, /a.png 900w'></img>", "/b/"
+            ),
+            "<img src='/b/a.png' srcset='/b/a-480w.png 480w, /b/a.png 900w'></img>",
+        )
+
+    def test_minified_with_fingerprinted_assets(self):
+        template = parse_template(
+            '<head>\n  <link href="/site/index.css" />\n  <script src="/app.js">'
+            "</script>\n</head>\n<body>{{ Content }}</body>\n",
+            "/site/",
+            minify=True,
+            asset_urls={"/index.css": "/index.0123456789.css"},
+        )
+        self.assertEqual(
+            template.render({"Content": "<p>x</p>"}),
+            '<head><link href="/site/index.0123456789.css" /><script src="/app.js">'
+            "</script></head><body><p>x</p></body>",
+        )
+
+    def test_render_with_metadata(self):
+        template = parse_template("{{ Title }} by {{ author }} on {{ date }}")
+        self.assertEqual(
+            template.render({"Title": "Hello", "author": "Tom", "date": "2024-01-01"}),
+            "Hello by Tom on 2024-01-01",
+        )
+
+    def test_unknown_placeholder_is_kept(self):
+        template = parse_template("<h1>{{ Title }}</h1>{{ missing }}")
+        self.assertEqual(template.render({"Title": "Hi"}), "<h1>Hi</h1>{{ missing }}")
+
+    def test_render_stream_with_callable_value(self):
+        node = ParentNode("p", [LeafNode("b", "bold"), LeafNode(None, " text")])
+        template = parse_template("<article>{{ Content }}</article>")
+        chunks = []
+        template.render_stream({"Content": node.to_html_stream}, chunks.append)
+        self.assertEqual(
+            chunks, ["<article>", "<p>", "<b>bold</b>", " text", "</p>", "</article>"]
+        )
+
+
+class TestLoadTemplate(unittest.TestCase):
+
+    def setUp(self):
+        clear_template_cache()
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temporary_directory.name, "template.html")
+        with open(self.path, "w") as file:
+            file.write("<h1>{{ Title }}</h1>")
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+        clear_template_cache()
+
+    def test_template_is_cached(self):
+        self.assertIs(load_template(self.path), load_template(self.path))
+
+    def test_cache_is_per_base_path(self):
+        self.assertIsNot(load_template(self.path), load_template(self.path, "/blog/"))
+
+    def test_changed_template_is_parsed_again(self):
+        template = load_template(self.path)
+        with open(self.path, "w") as file:
+            file.write("<h2>{{ Title }}</h2>")
+        os.utime(self.path, ns=(0, 0))
+        self.assertNotEqual(load_template(self.path), template)
+        self.assertEqual(load_template(self.path).render({"Title": "Hi"}), "<h2>Hi</h2>")
+
+    def test_partials_are_composed_at_render_time(self):
+        partials = os.path.join(self.temporary_directory.name, "partials")
+        os.makedirs(partials)
+        with open(os.path.join(partials, "header.html"), "w") as file:
+            file.write("<header>{{> nav }}</header>")
+        with open(os.path.join(partials, "nav.html"), "w") as file:
+            file.write("<a href='/'>{{ Title }}</a>")
+        with open(self.path, "w") as file:
+            file.write("{{> header }}<main>{{ Content }}</main>")
+        template = load_template(self.path, "/site/")
+        self.assertEqual(template.placeholders(), ["Content"])
+        self.assertEqual(template.partials(), [os.path.join(partials, "header.html")])
+        self.assertEqual(
+            template.render({"Title": "Hi", "Content": "x"}),
+            "<header><a href='/site/'>Hi</a></header><main>x</main>",
+        )
+        with open(os.path.join(partials, "nav.html"), "w") as file:
+            file.write("<nav>{{ Title }}</nav>")
+        self.assertIs(load_template(self.path, "/site/"), template)
+        self.assertEqual(
+            template.render({"Title": "Hi", "Content": "x"}),
+            "<header><nav>Hi</nav></header><main>x</main>",
+        )
+
+    def test_partial_cycle_is_rejected(self):
+        partials = os.path.join(self.temporary_directory.name, "partials")
+        os.makedirs(partials)
+        for name, text in (
+            ("a", "x{{> a }}"),
+            ("b", "{{> c }}"),
+            ("c", "{{> b }}"),
+            ("d", "d"),
+        ):
+            with open(os.path.join(partials, f"{name}.html"), "w") as file:
+                file.write(text)
+        for template_text in ("{{> a }}", "{{> b }}"):
+            with open(self.path, "w") as file:
+                file.write(template_text)
+            clear_template_cache()
+            with self.assertRaises(ValueError) as context:
+                load_template(self.path).render({})
+            self.assertIn("Partial cycle through", str(context.exception))
+        with open(self.path, "w") as file:
+            file.write("{{> d }}{{> d }}")
+        clear_template_cache()
+        self.assertEqual(load_template(self.path).render({}), "dd")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -29,6 +29,10 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is a text node", TextType.LINK, "https://lnode")
         self.assertEqual(node, node2)
 
+    def test_has_no_instance_dict(self):
+        node = TextNode("This is a text node", TextType.BOLD)
+        self.assertFalse(hasattr(node, "__dict__"))
+
     def test_not_eq_texttype(self):
         node = TextNode("This is a text node", TextType.LINK, "https://lnode")
         node2 = TextNode("This is a text node", TextType.IMAGE, "https://lnode")